@@ -7,14 +7,19 @@ from datetime import datetime, timedelta
 import io
 import base64
 import time
+import traceback
 try:
     import psycopg2
+    from psycopg2.extras import execute_values
 except ImportError:
     psycopg2 = None
+    execute_values = None
 import os
 import logging
 import threading
+import functools
 from typing import Optional, Dict, Any, List, Tuple, Union
+from collections import namedtuple
 
 # Load environment variables from .env file FIRST
 try:
@@ -37,6 +42,8 @@ from utils.sales_dashboard_processor import SalesDashboardProcessor
 from utils.sales_data_manager import SalesDataManager
 from utils.unified_data_manager import UnifiedDataManager
 from utils.cycle_time_analyzer import CycleTimeAnalyzer
+from utils.candidate_status_config import CANDIDATE_STATUS_CATEGORY_SQL
+from utils.pipeline_manager import PIPELINE_STAGE_SORT_SQL
 from auth import check_auth, login_page, user_header, require_auth, load_user_permissions
 
 # Import performance optimization modules
@@ -46,6 +53,13 @@ from utils.session_optimizer import optimize_session, get_connection_manager
 # Initialize environment manager
 env_manager = EnvironmentManager()
 
+def _tbl(base_table_name):
+    """Environment-specific table name for this session's environment
+
+    Not memoized: the session's environment can differ from the process default.
+    """
+    return st.session_state.get('env_manager', env_manager).get_table_name(base_table_name)
+
 # Configure logging
 logger = logging.getLogger(__name__)
 if not logger.handlers:
@@ -734,7 +748,6 @@ def staffing_plans_section():
                                 except Exception as e:
                                     st.error(f"❌ Error generating pipeline for {row['role']}: {str(e)}")
                                     st.error(f"🔍 DEBUG: Exception type: {type(e).__name__}")
-                                    import traceback
                                     st.error(f"🔍 DEBUG: Full traceback: {traceback.format_exc()}")
                             else:
                                 st.warning(f"⚠️ No pipeline ID found for {row['role']} with pipeline '{pipeline_name}'")
@@ -773,7 +786,6 @@ def staffing_plans_section():
                         except Exception as e:
                             st.error(f"❌ Pipeline plans generated but database save failed: {str(e)}")
                             st.error(f"❌ Error type: {type(e).__name__}")
-                            import traceback
                             st.error(f"❌ Full error: {traceback.format_exc()}")
                     else:
                         if not current_plan_id:
@@ -1007,7 +1019,6 @@ def staffing_plans_section():
                         except Exception as e:
                             st.error(f"❌ Error updating staffing plan: {str(e)}")
                             st.error(f"❌ Error type: {type(e).__name__}")
-                            import traceback
                             st.error(f"❌ Full error: {traceback.format_exc()}")
                             success = False
                     else:
@@ -1022,7 +1033,6 @@ def staffing_plans_section():
                         except Exception as e:
                             st.error(f"❌ Error creating staffing plan: {str(e)}")
                             st.error(f"❌ Error type: {type(e).__name__}")
-                            import traceback
                             st.error(f"❌ Full error: {traceback.format_exc()}")
                             success = False
                             staffing_plan_id = None
@@ -1055,6 +1065,8 @@ def staffing_plans_section():
                             except Exception as e:
                                 st.error(f"❌ Error saving pipeline plans: {str(e)}")
                         
+                        _invalidate_pipeline_analytics_caches()
+                        
                         # Clear form and return to list  
                         keys_to_clear = [
                             'show_staffing_form', 'edit_staffing_plan_id',
@@ -1142,6 +1154,9 @@ def main():
     
     env_manager = st.session_state.env_manager
     
+    # One-time candidate schema migrations (cached per process)
+    _ensure_candidate_schema(env_manager.get_table_name('candidate_data'))
+    
     # Configure page with environment indicator
     env_suffix = "[DEVELOPMENT]" if env_manager.is_development() else "[PRODUCTION]"
     st.set_page_config(
@@ -7695,14 +7710,11 @@ def get_staffing_plans():
     import os
     import psycopg2
     
-    # Get environment manager from session state
-    env_manager = st.session_state.env_manager
-    
     conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
     plans = []
     try:
         cursor = conn.cursor()
-        staffing_plans_table = env_manager.get_table_name('staffing_plans')
+        staffing_plans_table = _tbl('staffing_plans')
         cursor.execute(f"SELECT id, plan_name FROM {staffing_plans_table} ORDER BY plan_name")
         plans = cursor.fetchall()
     finally:
@@ -7717,15 +7729,12 @@ def get_staffing_plan_owners(plan_id):
     if not plan_id:
         return []
     
-    # Get environment manager from session state
-    env_manager = st.session_state.env_manager
-    
     conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
     owners = []
     try:
         cursor = conn.cursor()
         # Fix: Query the correct table where owners are actually stored
-        staffing_plan_generated_plans_table = env_manager.get_table_name('staffing_plan_generated_plans')
+        staffing_plan_generated_plans_table = _tbl('staffing_plan_generated_plans')
         query = f"SELECT DISTINCT pipeline_owner FROM {staffing_plan_generated_plans_table} WHERE plan_id = %s AND pipeline_owner IS NOT NULL AND pipeline_owner != '' ORDER BY pipeline_owner"
         cursor.execute(query, (plan_id,))
         owners = [row[0] for row in cursor.fetchall() if row[0]]
@@ -7741,15 +7750,12 @@ def get_staffing_plan_roles(plan_id, owner):
     if not plan_id or not owner:
         return []
     
-    # Get environment manager from session state
-    env_manager = st.session_state.env_manager
-    
     conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
     roles = []
     try:
         cursor = conn.cursor()
         # Fix: Query the correct table where roles are actually stored
-        staffing_plan_generated_plans_table = env_manager.get_table_name('staffing_plan_generated_plans')
+        staffing_plan_generated_plans_table = _tbl('staffing_plan_generated_plans')
         query = f"SELECT DISTINCT role FROM {staffing_plan_generated_plans_table} WHERE plan_id = %s AND pipeline_owner = %s AND role IS NOT NULL AND role != '' ORDER BY role"
         cursor.execute(query, (plan_id, owner))
         roles = [row[0] for row in cursor.fetchall() if row[0]]
@@ -7762,14 +7768,11 @@ def get_pipelines_for_client(client_id):
     import os
     import psycopg2
     
-    # Get environment manager from session state
-    env_manager = st.session_state.env_manager
-    
     conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
     pipelines = []
     try:
         cursor = conn.cursor()
-        talent_pipelines_table = env_manager.get_table_name('talent_pipelines')
+        talent_pipelines_table = _tbl('talent_pipelines')
         cursor.execute(f"SELECT id, name FROM {talent_pipelines_table} WHERE client_id = %s ORDER BY name", (client_id,))
         pipelines = cursor.fetchall()
     finally:
@@ -7781,15 +7784,12 @@ def get_staffing_plans_for_pipeline(pipeline_id):
     import os
     import psycopg2
     
-    # Get environment manager from session state
-    env_manager = st.session_state.env_manager
-    
     conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
     plans = []
     try:
         cursor = conn.cursor()
-        staffing_plans_table = env_manager.get_table_name('staffing_plans')
-        pipeline_planning_details_table = env_manager.get_table_name('pipeline_planning_details')
+        staffing_plans_table = _tbl('staffing_plans')
+        pipeline_planning_details_table = _tbl('pipeline_planning_details')
         query = f"""
             SELECT DISTINCT sp.id, sp.plan_name 
             FROM {staffing_plans_table} sp
@@ -7803,11 +7803,236 @@ def get_staffing_plans_for_pipeline(pipeline_id):
         conn.close()
     return plans
 
+# Drop reason dropdown options shared by the Add/Edit candidate forms
+DROP_REASON_OPTIONS = [
+    "",
+    "Candidate RNR",
+    "On Hold",
+    "Internal Dropped",
+    "Duplicate Profile",
+    "Requirement on hold",
+    "Salary expectations too high",
+    "Notice period too long",
+    "Location mismatch",
+    "Skills not matching",
+    "Candidate declined offer",
+    "Failed technical assessment",
+    "Failed interview",
+    "Background check failed",
+    "Other"
+]
+# Predefined reasons (skip empty and "Other"), longest first so the first match is the most specific
+_DROP_PREFIX_LEN_SORTED = tuple(sorted(DROP_REASON_OPTIONS[1:-1], key=len, reverse=True))
+
+# Row-level Activity badge in the candidate list (case-insensitive regex)
+INACTIVE_STATUS_PATTERN = r'rejected|on hold|on-hold|rnr'
+
+# Reference data shared by the Add/Edit candidate forms
+EditFormReferenceData = namedtuple('EditFormReferenceData', ['clients', 'partners', 'statuses', 'staffing_managers'])
+
+@st.cache_resource(show_spinner=False)
+def _ensure_candidate_schema(candidate_data_table):
+    """Run idempotent candidate-module schema migrations once per process"""
+    migrations = [
+        # Staffing-plan link columns (previously re-applied on every save/load/update)
+        f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_plan_id INTEGER",
+        f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_owner VARCHAR(255)",
+        f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_role VARCHAR(255)",
+        f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS not_linked_to_staffing_plan BOOLEAN DEFAULT FALSE",
+        f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_manager VARCHAR(255)",
+        # status_category and the candidate indexes are added by migrate_candidate_schema.py
+    ]
+    _apply_schema_migrations("Candidate", migrations)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _candidate_has_status_category(candidate_data_table):
+    """Whether migrate_candidate_schema.py has added the status_category column"""
+    try:
+        with get_connection_manager().get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = %s AND column_name = 'status_category'
+            """, (candidate_data_table,))
+            return cursor.fetchone() is not None
+    except Exception as e:
+        logger.warning(f"Could not check for status_category (non-critical): {e}")
+        return False
+
+def _candidate_status_category_sql(candidate_data_table, alias=None):
+    """SQL for a candidate's activity bucket: the migrated column, else the equivalent CASE"""
+    prefix = f"{alias}." if alias else ""
+    if _candidate_has_status_category(candidate_data_table):
+        return f"{prefix}status_category"
+    return f"({CANDIDATE_STATUS_CATEGORY_SQL.format(status=f'{prefix}status')})"
+
+def _apply_schema_migrations(label, migrations):
+    """Execute each migration statement in autocommit mode, logging rather than raising on failure"""
+    try:
+        conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
+        conn.autocommit = True
+        try:
+            cursor = conn.cursor()
+            for statement in migrations:
+                try:
+                    cursor.execute(statement)
+                except Exception as e:
+                    logger.warning(f"{label} schema migration skipped (non-critical): {e}")
+        finally:
+            conn.close()
+        logger.info(f"{label} schema migrations completed")
+    except Exception as e:
+        # Migrations are optional and shouldn't break the app
+        logger.warning(f"{label} schema migrations failed (non-critical): {e}")
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_edit_form_reference_data(master_clients_table, pipeline_stages_table, talent_supply_table):
+    """Get clients, vendor partners, active statuses and FTE staffing managers in one connection"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT master_client_id, client_name FROM {master_clients_table} ORDER BY client_name")
+        clients = cursor.fetchall()
+        cursor.execute("SELECT partner_name FROM vendor_partners ORDER BY partner_name")
+        partners = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"SELECT DISTINCT stage_name FROM {pipeline_stages_table} WHERE is_active = TRUE ORDER BY stage_name")
+        statuses = [row[0] for row in cursor.fetchall()]
+        cursor.execute(f"SELECT DISTINCT name FROM {talent_supply_table} WHERE type = 'FTE' AND name IS NOT NULL AND name != '' ORDER BY name")
+        staffing_managers = [row[0] for row in cursor.fetchall()]
+    return EditFormReferenceData(clients, partners, statuses, staffing_managers)
+
+def _get_edit_form_reference_data():
+    """Resolve the environment tables and return the cached form reference data
+
+    A failed lookup is reported and the forms get empty lists; errors are not cached.
+    """
+    try:
+        return _load_edit_form_reference_data(
+            _tbl('master_clients'),
+            _tbl('pipeline_stages'),
+            _tbl('talent_supply')
+        )
+    except Exception as e:
+        st.error(f"Error loading form reference data: {str(e)}")
+        return EditFormReferenceData([], [], [], [])
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_distinct_staffing_roles(candidate_data_table):
+    """Get the distinct staffing roles already used by candidates"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT DISTINCT staffing_role FROM {candidate_data_table} WHERE staffing_role IS NOT NULL AND staffing_role != '' ORDER BY staffing_role")
+        return [row[0] for row in cursor.fetchall()]
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_candidate_view(candidate_id, candidate_data_table, master_clients_table, talent_pipelines_table):
+    """Get the full candidate record shown by the view-only layout, keyed by column name"""
+    from psycopg2.extras import RealDictCursor
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+        query = f"""
+            SELECT
+                cd.candidate_name, cd.role, cd.experience_level, cd.skills,
+                mc.client_name, cd.status, cd.status_flag, tp.name as pipeline_name,
+                cd.source, cd.vendor_partner, cd.location, cd.notice_period,
+                cd.notice_period_details, cd.resume_file_path, cd.notes,
+                cd.email_id, cd.contact_number, cd.expected_ctc, cd.position_start_date,
+                cd.next_steps, cd.interview_feedback, cd.created_date, cd.created_flag,
+                cd.data_source, cd.created_by
+            FROM {candidate_data_table} cd
+            LEFT JOIN {master_clients_table} mc ON cd.hire_for_client_id = mc.master_client_id
+            LEFT JOIN {talent_pipelines_table} tp ON cd.linked_pipeline_id = tp.id
+            WHERE cd.id = %s
+        """
+        cursor.execute(query, (candidate_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _distinct_statuses(candidate_data_table):
+    """Get distinct candidate statuses for the list filter"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT DISTINCT status FROM {candidate_data_table} WHERE status IS NOT NULL AND status != '' ORDER BY status")
+        return [row[0] for row in cursor.fetchall()]
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _distinct_roles(candidate_data_table):
+    """Get distinct candidate roles for the list filter"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT DISTINCT role FROM {candidate_data_table} WHERE role IS NOT NULL AND role != '' ORDER BY role")
+        return [row[0] for row in cursor.fetchall()]
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _distinct_candidate_clients(candidate_data_table, master_clients_table):
+    """Get names of clients that candidates are hired for"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        # Scan the small clients table and probe candidates per client instead of joining every candidate
+        cursor.execute(f"""
+            SELECT DISTINCT mc.client_name 
+            FROM {master_clients_table} mc
+            WHERE mc.client_name IS NOT NULL
+              AND EXISTS (SELECT 1 FROM {candidate_data_table} cd WHERE cd.hire_for_client_id = mc.master_client_id)
+            ORDER BY mc.client_name
+        """)
+        return [row[0] for row in cursor.fetchall()]
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _distinct_supply_plans(candidate_data_table, staffing_plans_table):
+    """Get names of staffing plans that candidates are linked to"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT DISTINCT sp.plan_name 
+            FROM {staffing_plans_table} sp
+            WHERE sp.plan_name IS NOT NULL
+              AND EXISTS (SELECT 1 FROM {candidate_data_table} cd WHERE cd.staffing_plan_id = sp.id)
+            ORDER BY sp.plan_name
+        """)
+        return [row[0] for row in cursor.fetchall()]
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _distinct_drop_reasons(candidate_data_table):
+    """Get distinct drop reasons for the list filter"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT DISTINCT drop_reason FROM {candidate_data_table} WHERE drop_reason IS NOT NULL AND drop_reason != '' ORDER BY drop_reason")
+        return [row[0] for row in cursor.fetchall()]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_candidate_metrics(candidate_data_table):
+    """Get (total, active, inactive, hired, vendor) candidate counts in a single scan"""
+    status_category = _candidate_status_category_sql(candidate_data_table)
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT
+                COUNT(*),
+                COUNT(*) FILTER (WHERE {status_category} = 'active'),
+                COUNT(*) FILTER (WHERE {status_category} = 'inactive'),
+                -- Hired count - using actual production status values
+                COUNT(*) FILTER (WHERE status = 'Staffed'),
+                -- Vendor count - all candidates are from vendors in production
+                COUNT(*) FILTER (WHERE source = 'Vendor' OR vendor_partner IS NOT NULL OR source IS NOT NULL)
+            FROM {candidate_data_table}
+        """)
+        return tuple(cursor.fetchone())
+
+def _invalidate_candidate_caches():
+    """Clear only the cached reads derived from candidate_data after a write"""
+    _load_candidate_view.clear()
+    _load_distinct_staffing_roles.clear()
+    for loader in (_distinct_statuses, _distinct_roles, _distinct_candidate_clients,
+                   _distinct_supply_plans, _distinct_drop_reasons, _load_candidate_metrics,
+                   _load_candidate_filtered_count):
+        loader.clear()
+
 def show_add_candidate_form():
     """Display the Add Candidate form"""
     st.markdown("### ➕ Add New Candidate")
     
-    env_manager = st.session_state.env_manager
+    ref = _get_edit_form_reference_data()
     
     # STEP 1: Staffing Assignment (outside form for cascading dropdowns)
     st.markdown("#### 🎯 Staffing Assignment")
@@ -7816,17 +8041,7 @@ def show_add_candidate_form():
     
     with staffing_col1:
         # 1. Hire for Client
-        import os
-        import psycopg2
-        conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-        clients = []
-        try:
-            cursor = conn.cursor()
-            master_clients_table = env_manager.get_table_name('master_clients')
-            cursor.execute(f"SELECT master_client_id, client_name FROM {master_clients_table} ORDER BY client_name")
-            clients = cursor.fetchall()
-        finally:
-            conn.close()
+        clients = ref.clients
         
         client_options = [""] + [f"{client[1]}" for client in clients]
         client_names = {f"{client[1]}": client[0] for client in clients}
@@ -7879,22 +8094,8 @@ def show_add_candidate_form():
         not_linked_to_staffing_plan = st.checkbox("Not Linked to Staffing Plan", value=False, key="add_not_linked")
         
         # Staffing Manager field (always visible but enabled only when checkbox is checked)
-        staffing_managers = []
-        try:
-            import os
-            import psycopg2
-            conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-            cursor = conn.cursor()
-            # Get FTE talent from unified talent table
-            talent_supply_table = env_manager.get_table_name('talent_supply')
-            cursor.execute(f"SELECT DISTINCT name FROM {talent_supply_table} WHERE type = 'FTE' AND name IS NOT NULL AND name != '' ORDER BY name")
-            staffing_managers = [row[0] for row in cursor.fetchall()]
-            conn.close()
-        except Exception as e:
-            st.error(f"Error loading staffing managers: {str(e)}")
-            staffing_managers = []
-        
-        staffing_manager_options = [""] + staffing_managers
+        # FTE talent from unified talent table
+        staffing_manager_options = [""] + ref.staffing_managers
         selected_staffing_manager = st.selectbox(
             "Staffing Manager", 
             staffing_manager_options, 
@@ -7914,20 +8115,8 @@ def show_add_candidate_form():
             candidate_name = st.text_input("Candidate Name")
             
             # 2. Role with dynamic addition
-            # Get existing roles
-            import os
             # Get roles from candidate_data table (cleaned statuses from aggregator transformation)
-            import psycopg2
-            conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-            existing_roles = []
-            try:
-                cursor = conn.cursor()
-                # Use environment-aware table name
-                candidate_data_table = env_manager.get_table_name('candidate_data')
-                cursor.execute(f"SELECT DISTINCT staffing_role FROM {candidate_data_table} WHERE staffing_role IS NOT NULL AND staffing_role != '' ORDER BY staffing_role")
-                existing_roles = [row[0] for row in cursor.fetchall()]
-            finally:
-                conn.close()
+            existing_roles = _load_distinct_staffing_roles(_tbl('candidate_data'))
             
             role_col1, role_col2 = st.columns([3, 1])
             with role_col1:
@@ -7946,10 +8135,11 @@ def show_add_candidate_form():
                     try:
                         cursor = conn.cursor()
                         # Insert a dummy candidate record with the new role
-                        candidate_data_table = env_manager.get_table_name('candidate_data')
+                        candidate_data_table = _tbl('candidate_data')
                         cursor.execute(f"INSERT INTO {candidate_data_table} (candidate_name, staffing_role, status, created_date) VALUES (%s, %s, %s, %s)", 
                                      (f"New Role Template - {new_role}", new_role, "Screening", datetime.now()))
                         conn.commit()
+                        _invalidate_candidate_caches()
                         st.success(f"Role '{new_role}' added successfully!")
                         st.session_state.show_new_role_field = False
                         st.rerun()
@@ -7969,15 +8159,7 @@ def show_add_candidate_form():
             skills = st.text_area("Skills", height=100)
             
             # 6. Status - get from pipeline stages
-            conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-            statuses = []
-            try:
-                cursor = conn.cursor()
-                pipeline_stages_table = env_manager.get_table_name('pipeline_stages')
-                cursor.execute(f"SELECT DISTINCT stage_name FROM {pipeline_stages_table} WHERE is_active = TRUE ORDER BY stage_name")
-                statuses = [row[0] for row in cursor.fetchall()]
-            finally:
-                conn.close()
+            statuses = ref.statuses
             
             if "Added to Pipeline" not in statuses:
                 statuses.insert(0, "Added to Pipeline")
@@ -7994,41 +8176,15 @@ def show_add_candidate_form():
             source = st.selectbox("Source", [""] + source_options)
             
             # 10. Vendor Partner (always enabled)
-            # Get vendor partners data
-            conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-            partners = []
-            try:
-                cursor = conn.cursor()
-                cursor.execute("SELECT partner_name FROM vendor_partners ORDER BY partner_name")
-                partners = [row[0] for row in cursor.fetchall()]
-            finally:
-                conn.close()
-            
             # Always show enabled vendor partner field
-            vendor_partner = st.selectbox("Vendor Partner", [""] + partners)
+            vendor_partner = st.selectbox("Vendor Partner", [""] + ref.partners)
             
             # Resume upload field (moved up as requested)
             st.markdown("#### 📄 Resume/Profile")
             resume_file = st.file_uploader("Resume/Profile", type=['pdf', 'doc', 'docx'])
             
             # Drop Reason (positioned below Resume field as shown in screenshot)
-            drop_reason_options = [
-                "",
-                "Candidate RNR",
-                "On Hold",
-                "Internal Dropped",
-                "Duplicate Profile",
-                "Requirement on hold",
-                "Salary expectations too high",
-                "Notice period too long", 
-                "Location mismatch",
-                "Skills not matching",
-                "Candidate declined offer",
-                "Failed technical assessment",
-                "Failed interview",
-                "Background check failed",
-                "Other"
-            ]
+            drop_reason_options = DROP_REASON_OPTIONS
             
             drop_reason_selection = st.selectbox("Drop Reason", drop_reason_options, help="Select reason or choose 'Other' for custom text")
             
@@ -8135,7 +8291,6 @@ def save_candidate_data(candidate_name, role, experience, skills, client_id, sta
         return
     
     import os
-    import psycopg2
     import time
     
     current_user_email = st.session_state.get('user_email', '')
@@ -8157,53 +8312,36 @@ def save_candidate_data(candidate_name, role, experience, skills, client_id, sta
             f.write(resume_file.getbuffer())
     
     # Get environment-appropriate table name
-    env_manager = st.session_state.get('env_manager')
-    if env_manager:
-        candidate_table = env_manager.get_table_name('candidate_data')
-    else:
-        candidate_table = 'candidate_data'  # Fallback for production
+    candidate_table = _tbl('candidate_data')
     
     # Insert into database
-    conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-    try:
-        cursor = conn.cursor()
-        # First, add the new staffing columns if they don't exist
+    with get_connection_manager().get_connection() as conn:
         try:
-            cursor.execute(f"ALTER TABLE {candidate_table} ADD COLUMN IF NOT EXISTS staffing_plan_id INTEGER")
-            cursor.execute(f"ALTER TABLE {candidate_table} ADD COLUMN IF NOT EXISTS staffing_owner VARCHAR(255)")
-            cursor.execute(f"ALTER TABLE {candidate_table} ADD COLUMN IF NOT EXISTS staffing_role VARCHAR(255)")
-            cursor.execute(f"ALTER TABLE {candidate_table} ADD COLUMN IF NOT EXISTS not_linked_to_staffing_plan BOOLEAN DEFAULT FALSE")
-            cursor.execute(f"ALTER TABLE {candidate_table} ADD COLUMN IF NOT EXISTS staffing_manager VARCHAR(255)")
-            conn.commit()
-        except Exception as e:
-            # Columns might already exist
-            pass
-        
-        cursor.execute(f"""
-            INSERT INTO {candidate_table} (
-                candidate_name, role, experience_level, skills, hire_for_client_id,
-                status, status_flag, linked_pipeline_id, source, vendor_partner,
-                location, notice_period, notice_period_details, resume_file_path, notes, 
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                INSERT INTO {candidate_table} (
+                    candidate_name, role, experience_level, skills, hire_for_client_id,
+                    status, status_flag, linked_pipeline_id, source, vendor_partner,
+                    location, notice_period, notice_period_details, resume_file_path, notes, 
+                    email_id, contact_number, expected_ctc, position_start_date,
+                    next_steps, interview_feedback, drop_reason, created_by, data_source, last_manual_edit, created_flag,
+                    staffing_plan_id, staffing_owner, staffing_role, not_linked_to_staffing_plan, staffing_manager
+                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+            """, (
+                candidate_name, role, experience, skills, client_id, status,
+                status_flag, pipeline_id, source, vendor_partner, location,
+                notice_period, notice_period_details, resume_file_path, notes,
                 email_id, contact_number, expected_ctc, position_start_date,
-                next_steps, interview_feedback, drop_reason, created_by, data_source, last_manual_edit, created_flag,
+                next_steps, interview_feedback, drop_reason, current_user_email, 'manual', None, 'Y',
                 staffing_plan_id, staffing_owner, staffing_role, not_linked_to_staffing_plan, staffing_manager
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """, (
-            candidate_name, role, experience, skills, client_id, status,
-            status_flag, pipeline_id, source, vendor_partner, location,
-            notice_period, notice_period_details, resume_file_path, notes,
-            email_id, contact_number, expected_ctc, position_start_date,
-            next_steps, interview_feedback, drop_reason, current_user_email, 'manual', None, 'Y',
-            staffing_plan_id, staffing_owner, staffing_role, not_linked_to_staffing_plan, staffing_manager
-        ))
-        conn.commit()
-        st.success(f"✅ Candidate '{candidate_name}' added successfully!")
-        st.session_state.show_add_candidate_form = False
-        st.rerun()
-    except Exception as e:
-        st.error(f"Error saving candidate: {str(e)}")
-    finally:
-        conn.close()
+            ))
+            conn.commit()
+            _invalidate_candidate_caches()
+            st.success(f"✅ Candidate '{candidate_name}' added successfully!")
+            st.session_state.show_add_candidate_form = False
+            st.rerun()
+        except Exception as e:
+            st.error(f"Error saving candidate: {str(e)}")
 
 def show_edit_candidate_form():
     """Display the Edit Candidate form"""
@@ -8228,7 +8366,7 @@ def show_edit_candidate_form():
      current_next_steps, current_interview_feedback, current_drop_reason, current_staffing_plan_id, current_staffing_owner, current_staffing_role,
      current_not_linked_to_staffing_plan, current_staffing_manager) = candidate_data
     
-    env_manager = st.session_state.env_manager
+    ref = _get_edit_form_reference_data()
     
     # STEP 1: Staffing Assignment (outside form for cascading dropdowns)
     st.markdown("#### 🎯 Staffing Assignment")
@@ -8238,14 +8376,7 @@ def show_edit_candidate_form():
     with staffing_col1:
         # 1. Hire for Client
         try:
-            import os
-            import psycopg2
-            conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-            cursor = conn.cursor()
-            master_clients_table = env_manager.get_table_name('master_clients')
-            cursor.execute(f"SELECT master_client_id, client_name FROM {master_clients_table} ORDER BY client_name")
-            clients = cursor.fetchall()
-            conn.close()
+            clients = ref.clients
             
             client_options = [("", "Select Client")] + [(str(client[0]), client[1]) for client in clients]
             client_display_options = [option[1] for option in client_options]
@@ -8332,22 +8463,8 @@ def show_edit_candidate_form():
     not_linked_to_staffing_plan = st.checkbox("Not Linked to Staffing Plan", value=current_not_linked_to_staffing_plan or False, key=f"edit_not_linked_{candidate_id}")
     
     # Staffing Manager field (always visible but enabled only when checkbox is checked)
-    staffing_managers = []
-    try:
-        import os
-        import psycopg2
-        conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-        cursor = conn.cursor()
-        # Get FTE talent from unified talent table
-        talent_supply_table = env_manager.get_table_name('talent_supply')
-        cursor.execute(f"SELECT DISTINCT name FROM {talent_supply_table} WHERE type = 'FTE' AND name IS NOT NULL AND name != '' ORDER BY name")
-        staffing_managers = [row[0] for row in cursor.fetchall()]
-        conn.close()
-    except Exception as e:
-        st.error(f"Error loading staffing managers: {str(e)}")
-        staffing_managers = []
-    
-    staffing_manager_options = [""] + staffing_managers
+    # FTE talent from unified talent table
+    staffing_manager_options = [""] + ref.staffing_managers
     current_staffing_manager_index = 0
     if current_staffing_manager and current_staffing_manager in staffing_manager_options:
         current_staffing_manager_index = staffing_manager_options.index(current_staffing_manager)
@@ -8374,18 +8491,7 @@ def show_edit_candidate_form():
             candidate_name = st.text_input("Candidate Name", value=current_name or "")
             
             # Role - get from candidate_data table (cleaned statuses from aggregator transformation)
-            import os
-            import psycopg2
-            conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-            existing_roles = []
-            try:
-                cursor = conn.cursor()
-                # Use environment-aware table name
-                candidate_data_table = env_manager.get_table_name('candidate_data')
-                cursor.execute(f"SELECT DISTINCT staffing_role FROM {candidate_data_table} WHERE staffing_role IS NOT NULL AND staffing_role != '' ORDER BY staffing_role")
-                existing_roles = [row[0] for row in cursor.fetchall()]
-            finally:
-                conn.close()
+            existing_roles = _load_distinct_staffing_roles(_tbl('candidate_data'))
             
             role_options = [""] + existing_roles
             current_role_index = role_options.index(current_role) if current_role in role_options else 0
@@ -8406,15 +8512,7 @@ def show_edit_candidate_form():
             st.markdown("#### 🏢 Work Details")
             
             # Status - get from pipeline stages (to match New Candidate form)
-            conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-            statuses = []
-            try:
-                cursor = conn.cursor()
-                pipeline_stages_table = env_manager.get_table_name('pipeline_stages')
-                cursor.execute(f"SELECT DISTINCT stage_name FROM {pipeline_stages_table} WHERE is_active = TRUE ORDER BY stage_name")
-                statuses = [row[0] for row in cursor.fetchall()]
-            finally:
-                conn.close()
+            statuses = ref.statuses
             
             if "Added to Pipeline" not in statuses:
                 statuses.insert(0, "Added to Pipeline")
@@ -8437,17 +8535,7 @@ def show_edit_candidate_form():
             source = st.selectbox("Source", source_options, index=current_source_index, key=f"edit_source_{candidate_id}")
             
             # Vendor Partner (always enabled to match New Candidate form)
-            conn_vendor = psycopg2.connect(os.environ.get('DATABASE_URL'))
-            partners = []
-            try:
-                cursor_vendor = conn_vendor.cursor()
-                cursor_vendor.execute("SELECT partner_name FROM vendor_partners ORDER BY partner_name")
-                partners = [row[0] for row in cursor_vendor.fetchall()]
-            finally:
-                conn_vendor.close()
-            
-            # Always show enabled vendor partner field
-            vendor_options = [""] + partners
+            vendor_options = [""] + ref.partners
             # Ensure current_vendor_partner is properly handled
             if current_vendor_partner and current_vendor_partner in vendor_options:
                 current_vendor_index = vendor_options.index(current_vendor_partner)
@@ -8460,23 +8548,7 @@ def show_edit_candidate_form():
             resume_file = st.file_uploader("Resume/Profile", type=['pdf', 'doc', 'docx'], key=f"edit_resume_{candidate_id}")
             
             # Drop Reason (positioned below Resume field as shown in screenshot)
-            drop_reason_options = [
-                "",
-                "Candidate RNR",
-                "On Hold",
-                "Internal Dropped",
-                "Duplicate Profile",
-                "Requirement on hold",
-                "Salary expectations too high",
-                "Notice period too long", 
-                "Location mismatch",
-                "Skills not matching",
-                "Candidate declined offer",
-                "Failed technical assessment",
-                "Failed interview",
-                "Background check failed",
-                "Other"
-            ]
+            drop_reason_options = DROP_REASON_OPTIONS
             
             current_drop_reason = candidate_data[21] if len(candidate_data) > 21 else ""  # drop_reason is at index 21
             
@@ -8487,12 +8559,10 @@ def show_edit_candidate_form():
             if current_drop_reason:
                 # Check if current drop reason matches any of the predefined options
                 matched_option = None
-                for option in drop_reason_options[1:-1]:  # Skip empty and "Other"
-                    if current_drop_reason.startswith(option):
-                        matched_option = option
-                        if " - " in current_drop_reason:
-                            current_additional_details = current_drop_reason.split(" - ", 1)[1]
-                        break
+                if current_drop_reason.startswith(_DROP_PREFIX_LEN_SORTED):
+                    matched_option = next(p for p in _DROP_PREFIX_LEN_SORTED if current_drop_reason.startswith(p))
+                    if " - " in current_drop_reason:
+                        current_additional_details = current_drop_reason.split(" - ", 1)[1]
                 
                 if matched_option:
                     current_drop_reason_selection = matched_option
@@ -8618,6 +8688,63 @@ def show_edit_candidate_form():
             else:
                 st.error("Please provide a candidate name.")
 
+def _nn(value):
+    """Display fallback for empty candidate fields"""
+    return value if value else 'Not specified'
+
+# Markdown tables of the candidate view, filled from one dict of display values
+CANDIDATE_VIEW_MAIN_TEMPLATE = """
+| **Field** | **Value** |
+|-----------|-----------|
+| **Candidate Name** | {candidate_name} |
+| **Client** | {client_name} |
+| **Role** | {role} |
+| **Location** | {location} |
+| **Status** | {status} |
+"""
+
+CANDIDATE_VIEW_PROFESSIONAL_TEMPLATE = """
+| Field | Value |
+|-------|-------|
+| Experience Level | {experience_level} |
+| Skills | {skills} |
+| Employment Type | {status_flag} |
+| Source | {source} |
+| Vendor Partner | {vendor_partner} |
+| Pipeline | {pipeline_name} |
+"""
+
+CANDIDATE_VIEW_TIMING_TEMPLATE = """
+| Field | Value |
+|-------|-------|
+| Notice Period | {notice_period} |
+| Position Start Date | {position_start_date} |
+| Expected CTC | {expected_ctc} |
+"""
+
+CANDIDATE_VIEW_CONTACT_TEMPLATE = """
+| Field | Value |
+|-------|-------|
+| Email | {email_id} |
+| Contact Number | {contact_number} |
+"""
+
+CANDIDATE_VIEW_PROCESS_TEMPLATE = """
+| Field | Value |
+|-------|-------|
+| Created Method | {created_method} |
+| Data Source | {data_source} |
+| Created By | {created_by} |
+| Added Date | {created_date} |
+"""
+
+CANDIDATE_VIEW_ADDITIONAL_FIELDS = [
+    ("Notice Period Details", 'notice_period_details'),
+    ("Notes", 'notes'),
+    ("Next Steps", 'next_steps'),
+    ("Interview Feedback", 'interview_feedback'),
+]
+
 def show_view_candidate():
     """Display candidate details in view-only mode with clean professional layout"""
     candidate_id = st.session_state.get('view_candidate_id')
@@ -8626,34 +8753,12 @@ def show_view_candidate():
         return
     
     # Load full candidate data including all fields
-    import os
-    import psycopg2
-    
-    conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-    try:
-        cursor = conn.cursor()
-        candidate_data_table = env_manager.get_table_name('candidate_data')
-        master_clients_table = env_manager.get_table_name('master_clients')
-        talent_pipelines_table = env_manager.get_table_name('talent_pipelines')
-        
-        query = f"""
-            SELECT 
-                cd.candidate_name, cd.role, cd.experience_level, cd.skills, 
-                mc.client_name, cd.status, cd.status_flag, tp.name as pipeline_name,
-                cd.source, cd.vendor_partner, cd.location, cd.notice_period, 
-                cd.notice_period_details, cd.resume_file_path, cd.notes,
-                cd.email_id, cd.contact_number, cd.expected_ctc, cd.position_start_date,
-                cd.next_steps, cd.interview_feedback, cd.created_date, cd.created_flag,
-                cd.data_source, cd.created_by
-            FROM {candidate_data_table} cd
-            LEFT JOIN {master_clients_table} mc ON cd.hire_for_client_id = mc.master_client_id
-            LEFT JOIN {talent_pipelines_table} tp ON cd.linked_pipeline_id = tp.id
-            WHERE cd.id = %s
-        """
-        cursor.execute(query, (candidate_id,))
-        candidate = cursor.fetchone()
-    finally:
-        conn.close()
+    candidate = _load_candidate_view(
+        candidate_id,
+        _tbl('candidate_data'),
+        _tbl('master_clients'),
+        _tbl('talent_pipelines')
+    )
     
     if not candidate:
         st.error("Candidate not found.")
@@ -8688,20 +8793,17 @@ def show_view_candidate():
     
     st.markdown("---")
     
+    # Every display value is resolved once; the templates only look them up
+    values = {field: _nn(value) for field, value in candidate.items()}
+    values['created_method'] = 'Form Entry' if candidate['created_flag'] == 'Y' else 'Data Import'
+    values['data_source'] = candidate['data_source'] or 'Manual'
+    values['created_by'] = candidate['created_by'] or 'System'
+    
     # Clean header layout showing main details
     st.markdown("### Candidate Record")
     
     # Main information table
-    main_info = f"""
-    | **Field** | **Value** |
-    |-----------|-----------|
-    | **Candidate Name** | {candidate[0] or 'Not specified'} |
-    | **Client** | {candidate[4] or 'Not specified'} |
-    | **Role** | {candidate[1] or 'Not specified'} |
-    | **Location** | {candidate[10] or 'Not specified'} |
-    | **Status** | {candidate[5] or 'Not specified'} |
-    """
-    st.markdown(main_info)
+    st.markdown(CANDIDATE_VIEW_MAIN_TEMPLATE.format_map(values))
     
     st.markdown("---")
     
@@ -8710,110 +8812,67 @@ def show_view_candidate():
     
     with col1:
         st.markdown("**Professional Details**")
-        prof_info = f"""
-        | Field | Value |
-        |-------|-------|
-        | Experience Level | {candidate[2] or 'Not specified'} |
-        | Skills | {candidate[3] or 'Not specified'} |
-        | Employment Type | {candidate[6] or 'Not specified'} |
-        | Source | {candidate[8] or 'Not specified'} |
-        | Vendor Partner | {candidate[9] or 'Not specified'} |
-        | Pipeline | {candidate[7] or 'Not specified'} |
-        """
-        st.markdown(prof_info)
+        st.markdown(CANDIDATE_VIEW_PROFESSIONAL_TEMPLATE.format_map(values))
         
         st.markdown("**Timing & Availability**")
-        timing_info = f"""
-        | Field | Value |
-        |-------|-------|
-        | Notice Period | {candidate[11] or 'Not specified'} |
-        | Position Start Date | {candidate[18] if candidate[18] else 'Not specified'} |
-        | Expected CTC | {candidate[17] or 'Not specified'} |
-        """
-        st.markdown(timing_info)
+        st.markdown(CANDIDATE_VIEW_TIMING_TEMPLATE.format_map(values))
     
     with col2:
         st.markdown("**Contact Information**")
-        contact_info = f"""
-        | Field | Value |
-        |-------|-------|
-        | Email | {candidate[15] or 'Not specified'} |
-        | Contact Number | {candidate[16] or 'Not specified'} |
-        """
-        st.markdown(contact_info)
+        st.markdown(CANDIDATE_VIEW_CONTACT_TEMPLATE.format_map(values))
         
         st.markdown("**Process Information**")
-        process_info = f"""
-        | Field | Value |
-        |-------|-------|
-        | Created Method | {'Form Entry' if candidate[22] == 'Y' else 'Data Import'} |
-        | Data Source | {candidate[23] or 'Manual'} |
-        | Created By | {candidate[24] or 'System'} |
-        | Added Date | {candidate[21] if candidate[21] else 'Not specified'} |
-        """
-        st.markdown(process_info)
+        st.markdown(CANDIDATE_VIEW_PROCESS_TEMPLATE.format_map(values))
     
     # Additional details section
-    if any([candidate[12], candidate[14], candidate[19], candidate[20]]):
+    additional_details = [
+        (label, candidate[field]) for label, field in CANDIDATE_VIEW_ADDITIONAL_FIELDS if candidate[field]
+    ]
+    if additional_details:
         st.markdown("---")
         st.markdown("**Additional Details**")
         
-        if candidate[12]:
-            st.markdown(f"**Notice Period Details:** {candidate[12]}")
-        
-        if candidate[14]:
-            st.markdown(f"**Notes:** {candidate[14]}")
-        
-        if candidate[19]:
-            st.markdown(f"**Next Steps:** {candidate[19]}")
-        
-        if candidate[20]:
-            st.markdown(f"**Interview Feedback:** {candidate[20]}")
+        for label, value in additional_details:
+            st.markdown(f"**{label}:** {value}")
     
     # Resume section
-    if candidate[13]:
+    if candidate['resume_file_path']:
         st.markdown("---")
         st.markdown("**Resume Information**")
-        st.markdown(f"File Path: `{candidate[13]}`")
+        st.markdown(f"File Path: `{candidate['resume_file_path']}`")
+
+def delete_candidates(candidate_ids):
+    """Delete several candidates in a single statement and transaction"""
+    candidate_ids = [int(candidate_id) for candidate_id in candidate_ids if candidate_id is not None]
+    if not candidate_ids:
+        return 0
+    with get_connection_manager().get_connection() as conn:
+        try:
+            cursor = conn.cursor()
+            candidate_data_table = _tbl('candidate_data')
+            # psycopg2 adapts the Python list to a Postgres array
+            cursor.execute(f"DELETE FROM {candidate_data_table} WHERE id = ANY(%s)", (candidate_ids,))
+            deleted_count = cursor.rowcount
+            conn.commit()
+            _invalidate_candidate_caches()
+            if len(candidate_ids) == 1:
+                st.success("✅ Candidate deleted successfully!")
+            else:
+                st.success(f"✅ {deleted_count} candidates deleted successfully!")
+            return deleted_count
+        except Exception as e:
+            st.error(f"Error deleting candidate: {str(e)}")
+            return 0
 
 def delete_candidate(candidate_id):
     """Delete a candidate from the database"""
-    import os
-    import psycopg2
-    
-    conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-    try:
-        cursor = conn.cursor()
-        candidate_data_table = env_manager.get_table_name('candidate_data')
-        cursor.execute(f"DELETE FROM {candidate_data_table} WHERE id = %s", (candidate_id,))
-        conn.commit()
-        st.success("✅ Candidate deleted successfully!")
-    except Exception as e:
-        st.error(f"Error deleting candidate: {str(e)}")
-    finally:
-        conn.close()
+    return delete_candidates([candidate_id])
 
 def load_candidate_for_edit(candidate_id):
     """Load candidate data for editing"""
-    import os
-    import psycopg2
-    
-    conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-    try:
+    with get_connection_manager().get_connection() as conn:
         cursor = conn.cursor()
-        # First, add the new staffing columns if they don't exist
-        try:
-            candidate_data_table = env_manager.get_table_name('candidate_data')
-            cursor.execute(f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_plan_id INTEGER")
-            cursor.execute(f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_owner VARCHAR(255)")
-            cursor.execute(f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_role VARCHAR(255)")
-            cursor.execute(f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS not_linked_to_staffing_plan BOOLEAN DEFAULT FALSE")
-            cursor.execute(f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_manager VARCHAR(255)")
-            conn.commit()
-        except Exception as e:
-            # Columns might already exist
-            pass
-        
+        candidate_data_table = _tbl('candidate_data')
         query = f"""
             SELECT 
                 candidate_name, role, experience_level, skills, hire_for_client_id,
@@ -8827,56 +8886,128 @@ def load_candidate_for_edit(candidate_id):
         """
         cursor.execute(query, (candidate_id,))
         return cursor.fetchone()
-    finally:
-        conn.close()
 
 def update_candidate(candidate_id, candidate_data):
     """Update candidate information"""
-    import os
-    import psycopg2
-    
-    conn = psycopg2.connect(os.environ.get('DATABASE_URL'))
-    try:
-        cursor = conn.cursor()
-        # First, add the new staffing columns if they don't exist
+    with get_connection_manager().get_connection() as conn:
         try:
-            candidate_data_table = env_manager.get_table_name('candidate_data')
-            cursor.execute(f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_plan_id INTEGER")
-            cursor.execute(f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_owner VARCHAR(255)")
-            cursor.execute(f"ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS staffing_role VARCHAR(255)")
+            cursor = conn.cursor()
+            candidate_data_table = _tbl('candidate_data')
+            cursor.execute(f"""
+                UPDATE {candidate_data_table} SET
+                    candidate_name = %s, role = %s, experience_level = %s, skills = %s,
+                    hire_for_client_id = %s, status = %s, status_flag = %s,
+                    linked_pipeline_id = %s, source = %s, vendor_partner = %s,
+                    location = %s, notice_period = %s, notice_period_details = %s,
+                    resume_file_path = %s, notes = %s, email_id = %s, contact_number = %s,
+                    expected_ctc = %s, position_start_date = %s, next_steps = %s,
+                    interview_feedback = %s, drop_reason = %s, staffing_plan_id = %s, staffing_owner = %s, staffing_role = %s,
+                    not_linked_to_staffing_plan = %s, staffing_manager = %s,
+                    updated_date = CURRENT_TIMESTAMP, last_manual_edit = CURRENT_TIMESTAMP
+                WHERE id = %s
+            """, (*candidate_data, candidate_id))
             conn.commit()
+            _invalidate_candidate_caches()
+            st.success("✅ Candidate updated successfully!")
+            return True
         except Exception as e:
-            # Columns might already exist
-            pass
-        
-        cursor.execute(f"""
-            UPDATE {candidate_data_table} SET
-                candidate_name = %s, role = %s, experience_level = %s, skills = %s,
-                hire_for_client_id = %s, status = %s, status_flag = %s,
-                linked_pipeline_id = %s, source = %s, vendor_partner = %s,
-                location = %s, notice_period = %s, notice_period_details = %s,
-                resume_file_path = %s, notes = %s, email_id = %s, contact_number = %s,
-                expected_ctc = %s, position_start_date = %s, next_steps = %s,
-                interview_feedback = %s, drop_reason = %s, staffing_plan_id = %s, staffing_owner = %s, staffing_role = %s,
-                not_linked_to_staffing_plan = %s, staffing_manager = %s,
-                updated_date = CURRENT_TIMESTAMP, last_manual_edit = CURRENT_TIMESTAMP
-            WHERE id = %s
-        """, (*candidate_data, candidate_id))
-        conn.commit()
-        st.success("✅ Candidate updated successfully!")
-        return True
-    except Exception as e:
-        st.error(f"Error updating candidate: {str(e)}")
-        return False
-    finally:
-        conn.close()
+            st.error(f"Error updating candidate: {str(e)}")
+            return False
 
-def display_candidate_list():
-    """Display list of existing candidates"""
-    st.markdown("### 📋 Candidate List")
+def _candidate_list_filter_conditions(activity_status, filter_mask, status_category):
+    """WHERE predicates for the candidate list's Activity, search and dropdown filters"""
+    where_conditions = []
     
-    import os
-    import psycopg2
+    # Handle Activity Status filter (Active/Inactive)
+    if activity_status == "Active Only":
+        where_conditions.append(f"{status_category} = 'active'")
+    elif activity_status == "Inactive Only":
+        where_conditions.append(f"{status_category} = 'inactive'")
+    # If "All" is selected, no additional filter is applied
+    
+    filter_predicates = (
+        "cd.candidate_name ILIKE %s",
+        "cd.status = %s",
+        "mc.client_name = %s",
+        "cd.role = %s",
+        "sp.plan_name = %s",
+        "cd.drop_reason = %s",
+    )
+    where_conditions.extend(predicate for predicate, active in zip(filter_predicates, filter_mask) if active)
+    return where_conditions
+
+@functools.lru_cache(maxsize=256)
+def _build_candidate_list_sql(activity_status, filter_mask, cursor_kind, tables, status_category):
+    """Compose the candidate list page query for one filter shape
+
+    filter_mask flags (search, status, client, role, supply plan, drop reason)
+    filters that are set; cursor_kind is None, 'null' or 'value' for the keyset
+    cursor; status_category is the SQL from _candidate_status_category_sql.
+    There are only a few hundred shapes, so each SQL string is built once.
+    """
+    candidate_table, clients_table, pipelines_table, staffing_table = tables
+    where_conditions = _candidate_list_filter_conditions(activity_status, filter_mask, status_category)
+    
+    # DESC order puts NULL created_date first, so a NULL cursor only continues within the NULLs
+    if cursor_kind == 'null':
+        where_conditions.append("((cd.created_date IS NULL AND cd.id < %s) OR cd.created_date IS NOT NULL)")
+    elif cursor_kind == 'value':
+        where_conditions.append("(cd.created_date, cd.id) < (%s, %s)")
+    
+    where_clause = " WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+    
+    return f"""
+        SELECT 
+            cd.id, cd.candidate_name, cd.role, cd.experience_level, 
+            cd.status, mc.client_name, tp.name as pipeline_name,
+            cd.source, cd.location, cd.notice_period, cd.created_date,
+            cd.email_id, cd.contact_number, cd.expected_ctc, cd.data_source,
+            cd.vendor_partner, cd.created_flag, sp.plan_name as supply_plan_name
+        FROM {candidate_table} cd
+        LEFT JOIN {clients_table} mc ON cd.hire_for_client_id = mc.master_client_id
+        LEFT JOIN {pipelines_table} tp ON cd.linked_pipeline_id = tp.id
+        LEFT JOIN {staffing_table} sp ON cd.staffing_plan_id = sp.id
+        {where_clause}
+        ORDER BY cd.created_date DESC, cd.id DESC
+        LIMIT %s
+    """
+
+@functools.lru_cache(maxsize=256)
+def _build_candidate_count_sql(activity_status, filter_mask, tables, status_category):
+    """Compose the filtered candidate count for one filter shape (same filters as the page query, no cursor)"""
+    candidate_table, clients_table, pipelines_table, staffing_table = tables
+    where_conditions = _candidate_list_filter_conditions(activity_status, filter_mask, status_category)
+    where_clause = " WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+    
+    return f"""
+        SELECT COUNT(*)
+        FROM {candidate_table} cd
+        LEFT JOIN {clients_table} mc ON cd.hire_for_client_id = mc.master_client_id
+        LEFT JOIN {staffing_table} sp ON cd.staffing_plan_id = sp.id
+        {where_clause}
+    """
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_candidate_filtered_count(count_query, params):
+    """Get the number of candidates matching the list filters; keyed on the query and its parameters"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(count_query, params)
+        return cursor.fetchone()[0]
+
+@st.fragment
+def display_candidate_list():
+    """Display list of existing candidates
+
+    Runs as a fragment so filter, pagination and selection changes only rerun
+    the list; View/Edit need the forms above it and rerun the whole app.
+    """
+    candidate_table = _tbl('candidate_data')
+    clients_table = _tbl('master_clients')
+    staffing_table = _tbl('staffing_plans')
+    pipelines_table = _tbl('talent_pipelines')
+    
+    st.markdown("### 📋 Candidate List")
     
     # Initialize default filter states
     if 'candidate_activity_filter' not in st.session_state:
@@ -8898,79 +9029,28 @@ def display_candidate_list():
         selected_activity_status = st.selectbox("Activity Status", activity_status_options, key="candidate_activity_filter")
     
     with filter_col3:
-        # Status filter - force refresh by clearing cache
-        if 'status_options_cache' not in st.session_state:
-            st.session_state.status_options_cache = None
-        
-        # Force refresh of status options
-        conn_temp = psycopg2.connect(env_manager.get_database_url())
-        cursor_temp = conn_temp.cursor()
-        candidate_table_temp = env_manager.get_table_name('candidate_data')
-        cursor_temp.execute(f"SELECT DISTINCT status FROM {candidate_table_temp} WHERE status IS NOT NULL AND status != '' ORDER BY status")
-        status_options = ["All"] + [row[0] for row in cursor_temp.fetchall()]
-        conn_temp.close()
-        
-        # Store in session state for debugging
-        st.session_state.status_options_cache = status_options
-        
+        # Status filter
+        status_options = ["All"] + _distinct_statuses(candidate_table)
         selected_status = st.selectbox("Filter by Status", status_options, key="candidate_status_filter")
     
     with filter_col4:
         # Client filter
-        conn_temp = psycopg2.connect(env_manager.get_database_url())
-        cursor_temp = conn_temp.cursor()
-        candidate_table_temp = env_manager.get_table_name('candidate_data')
-        clients_table_temp = env_manager.get_table_name('master_clients')
-        cursor_temp.execute(f"""
-            SELECT DISTINCT mc.client_name 
-            FROM {candidate_table_temp} cd
-            LEFT JOIN {clients_table_temp} mc ON cd.hire_for_client_id = mc.master_client_id
-            WHERE mc.client_name IS NOT NULL
-            ORDER BY mc.client_name
-        """)
-        client_options = ["All"] + [row[0] for row in cursor_temp.fetchall()]
-        conn_temp.close()
-        
+        client_options = ["All"] + _distinct_candidate_clients(candidate_table, clients_table)
         selected_client = st.selectbox("Filter by Client", client_options, key="candidate_client_filter")
     
     with filter_col5:
         # Role filter
-        conn_temp = psycopg2.connect(env_manager.get_database_url())
-        cursor_temp = conn_temp.cursor()
-        candidate_table_temp = env_manager.get_table_name('candidate_data')
-        cursor_temp.execute(f"SELECT DISTINCT role FROM {candidate_table_temp} WHERE role IS NOT NULL AND role != '' ORDER BY role")
-        role_options = ["All"] + [row[0] for row in cursor_temp.fetchall()]
-        conn_temp.close()
-        
+        role_options = ["All"] + _distinct_roles(candidate_table)
         selected_role = st.selectbox("Filter by Role", role_options, key="candidate_role_filter")
     
     with filter_col6:
         # Supply Plan filter
-        conn_temp = psycopg2.connect(env_manager.get_database_url())
-        cursor_temp = conn_temp.cursor()
-        candidate_table_temp = env_manager.get_table_name('candidate_data')
-        staffing_table_temp = env_manager.get_table_name('staffing_plans')
-        cursor_temp.execute(f"""
-            SELECT DISTINCT sp.plan_name 
-            FROM {candidate_table_temp} cd
-            LEFT JOIN {staffing_table_temp} sp ON cd.staffing_plan_id = sp.id
-            WHERE sp.plan_name IS NOT NULL
-            ORDER BY sp.plan_name
-        """)
-        supply_plan_options = ["All"] + [row[0] for row in cursor_temp.fetchall()]
-        conn_temp.close()
-        
+        supply_plan_options = ["All"] + _distinct_supply_plans(candidate_table, staffing_table)
         selected_supply_plan = st.selectbox("Filter by Supply Plan", supply_plan_options, key="candidate_supply_plan_filter")
     
     with filter_col7:
         # Drop Reason filter
-        conn_temp = psycopg2.connect(env_manager.get_database_url())
-        cursor_temp = conn_temp.cursor()
-        candidate_table_temp = env_manager.get_table_name('candidate_data')
-        cursor_temp.execute(f"SELECT DISTINCT drop_reason FROM {candidate_table_temp} WHERE drop_reason IS NOT NULL AND drop_reason != '' ORDER BY drop_reason")
-        drop_reason_options = ["All"] + [row[0] for row in cursor_temp.fetchall()]
-        conn_temp.close()
-        
+        drop_reason_options = ["All"] + _distinct_drop_reasons(candidate_table)
         selected_drop_reason = st.selectbox("Filter by Drop Reason", drop_reason_options, key="candidate_drop_reason_filter")
     
     # Clear filters button and active filters display
@@ -9005,221 +9085,135 @@ def display_candidate_list():
             st.session_state.candidate_role_filter = "All"
             st.session_state.candidate_supply_plan_filter = "All"
             st.session_state.candidate_drop_reason_filter = "All"
-            st.session_state.candidate_page = 0
-            st.rerun()
+            st.session_state.candidate_cursor_stack = []
+            st.session_state.pop("candidate_list_table", None)
+            st.rerun(scope="fragment")
     
     # Reset pagination when filters change
     current_filters = (search_term, selected_activity_status, selected_status, selected_client, selected_role, selected_supply_plan, selected_drop_reason)
     if 'last_candidate_filters' not in st.session_state:
         st.session_state.last_candidate_filters = current_filters
     elif st.session_state.last_candidate_filters != current_filters:
-        st.session_state.candidate_page = 0
+        st.session_state.candidate_cursor_stack = []
         st.session_state.last_candidate_filters = current_filters
+        # Row selections refer to positions on the page that was shown before
+        st.session_state.pop("candidate_list_table", None)
     
-    # Pagination controls
-    if 'candidate_page' not in st.session_state:
-        st.session_state.candidate_page = 0
+    # Keyset pagination: one (created_date, id) cursor per page already passed
+    if 'candidate_cursor_stack' not in st.session_state:
+        st.session_state.candidate_cursor_stack = []
+    cursor_stack = st.session_state.candidate_cursor_stack
+    current_page = len(cursor_stack)
     
     records_per_page = 30
     
-    # Build WHERE clause based on filters
-    where_conditions = []
+    # Parameters in the same order as the predicates added by _build_candidate_list_sql
     params = []
-    
-    # Handle Activity Status filter (Active/Inactive)
-    if selected_activity_status == "Active Only":
-        # Active = NOT (Rejected, On Hold, On-Hold, RNR, Dropped, Internal Dropped)
-        where_conditions.append("(cd.status NOT ILIKE %s AND cd.status NOT ILIKE %s AND cd.status NOT ILIKE %s AND cd.status NOT ILIKE %s AND cd.status != %s AND cd.status NOT ILIKE %s)")
-        params.extend(['%Rejected%', '%On Hold%', '%On-Hold%', '%RNR%', 'Dropped', '%Internal Dropped%'])
-    elif selected_activity_status == "Inactive Only":
-        # Inactive = Rejected, On Hold, On-Hold, RNR, Dropped, Internal Dropped
-        where_conditions.append("(cd.status ILIKE %s OR cd.status ILIKE %s OR cd.status ILIKE %s OR cd.status ILIKE %s OR cd.status = %s OR cd.status ILIKE %s)")
-        params.extend(['%Rejected%', '%On Hold%', '%On-Hold%', '%RNR%', 'Dropped', '%Internal Dropped%'])
-    # If "All" is selected, no additional filter is applied
-    
     if search_term:
-        where_conditions.append("cd.candidate_name ILIKE %s")
         params.append(f'%{search_term}%')
+    for selected_value in (selected_status, selected_client, selected_role, selected_supply_plan, selected_drop_reason):
+        if selected_value != "All":
+            params.append(selected_value)
+    
+    filter_mask = (bool(search_term), selected_status != "All", selected_client != "All",
+                   selected_role != "All", selected_supply_plan != "All", selected_drop_reason != "All")
+    list_tables = (candidate_table, clients_table, pipelines_table, staffing_table)
+    status_category = _candidate_status_category_sql(candidate_table, alias='cd')
+    
+    # Filtered total for the header; cursor-independent, so it is cached per filter combination
+    total_records = _load_candidate_filtered_count(
+        _build_candidate_count_sql(selected_activity_status, filter_mask, list_tables, status_category),
+        tuple(params)
+    )
     
-    if selected_status != "All":
-        where_conditions.append("cd.status = %s")
-        params.append(selected_status)
-    
-    if selected_client != "All":
-        where_conditions.append("mc.client_name = %s")
-        params.append(selected_client)
-    
-    if selected_role != "All":
-        where_conditions.append("cd.role = %s")
-        params.append(selected_role)
-    
-    if selected_supply_plan != "All":
-        where_conditions.append("sp.plan_name = %s")
-        params.append(selected_supply_plan)
-    
-    if selected_drop_reason != "All":
-        where_conditions.append("cd.drop_reason = %s")
-        params.append(selected_drop_reason)
-    
-    where_clause = " WHERE " + " AND ".join(where_conditions) if where_conditions else ""
+    # Seek past the last row of the previous page instead of OFFSET-scanning it
+    cursor_kind = None
+    if cursor_stack:
+        last_created_date, last_id = cursor_stack[-1]
+        if last_created_date is None:
+            cursor_kind = 'null'
+            params.append(last_id)
+        else:
+            cursor_kind = 'value'
+            params.extend([last_created_date, last_id])
     
-    # Get total count with filters
-    conn = psycopg2.connect(env_manager.get_database_url())
-    cursor = conn.cursor()
+    main_query = _build_candidate_list_sql(selected_activity_status, filter_mask, cursor_kind, list_tables, status_category)
     
-    # Get environment-specific table names
-    candidate_table = env_manager.get_table_name('candidate_data')
-    clients_table = env_manager.get_table_name('master_clients')
-    staffing_table = env_manager.get_table_name('staffing_plans')
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        # Fetch one extra row to know whether a next page exists
+        cursor.execute(main_query, params + [records_per_page + 1])
+        rows = cursor.fetchall()
+        candidate_columns = [desc[0] for desc in cursor.description]
+    
+    if not rows and cursor_stack:
+        # Page fell past the end (e.g. after deletes) - go back to the first page
+        st.session_state.candidate_cursor_stack = []
+        st.session_state.pop("candidate_list_table", None)
+        st.rerun()
     
-    count_query = f"""
-        SELECT COUNT(*) 
-        FROM {candidate_table} cd
-        LEFT JOIN {clients_table} mc ON cd.hire_for_client_id = mc.master_client_id
-        LEFT JOIN {staffing_table} sp ON cd.staffing_plan_id = sp.id
-        {where_clause}
-    """
-    cursor.execute(count_query, params)
+    has_next_page = len(rows) > records_per_page
+    candidates = rows[:records_per_page]
+    name_by_id = {c[0]: (c[1] or 'Unnamed') for c in candidates}
     
-    total_records = cursor.fetchone()[0]
-    total_pages = (total_records + records_per_page - 1) // records_per_page
+    # Get comprehensive metrics from database - always show total database counts (not filtered)
+    total_count, active_count, inactive_count, hired_count, vendor_count = _load_candidate_metrics(candidate_table)
     
     # Pagination controls
     col_prev, col_page_info, col_next = st.columns([1, 2, 1])
     
     with col_prev:
-        if st.button("⬅️ Previous", disabled=st.session_state.candidate_page == 0):
-            st.session_state.candidate_page -= 1
-            st.rerun()
+        if st.button("⬅️ Previous", disabled=current_page == 0):
+            cursor_stack.pop()
+            st.session_state.pop("candidate_list_table", None)
+            st.rerun(scope="fragment")
     
     with col_page_info:
-        start_record = st.session_state.candidate_page * records_per_page + 1
-        end_record = min((st.session_state.candidate_page + 1) * records_per_page, total_records)
-        st.markdown(f"**Showing {start_record}-{end_record} of {total_records} candidates | Page {st.session_state.candidate_page + 1} of {total_pages}**")
+        start_record = current_page * records_per_page + 1
+        end_record = current_page * records_per_page + len(candidates)
+        st.markdown(f"**Showing {start_record}-{end_record} of {total_records} candidates | Page {current_page + 1}**")
     
     with col_next:
-        if st.button("Next ➡️", disabled=st.session_state.candidate_page >= total_pages - 1):
-            st.session_state.candidate_page += 1
-            st.rerun()
+        if st.button("Next ➡️", disabled=not has_next_page):
+            # candidate[10] is created_date
+            last_candidate = candidates[-1]
+            cursor_stack.append((last_candidate[10], last_candidate[0]))
+            st.session_state.pop("candidate_list_table", None)
+            st.rerun(scope="fragment")
     
-    # Get paginated candidates with filters
-    try:
-        offset = st.session_state.candidate_page * records_per_page
-        
-        pipelines_table = env_manager.get_table_name('talent_pipelines')
-        
-        main_query = f"""
-            SELECT 
-                cd.id, cd.candidate_name, cd.role, cd.experience_level, 
-                cd.status, mc.client_name, tp.name as pipeline_name,
-                cd.source, cd.location, cd.notice_period, cd.created_date,
-                cd.email_id, cd.contact_number, cd.expected_ctc, cd.data_source,
-                cd.vendor_partner, cd.created_flag, sp.plan_name as supply_plan_name
-            FROM {candidate_table} cd
-            LEFT JOIN {clients_table} mc ON cd.hire_for_client_id = mc.master_client_id
-            LEFT JOIN {pipelines_table} tp ON cd.linked_pipeline_id = tp.id
-            LEFT JOIN {staffing_table} sp ON cd.staffing_plan_id = sp.id
-            {where_clause}
-            ORDER BY cd.created_date DESC
-            LIMIT %s OFFSET %s
-        """
-        
-        cursor.execute(main_query, params + [records_per_page, offset])
-        
-        candidates = cursor.fetchall()
-        
-        # Get comprehensive metrics from database - always show total database counts (not filtered)
-        # Total count (always all candidates)
-        cursor.execute(f"SELECT COUNT(*) FROM {candidate_table}")
-        total_count = cursor.fetchone()[0]
-        
-        # Active count
-        cursor.execute(f"""
-            SELECT COUNT(*) FROM {candidate_table} 
-            WHERE (status NOT ILIKE '%Rejected%' AND status NOT ILIKE '%On Hold%' 
-                   AND status NOT ILIKE '%On-Hold%' AND status NOT ILIKE '%RNR%' 
-                   AND status != 'Dropped' AND status NOT ILIKE '%Internal Dropped%'
-                   AND status NOT ILIKE '%Candidate RNR/Dropped%' AND status NOT ILIKE '%Requirement on hold%'
-                   AND status NOT ILIKE '%Duplicate Profile%')
-        """)
-        active_count = cursor.fetchone()[0]
-        
-        # Inactive count
-        cursor.execute(f"""
-            SELECT COUNT(*) FROM {candidate_table} 
-            WHERE (status ILIKE '%Rejected%' OR status ILIKE '%On Hold%' 
-                   OR status ILIKE '%On-Hold%' OR status ILIKE '%RNR%' 
-                   OR status = 'Dropped' OR status ILIKE '%Internal Dropped%'
-                   OR status ILIKE '%Candidate RNR/Dropped%' OR status ILIKE '%Requirement on hold%'
-                   OR status ILIKE '%Duplicate Profile%')
-        """)
-        inactive_count = cursor.fetchone()[0]
-        
-        # Hired count - using actual production status values
-        cursor.execute(f"""
-            SELECT COUNT(*) FROM {candidate_table} 
-            WHERE status = 'Staffed'
-        """)
-        hired_count = cursor.fetchone()[0]
-        
-        # Vendor count - all candidates are from vendors in production
-        cursor.execute(f"""
-            SELECT COUNT(*) FROM {candidate_table} 
-            WHERE (source = 'Vendor' OR vendor_partner IS NOT NULL OR source IS NOT NULL)
-        """)
-        vendor_count = cursor.fetchone()[0]
-        
-        # Verify we got the data
-        if not candidates:
-            st.warning("No candidate records found. Please check the data consolidation.")
-    finally:
-        conn.close()
+    # Verify we got the data
+    if not candidates:
+        st.warning("No candidate records found. Please check the data consolidation.")
     
     if candidates:
-        # Create dataframe for display
-        import pandas as pd
-        df_data = []
-        for candidate in candidates:
-            # Add data source and creation indicators
-            source_indicator = ""
-            if candidate[14]:  # data_source field (index 14)
-                if candidate[14] == 'import':
-                    source_indicator = " 📊"
-                elif candidate[14] == 'hybrid':
-                    source_indicator = " 🔄"
-                # manual gets no indicator (default)
-            
-            # Add created flag indicator
-            created_indicator = ""
-            if candidate[16]:  # created_flag field (index 16)
-                if candidate[16] == 'N':
-                    created_indicator = " (Import)"
-                # 'Y' gets no indicator (form-created is default)
-            
-            # Determine activity status based on status
-            status = candidate[4] or ''
-            is_inactive = any(inactive_keyword.lower() in status.lower() for inactive_keyword in ['rejected', 'on hold', 'on-hold', 'rnr'])
-            activity_status = "🔴 Inactive" if is_inactive else "🟢 Active"
-            
-            df_data.append({
-                'ID': candidate[0],
-                'Candidate Name': (candidate[1] or '') + source_indicator + created_indicator,
-                'Role': candidate[2] or '',
-                'Experience': candidate[3] or '',
-                'Activity': activity_status,
-                'Status': candidate[4] or '',
-                'Client': candidate[5] or '',
-                'Pipeline': candidate[6] or '',
-                'Source': candidate[7] or '',
-                'Vendor Partner': candidate[15] or '',
-                'Linked to Supply Plan': candidate[17] if len(candidate) > 17 and candidate[17] else 'Not Linked',
-                'Location': candidate[8] or '',
-                'Notice Period': candidate[9] or '',
-                'Email': candidate[11] or '',
-                'Contact': candidate[12] or '',
-                'Created': 'Form' if candidate[16] == 'Y' else 'Import',
-                'Added Date': candidate[10] if candidate[10] else ''
-            })
+        # Build the display dataframe column-wise straight from the query result
+        candidates_df = pd.DataFrame(candidates, columns=candidate_columns)
+        status_text = candidates_df['status'].fillna('')
+        name_suffix = np.select(
+            [candidates_df['data_source'] == 'import', candidates_df['data_source'] == 'hybrid'],
+            [' 📊', ' 🔄'],
+            default=''
+        )
+        created_suffix = np.where(candidates_df['created_flag'] == 'N', ' (Import)', '')
+        df_data = pd.DataFrame({
+            'ID': candidates_df['id'],
+            'Candidate Name': candidates_df['candidate_name'].fillna('') + name_suffix + created_suffix,
+            'Role': candidates_df['role'].fillna(''),
+            'Experience': candidates_df['experience_level'].fillna(''),
+            'Activity': np.where(status_text.str.contains(INACTIVE_STATUS_PATTERN, case=False, regex=True), "🔴 Inactive", "🟢 Active"),
+            'Status': status_text,
+            'Client': candidates_df['client_name'].fillna(''),
+            'Pipeline': candidates_df['pipeline_name'].fillna(''),
+            'Source': candidates_df['source'].fillna(''),
+            'Vendor Partner': candidates_df['vendor_partner'].fillna(''),
+            'Linked to Supply Plan': candidates_df['supply_plan_name'].fillna('Not Linked').replace('', 'Not Linked'),
+            'Location': candidates_df['location'].fillna(''),
+            'Notice Period': candidates_df['notice_period'].fillna(''),
+            'Email': candidates_df['email_id'].fillna(''),
+            'Contact': candidates_df['contact_number'].fillna(''),
+            'Created': np.where(candidates_df['created_flag'] == 'Y', 'Form', 'Import'),
+            'Added Date': candidates_df['created_date'].astype(object).where(candidates_df['created_date'].notna(), '')
+        })
         
         # Display metrics using actual database totals (not filtered counts)
         col1, col2, col3, col4, col5 = st.columns(5)
@@ -9236,102 +9230,88 @@ def display_candidate_list():
         
         st.markdown("---")
         
-        # Create table header
-        header_col1, header_col2, header_col3, header_col4, header_col5, header_col6, header_col7, header_col8, header_col9 = st.columns([2, 1.3, 1.3, 1, 1, 1.2, 0.8, 0.8, 0.8])
-        
-        with header_col1:
-            st.markdown("**Candidate Name**")
-        with header_col2:
-            st.markdown("**Client**")
-        with header_col3:
-            st.markdown("**Role**")
-        with header_col4:
-            st.markdown("**Location**")
-        with header_col5:
-            st.markdown("**Status**")
-        with header_col6:
-            st.markdown("**Linked to Supply Plan**")
-        with header_col7:
-            st.markdown("**View**")
-        with header_col8:
-            st.markdown("**Edit**")
-        with header_col9:
-            st.markdown("**Delete**")
-        
-        st.markdown("---")
+        # One virtualized table instead of a row of widgets per candidate;
+        # the selected rows drive the action buttons above it
+        table_df = df_data[['ID', 'Candidate Name', 'Client', 'Role', 'Location', 'Status', 'Linked to Supply Plan']].copy()
+        table_df['Linked to Supply Plan'] = np.where(
+            table_df['Linked to Supply Plan'] == 'Not Linked',
+            "❌ Not Linked",
+            "🔗 " + table_df['Linked to Supply Plan']
+        )
+        for column in ['Client', 'Role', 'Location', 'Status']:
+            table_df[column] = table_df[column].replace('', 'Not specified')
         
-        # Display candidates as table rows
-        for candidate in candidates:
-            row_col1, row_col2, row_col3, row_col4, row_col5, row_col6, row_col7, row_col8, row_col9 = st.columns([2, 1.3, 1.3, 1, 1, 1.2, 0.8, 0.8, 0.8])
-            
-            with row_col1:
-                candidate_name = candidate[1] or 'Unnamed'
-                # Add source indicator for imported candidates
-                source_indicator = ""
-                if candidate[14] == 'import':  # data_source = 'import' means imported
-                    source_indicator = " 📊"
-                st.write(f"{candidate_name}{source_indicator}")
-            
-            with row_col2:
-                st.write(candidate[5] or 'Not specified')
-            
-            with row_col3:
-                st.write(candidate[2] or 'Not specified')
-            
-            with row_col4:
-                st.write(candidate[8] or 'Not specified')
-            
-            with row_col5:
-                st.write(candidate[4] or 'Not specified')
-            
-            with row_col6:
-                # Display linked supply plan name or "Not Linked"
-                supply_plan = candidate[17] if len(candidate) > 17 and candidate[17] else None
-                if supply_plan:
-                    st.write(f"🔗 {supply_plan}")
-                else:
-                    st.write("❌ Not Linked")
-            
-            with row_col7:
-                if st.button("👁️", key=f"view_{candidate[0]}", help="View details"):
-                    st.session_state.view_candidate_id = candidate[0]
-                    st.session_state.show_view_candidate = True
-                    st.rerun()
-            
-            with row_col8:
-                if st.button("✏️", key=f"edit_{candidate[0]}", help="Edit candidate"):
-                    st.session_state.edit_candidate_id = candidate[0]
-                    st.session_state.show_edit_candidate_form = True
-                    st.rerun()
-            
-            with row_col9:
-                if st.button("🗑️", key=f"delete_{candidate[0]}", help="Delete candidate"):
-                    st.session_state.delete_candidate_id = candidate[0]
-                    st.session_state.confirm_delete = True
-                    st.rerun()
-            
-            st.markdown("---")
+        action_col1, action_col2, action_col3, action_col4 = st.columns([1, 1, 1, 3])
+        table_event = st.dataframe(
+            table_df,
+            column_config={
+                'ID': None,
+                'Candidate Name': st.column_config.TextColumn("Candidate Name", width="large"),
+                'Linked to Supply Plan': st.column_config.TextColumn("Linked to Supply Plan"),
+            },
+            hide_index=True,
+            use_container_width=True,
+            on_select="rerun",
+            selection_mode="multi-row",
+            key="candidate_list_table"
+        )
+        # Ignore positions past the end of this page, e.g. a selection made before the rows changed
+        selected_ids = [int(table_df['ID'].iloc[row]) for row in table_event.selection.rows if row < len(table_df)]
+        single_selection = len(selected_ids) == 1
+        selected_name = name_by_id.get(selected_ids[0], 'Unknown') if single_selection else None
+        
+        with action_col1:
+            if st.button("👁️ View", disabled=not single_selection, help=f"View details of {selected_name}" if single_selection else "View details of the selected candidate"):
+                st.session_state.view_candidate_id = selected_ids[0]
+                st.session_state.show_view_candidate = True
+                st.rerun(scope="app")
+        
+        with action_col2:
+            if st.button("✏️ Edit", disabled=not single_selection, help=f"Edit {selected_name}" if single_selection else "Edit the selected candidate"):
+                st.session_state.edit_candidate_id = selected_ids[0]
+                st.session_state.show_edit_candidate_form = True
+                st.rerun(scope="app")
+        
+        with action_col3:
+            if st.button("🗑️ Delete", disabled=not selected_ids, help=f"Delete {selected_name}" if single_selection else "Delete the selected candidates"):
+                st.session_state.delete_candidate_ids = selected_ids
+                st.session_state.confirm_delete = True
+                st.rerun(scope="fragment")
+        
+        with action_col4:
+            if not selected_ids:
+                st.caption("Select rows in the table to view, edit or delete candidates")
         
         # Handle delete confirmation
         if st.session_state.get('confirm_delete', False):
-            candidate_id = st.session_state.get('delete_candidate_id')
-            candidate_name = next((c[1] for c in candidates if c[0] == candidate_id), "Unknown")
-            
-            st.warning(f"⚠️ Are you sure you want to delete candidate '{candidate_name}'? This action cannot be undone.")
-            
-            col_confirm1, col_confirm2, col_confirm3 = st.columns([1, 1, 4])
-            with col_confirm1:
-                if st.button("✅ Yes, Delete", type="primary"):
-                    delete_candidate(candidate_id)
-                    st.session_state.confirm_delete = False
-                    st.session_state.delete_candidate_id = None
-                    st.rerun()
-            
-            with col_confirm2:
-                if st.button("❌ Cancel"):
-                    st.session_state.confirm_delete = False
-                    st.session_state.delete_candidate_id = None
-                    st.rerun()
+            # The view page queues a single id; the table queues the selected ids
+            candidate_ids = st.session_state.get('delete_candidate_ids') or [st.session_state.get('delete_candidate_id')]
+            candidate_ids = [candidate_id for candidate_id in candidate_ids if candidate_id is not None]
+            if not candidate_ids:
+                # Nothing is queued for deletion - drop the stale confirmation
+                st.session_state.confirm_delete = False
+            else:
+                if len(candidate_ids) == 1:
+                    st.warning(f"⚠️ Are you sure you want to delete candidate '{name_by_id.get(candidate_ids[0], 'Unknown')}'? This action cannot be undone.")
+                else:
+                    st.warning(f"⚠️ Are you sure you want to delete {len(candidate_ids)} candidates? This action cannot be undone.")
+                
+                col_confirm1, col_confirm2, col_confirm3 = st.columns([1, 1, 4])
+                with col_confirm1:
+                    if st.button("✅ Yes, Delete", type="primary"):
+                        delete_candidates(candidate_ids)
+                        st.session_state.confirm_delete = False
+                        st.session_state.delete_candidate_id = None
+                        st.session_state.delete_candidate_ids = None
+                        st.session_state.pop("candidate_list_table", None)
+                        st.rerun(scope="fragment")
+                
+                with col_confirm2:
+                    if st.button("❌ Cancel"):
+                        st.session_state.confirm_delete = False
+                        st.session_state.delete_candidate_id = None
+                        st.session_state.delete_candidate_ids = None
+                        st.rerun(scope="fragment")
     else:
         st.info("No candidates found. Click 'Add Candidate' to get started!")
         st.markdown("""
@@ -9368,7 +9348,7 @@ def talent_management_section():
     supply_manager = SupplyDataManager(env_manager)
     
     # Get supply statistics
-    stats = supply_manager.get_supply_statistics()
+    stats = _load_supply_statistics(supply_manager, _tbl('talent_supply'))
     
     # Display summary metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -9415,20 +9395,132 @@ def talent_management_section():
     elif selected_tab == "🔄 Supply Pipeline Management":
         supply_pipeline_management_section()
 
+# Declared column types for the talent editor, so the frontend doesn't infer them per rerun.
+# Date of Joining stays text: talent_supply.doj is a TEXT column with mixed formats.
+TALENT_EDITOR_COLUMN_CONFIG = {
+    'Talent ID': st.column_config.TextColumn("Talent ID"),
+    'Name': st.column_config.TextColumn("Name", required=True),
+    'Role': st.column_config.TextColumn("Role"),
+    'Grade': st.column_config.TextColumn("Grade"),
+    'Date of Joining': st.column_config.TextColumn("Date of Joining"),
+    'Assignment Status': st.column_config.TextColumn("Assignment Status"),
+    'Type': st.column_config.SelectboxColumn("Type", options=["FTE", "Non-FTE"], required=True),
+    'Assigned %': st.column_config.NumberColumn("Assigned %", min_value=0, max_value=100, format="%.1f"),
+    'Availability %': st.column_config.NumberColumn("Availability %", min_value=0, max_value=100, format="%.1f"),
+    'Employment Status': st.column_config.TextColumn("Employment Status"),
+    'Email ID': st.column_config.TextColumn("Email ID"),
+    'Years of Experience': st.column_config.TextColumn("Years of Experience"),
+    'Skills': st.column_config.TextColumn("Skills", width="large"),
+    'Region': st.column_config.TextColumn("Region"),
+    'Partner': st.column_config.TextColumn("Partner"),
+}
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_all_talent_rows(_supply_manager, talent_supply_table):
+    """Get all talent rows; keyed on the environment's talent_supply table
+
+    attrs['loaded_at'] marks each reload, so sessions know when their saved rows are already in it.
+    """
+    talent_data = _supply_manager.get_all_talent_data()
+    talent_data.attrs['loaded_at'] = time.time()
+    return talent_data
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_talent_rows_by_id(_supply_manager, talent_supply_table, talent_ids):
+    """Get the talent rows with the given ids (a sorted tuple)"""
+    return _supply_manager.get_talent_data_by_ids(talent_ids)
+
+def _load_talent_data(supply_manager, talent_supply_table):
+    """All talent rows, with rows this session saved since the last full load re-fetched by id
+
+    Saved ids live in st.session_state.saved_talent_ids as
+    {table: {'loaded_at': ..., 'ids': set}} and are dropped once the full frame reloads.
+    """
+    talent_data = _load_all_talent_rows(supply_manager, talent_supply_table)
+    saved_talent_ids = st.session_state.setdefault('saved_talent_ids', {})
+    loaded_at = talent_data.attrs.get('loaded_at')
+    saved = saved_talent_ids.get(talent_supply_table)
+    if saved is None or saved['loaded_at'] != loaded_at:
+        # First load, or the full frame was reloaded and already has the saved rows
+        saved = saved_talent_ids[talent_supply_table] = {'loaded_at': loaded_at, 'ids': set()}
+    if saved['ids'] and not talent_data.empty:
+        saved_rows = _load_talent_rows_by_id(supply_manager, talent_supply_table, tuple(sorted(saved['ids'])))
+        if not saved_rows.empty:
+            saved_rows = saved_rows.set_index('id')
+            columns = [column for column in saved_rows.columns if column in talent_data.columns]
+            positions = talent_data['id'].isin(saved_rows.index).to_numpy()
+            talent_data.loc[positions, columns] = saved_rows.loc[talent_data.loc[positions, 'id'], columns].to_numpy()
+    return talent_data
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_supply_statistics(_supply_manager, talent_supply_table):
+    """Get the Talent Management summary metrics; keyed like _load_talent_data"""
+    return _supply_manager.get_supply_statistics()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_talent_filter_options(_supply_manager, talent_supply_table):
+    """Sorted distinct assignment statuses and regions for the talent filters"""
+    talent_data = _load_talent_data(_supply_manager, talent_supply_table)
+    if talent_data.empty:
+        return [], []
+    return (
+        sorted(talent_data['assignment_status'].dropna().unique().tolist()),
+        sorted(talent_data['region'].dropna().unique().tolist())
+    )
+
+def _dataframe_csv_writer(df):
+    """Deferred CSV export for st.download_button: the CSV is only built when the download is clicked"""
+    def write_csv():
+        return df.to_csv(index=False)
+    return write_csv
+
+def _changed_row_positions(original_df, edited_df):
+    """Positions of edited_df rows that differ from original_df, plus any appended rows"""
+    compared_rows = min(len(original_df), len(edited_df))
+    try:
+        original_hashes = pd.util.hash_pandas_object(original_df.iloc[:compared_rows], index=False).to_numpy()
+        edited_hashes = pd.util.hash_pandas_object(edited_df.iloc[:compared_rows], index=False).to_numpy()
+        changed_positions = np.flatnonzero(original_hashes != edited_hashes).tolist()
+    except TypeError:
+        # Unhashable cell values - treat every row as changed
+        changed_positions = list(range(compared_rows))
+    changed_positions.extend(range(compared_rows, len(edited_df)))
+    return changed_positions
+
+def _refresh_saved_talent_rows(talent_supply_table, talent_ids):
+    """Re-fetch only the saved talent rows on this session's next load instead of the whole table"""
+    saved = st.session_state.get('saved_talent_ids', {}).get(talent_supply_table)
+    if saved is None:
+        # Nothing loaded in this session to overlay onto - reload the full frame
+        _load_all_talent_rows.clear()
+    else:
+        saved['ids'].update(int(talent_id) for talent_id in talent_ids)
+    _load_talent_rows_by_id.clear()
+    _load_supply_statistics.clear()
+    _load_talent_filter_options.clear()
+
+def _invalidate_talent_caches():
+    """Drop cached talent data after talent_supply writes"""
+    st.session_state.pop('saved_talent_ids', None)
+    _load_all_talent_rows.clear()
+    _load_talent_rows_by_id.clear()
+    _load_supply_statistics.clear()
+    _load_talent_filter_options.clear()
+
+@st.fragment
 def unified_talent_management_section(supply_manager, permission_manager, current_user_email):
-    """Unified Talent Management sub-section"""
-    
-    # Get all talent data
-    talent_data = supply_manager.get_all_talent_data()
+    """Unified Talent Management sub-section
+
+    Runs as a fragment so filter, editor and export interactions don't rerun
+    the metrics and tab selector above it; save/refresh rerun the whole app.
+    """
     
-    # Debug: Show what data we're getting
-    st.write(f"🔍 DEBUG: Loaded {len(talent_data)} talent records")
-    if not talent_data.empty:
-        st.write(f"🔍 DEBUG: Columns: {list(talent_data.columns)}")
-        st.write(f"🔍 DEBUG: First few talent_ids: {talent_data['talent_id'].head().tolist()}")
+    # Get all talent data (cached; every filter change reruns this section)
+    talent_data = _load_talent_data(supply_manager, _tbl('talent_supply'))
     
     if not talent_data.empty:
         # Filtering options
+        status_options, region_options = _load_talent_filter_options(supply_manager, _tbl('talent_supply'))
         col1, col2, col3 = st.columns(3)
         
         with col1:
@@ -9441,33 +9533,30 @@ def unified_talent_management_section(supply_manager, permission_manager, curren
         with col2:
             status_filter = st.selectbox(
                 "Filter by Assignment Status",
-                options=["All"] + sorted(talent_data['assignment_status'].dropna().unique().tolist()),
+                options=["All"] + status_options,
                 index=0
             )
         
         with col3:
             region_filter = st.selectbox(
                 "Filter by Region",
-                options=["All"] + sorted(talent_data['region'].dropna().unique().tolist()),
+                options=["All"] + region_options,
                 index=0
             )
         
-        # Apply filters
-        filtered_data = talent_data.copy()
-        
-        if type_filter != "All":
-            filtered_data = filtered_data[filtered_data['type'] == type_filter]
+        # Apply filters as one boolean mask and select once
+        total_talent_count = len(talent_data)
+        mask = np.ones(total_talent_count, dtype=bool)
+        for column, selected in (('type', type_filter), ('assignment_status', status_filter), ('region', region_filter)):
+            if selected != "All":
+                mask &= talent_data[column].to_numpy() == selected
+        filtered_data = talent_data[mask]
+        filtered_talent_count = len(filtered_data)
         
-        if status_filter != "All":
-            filtered_data = filtered_data[filtered_data['assignment_status'] == status_filter]
-        
-        if region_filter != "All":
-            filtered_data = filtered_data[filtered_data['region'] == region_filter]
-        
-        st.info(f"Showing {len(filtered_data)} of {len(talent_data)} talent records")
+        st.info(f"Showing {filtered_talent_count} of {total_talent_count} talent records")
         
         # Prepare data for editing
-        if not filtered_data.empty:
+        if filtered_talent_count:
             # Select columns for display/editing (removed assigned_to and billable)
             display_columns = [
                 'talent_id', 'name', 'role', 'grade', 'doj', 'assignment_status', 
@@ -9502,40 +9591,25 @@ def unified_talent_management_section(supply_manager, permission_manager, curren
             st.subheader("✏️ Editable Talent Data")
             
             # Show validation warnings for NFTE records
-            nfte_data = filtered_data[filtered_data['type'] == 'Non-FTE']
-            if not nfte_data.empty:
-                validation_issues = []
-                for _, row in nfte_data.iterrows():
-                    missing = supply_manager.validate_nfte_mandatory_fields(row)
-                    if missing:
-                        validation_issues.append(f"{row['name']}: Missing {', '.join(missing)}")
-                
-                if validation_issues:
-                    st.warning(f"⚠️ NFTE Validation Issues:\n" + "\n".join(validation_issues))
-            
-            # Store original data for change detection
-            if 'original_talent_data' not in st.session_state:
-                st.session_state.original_talent_data = edit_df.copy()
+            validation_issues = [
+                f"{name}: Missing {', '.join(missing)}"
+                for name, missing in supply_manager.find_nfte_missing_fields(filtered_data)
+            ]
+            if validation_issues:
+                st.warning(f"⚠️ NFTE Validation Issues:\n" + "\n".join(validation_issues))
             
             edited_df = st.data_editor(
                 edit_df,
+                column_config=TALENT_EDITOR_COLUMN_CONFIG,
                 num_rows="dynamic",
                 use_container_width=True,
                 key="supply_data_editor"
             )
             
-            # Detect changes by comparing dataframes
-            changes_detected = False
-            try:
-                if not edited_df.equals(edit_df):
-                    changes_detected = True
-                    st.info(f"📝 Changes detected in talent data")
-                else:
-                    st.info("📋 No changes detected")
-            except:
-                # If comparison fails, assume changes exist
-                changes_detected = True
-                st.info(f"📝 Data modified - ready to save")
+            # Detect changes by comparing per-row content hashes
+            changed_positions = _changed_row_positions(edit_df, edited_df)
+            if changed_positions or len(edited_df) != len(edit_df):
+                st.info(f"📝 Changes detected in talent data")
             
             # Save changes button
             col1, col2, col3 = st.columns([2, 1, 1])
@@ -9545,17 +9619,7 @@ def unified_talent_management_section(supply_manager, permission_manager, curren
                     current_user_email, "Supply Planning", "Talent Management", "edit", 
                     "💾 Save Changes", type="primary", use_container_width=True, key="save_talent_changes"
                 ):
-                    import psycopg2
-                    import pandas as pd
-                    
-                    st.write("🔄 Starting save operation...")
-                    
                     try:
-                        # Get database connection using the centralized utility
-                        from utils.database_connection import get_database_connection
-                        conn = get_database_connection()
-                        cursor = conn.cursor()
-                        
                         # Get env_manager from session state
                         env_manager = st.session_state.get('env_manager')
                         if not env_manager:
@@ -9564,113 +9628,83 @@ def unified_talent_management_section(supply_manager, permission_manager, curren
                         
                         updates_count = 0
                         total_records = len(edited_df)
+                        update_rows = []
+                        
+                        # Only rows whose content hash differs from what was loaded need an UPDATE
+                        logger.debug(f"Talent save: {len(changed_positions)} changed of {total_records} records")
+                        
+                        # Normalize the changed rows once: text columns stripped with '' for missing,
+                        # percentage columns numeric with 0.0 for missing or invalid input
+                        numeric_columns = ['Assigned %', 'Availability %']
+                        text_columns = [column for column in edit_df.columns if column not in numeric_columns]
+                        save_df = edited_df.iloc[changed_positions].copy()
+                        save_df[text_columns] = save_df[text_columns].fillna('').astype(str).apply(lambda column: column.str.strip())
+                        save_df[numeric_columns] = save_df[numeric_columns].apply(pd.to_numeric, errors='coerce').fillna(0.0).astype(float)
+                        
+                        # -1 marks rows without a database id
+                        record_ids = filtered_data['id'].fillna(-1).astype(np.int64).to_numpy()
+                        
+                        # Columns are in display_columns order, which matches the UPDATE's VALUES list
+                        for idx, row in zip(changed_positions, save_df[list(edit_df.columns)].itertuples(index=False, name=None)):
+                            # Get the original record ID from filtered data (rows added in the editor have none)
+                            record_id = record_ids[idx] if idx < len(record_ids) else -1
+                            
+                            # Skip if no valid record ID
+                            if record_id < 0:
+                                st.warning(f"⚠️ Skipping record {idx+1}: No valid ID found")
+                                continue
+                            
+                            update_rows.append((*row, int(record_id)))
                         
-                        st.write(f"📊 Processing {total_records} records...")
-                        
-                        # Process each row in the edited dataframe
-                        for idx in range(total_records):
-                            try:
-                                # Get the original record ID from filtered data and convert numpy types
-                                record_id = int(filtered_data.iloc[idx]['id']) if pd.notna(filtered_data.iloc[idx]['id']) else None
-                                
-                                # Skip if no valid record ID
-                                if record_id is None:
-                                    st.warning(f"⚠️ Skipping record {idx+1}: No valid ID found")
-                                    continue
-                                
-                                # Get all edited values - handle None/NaN values
-                                def safe_str(val):
-                                    if pd.isna(val) or val is None:
-                                        return ''
-                                    return str(val).strip()
-                                
-                                # Extract all field values from the edited dataframe
-                                talent_id = safe_str(edited_df.iloc[idx]['Talent ID'])
-                                name = safe_str(edited_df.iloc[idx]['Name'])
-                                role = safe_str(edited_df.iloc[idx]['Role'])
-                                grade = safe_str(edited_df.iloc[idx]['Grade'])
-                                doj = safe_str(edited_df.iloc[idx]['Date of Joining'])
-                                assignment_status = safe_str(edited_df.iloc[idx]['Assignment Status'])
-                                type_val = safe_str(edited_df.iloc[idx]['Type'])
-                                
-                                # Handle numeric fields properly - convert numpy types
-                                try:
-                                    assignment_percentage = float(edited_df.iloc[idx]['Assigned %']) if not pd.isna(edited_df.iloc[idx]['Assigned %']) else 0.0
-                                except (ValueError, TypeError):
-                                    assignment_percentage = 0.0
-                                    
-                                try:
-                                    availability_percentage = float(edited_df.iloc[idx]['Availability %']) if not pd.isna(edited_df.iloc[idx]['Availability %']) else 0.0
-                                except (ValueError, TypeError):
-                                    availability_percentage = 0.0
-                                
-                                employment_status = safe_str(edited_df.iloc[idx]['Employment Status'])
-                                email_id = safe_str(edited_df.iloc[idx]['Email ID'])
-                                years_of_exp = safe_str(edited_df.iloc[idx]['Years of Experience'])
-                                skills = safe_str(edited_df.iloc[idx]['Skills'])
-                                region = safe_str(edited_df.iloc[idx]['Region'])
-                                partner = safe_str(edited_df.iloc[idx]['Partner'])
-                                
-                                # Debug: Show what we're updating for the first few records
-                                if idx < 3:
-                                    st.write(f"Record {idx+1} (ID: {record_id}): Assignment Status = '{assignment_status}', Type = '{type_val}'")
-                                
-                                # Force update by using UPDATE without WHERE conditions checking for changes
+                        if update_rows:
+                            # Pooled connection: no connect/auth round trips per save
+                            with get_connection_manager().get_connection() as conn:
+                                cursor = conn.cursor()
+                                # Apply every row in one UPDATE ... FROM (VALUES ...) statement instead of one round trip per row
                                 talent_supply_table = env_manager.get_table_name('talent_supply')
-                                
-                                # Build the SQL query string first to avoid f-string issues
                                 sql_query = f"""
-                                    UPDATE {talent_supply_table}
-                                    SET talent_id = %s, name = %s, role = %s, grade = %s, doj = %s, 
-                                        assignment_status = %s, type = %s, 
-                                        assignment_percentage = %s, availability_percentage = %s,
-                                        employment_status = %s, email_id = %s, years_of_exp = %s,
-                                        skills = %s, region = %s, partner = %s, updated_at = CURRENT_TIMESTAMP
-                                    WHERE id = %s
+                                    UPDATE {talent_supply_table} AS t
+                                    SET talent_id = v.talent_id, name = v.name, role = v.role, grade = v.grade, doj = v.doj,
+                                        assignment_status = v.assignment_status, type = v.type,
+                                        assignment_percentage = v.assignment_percentage, availability_percentage = v.availability_percentage,
+                                        employment_status = v.employment_status, email_id = v.email_id, years_of_exp = v.years_of_exp,
+                                        skills = v.skills, region = v.region, partner = v.partner, updated_at = CURRENT_TIMESTAMP
+                                    FROM (VALUES %s) AS v(talent_id, name, role, grade, doj, assignment_status, type,
+                                                          assignment_percentage, availability_percentage,
+                                                          employment_status, email_id, years_of_exp, skills, region,
+                                                          partner, id)
+                                    WHERE t.id = v.id
                                 """
+                                execute_values(
+                                    cursor, sql_query, update_rows,
+                                    template="(%s, %s, %s, %s, %s, %s, %s, %s::real, %s::real, %s, %s, %s, %s, %s, %s, %s::integer)",
+                                    page_size=500
+                                )
                                 
-                                cursor.execute(sql_query, (talent_id, name, role, grade, doj, assignment_status, type_val, 
-                                      assignment_percentage, availability_percentage,
-                                      employment_status, email_id, years_of_exp, skills, region,
-                                      partner, record_id))
-                                
-                                # Since we're using WHERE id = %s, rowcount should always be 1 if record exists
-                                updates_count += 1
-                                    
-                            except Exception as row_error:
-                                st.error(f"❌ Error updating record {idx+1}: {str(row_error)}")
-                                continue
-                        
-                        # Commit all changes
-                        conn.commit()
-                        conn.close()
-                        
-                        st.write(f"✅ Successfully processed {total_records} records and attempted {updates_count} updates")
+                                # Commit all changes
+                                conn.commit()
+                                updates_count = len(update_rows)
                         
                         if updates_count > 0:
-                            st.success(f"🎉 Successfully saved {updates_count} out of {total_records} records!")
+                            # st.toast survives the rerun, unlike st.success
+                            st.toast(f"🎉 Successfully saved {updates_count} out of {total_records} records!")
                             
-                            # Force refresh by clearing session state
-                            keys_to_clear = [k for k in st.session_state.keys() if 'talent' in k.lower() or 'supply' in k.lower()]
-                            for key in keys_to_clear:
-                                del st.session_state[key]
+                            # Re-fetch just the saved rows on the rerun and drop the editor's pending edits
+                            _refresh_saved_talent_rows(_tbl('talent_supply'), [row[-1] for row in update_rows])
+                            st.session_state.pop('supply_data_editor', None)
                             
-                            st.info("🔄 Refreshing data... Please wait.")
-                            time.sleep(1)
-                            st.rerun()
+                            st.rerun(scope="app")
                         else:
                             st.warning("⚠️ No records were updated")
                             
                     except Exception as e:
                         st.error(f"❌ Error during save operation: {str(e)}")
-                        import traceback
                         st.error(f"Full error: {traceback.format_exc()}")
-                        if 'conn' in locals():
-                            conn.close()
             
             with col3:
                 if st.button("🔄 Refresh Data", use_container_width=True):
-                    st.rerun()
+                    _invalidate_talent_caches()
+                    st.rerun(scope="app")
         
         # Export functionality
         st.markdown("---")
@@ -9680,7 +9714,7 @@ def unified_talent_management_section(supply_manager, permission_manager, curren
         
         with col1:
             if st.button("📊 Export All Talent Data", use_container_width=True):
-                csv_data = talent_data.to_csv(index=False)
+                csv_data = _dataframe_csv_writer(talent_data)
                 st.download_button(
                     label="Download CSV",
                     data=csv_data,
@@ -9691,7 +9725,7 @@ def unified_talent_management_section(supply_manager, permission_manager, curren
         
         with col2:
             if st.button("📋 Export Filtered Data", use_container_width=True):
-                csv_data = filtered_data.to_csv(index=False)
+                csv_data = _dataframe_csv_writer(filtered_data)
                 st.download_button(
                     label="Download Filtered CSV",
                     data=csv_data,
@@ -9703,22 +9737,620 @@ def unified_talent_management_section(supply_manager, permission_manager, curren
     else:
         st.warning("No talent data found. Please load supply data first.")
         if st.button("🔄 Load Sample Data"):
-            from utils.supply_data_manager import SupplyDataManager
-            import subprocess
-            
+            # Run the data loader in this process rather than spawning a new interpreter
             try:
-                # Run the data loading script
-                result = subprocess.run(["python", "load_supply_data.py"], 
-                                      capture_output=True, text=True)
-                if result.returncode == 0:
-                    st.success("✅ Sample data loaded successfully!")
-                    st.rerun()
+                from load_supply_data import load as load_supply_data
+            except ImportError:
+                st.error("❌ Sample data loader not found: add load_supply_data.py with a load() function that returns the number of records loaded")
+            else:
+                try:
+                    loaded_count = load_supply_data()
+                    _invalidate_talent_caches()
+                    st.success(f"✅ Sample data loaded successfully! ({loaded_count} records)")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
+    
+    logger.info("Supply Planning page displayed")
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _load_pipeline_stages(pipeline_stages_table, pipeline_id):
+    """Get a pipeline's stages in display order, with "Any Stage" (-1) stages last"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"""
+            SELECT id, stage_name, conversion_rate, tat_days, stage_description, stage_order, COALESCE(is_special, FALSE)
+            FROM {pipeline_stages_table}
+            WHERE pipeline_id = %s
+            ORDER BY {PIPELINE_STAGE_SORT_SQL}
+        """, (pipeline_id,))
+        return cursor.fetchall()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_master_client_names(master_clients_table):
+    """Get the distinct client names offered by the New Pipeline form"""
+    with get_connection_manager().get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT DISTINCT client_name FROM {master_clients_table} ORDER BY client_name")
+        return [row[0] for row in cursor.fetchall()]
+
+@st.cache_data(ttl=120, show_spinner=False)
+def _load_all_pipelines(_pipeline_manager, talent_pipelines_table):
+    """Get every pipeline configuration for Pipeline Analytics; keyed on the environment's table"""
+    return _pipeline_manager.get_all_pipelines()
+
+@st.cache_data(ttl=120, show_spinner=False)
+def _load_all_staffing_plans(_staffing_manager, staffing_plans_table):
+    """Get every staffing plan for Pipeline Analytics; keyed on the environment's table"""
+    return _staffing_manager.get_all_staffing_plans()
+
+@st.cache_data(ttl=300, show_spinner=False)
+def _load_analytics_stages_by_pipeline(_pipeline_manager, pipeline_stages_table, pipeline_ids):
+    """Get every listed pipeline's stages as records for Pipeline Analytics in one query; keyed on the environment's table"""
+    return _pipeline_manager.get_pipeline_stages_by_pipeline(pipeline_ids)
+
+def _planning_details_frame(staffing_plans_df, planning_details_by_plan):
+    """One row per pipeline planning detail, in plan order, with the plan's client for the analytics filters"""
+    details_df = pd.DataFrame(
+        [dict(detail, plan_id=plan_id) for plan_id, plan_details in planning_details_by_plan.items() for detail in plan_details],
+        columns=['plan_id', 'role', 'skills', 'positions', 'onboard_by', 'pipeline_id', 'pipeline_owner']
+    )
+    # Parse onboard dates (date objects or YYYY-MM-DD strings) once as a datetime column
+    details_df['onboard_by'] = pd.to_datetime(details_df['onboard_by'], format='%Y-%m-%d', errors='coerce')
+    if staffing_plans_df is None or staffing_plans_df.empty:
+        plans_df = pd.DataFrame(columns=['id', 'client_name'])
+    else:
+        plans_df = staffing_plans_df[['id', 'client_name']]
+    return details_df.merge(plans_df, left_on='plan_id', right_on='id', how='inner').drop(columns='id')
+
+def _filter_plan_details(details_df, selected_client, selected_owner, selected_pipeline_id, from_date, to_date):
+    """Rows of _planning_details_frame matching the analytics dashboard filters"""
+    mask = pd.Series(True, index=details_df.index)
+    if selected_client != 'All Clients':
+        mask &= details_df['client_name'] == selected_client
+    # For "All Pipelines", include all pipeline data
+    if selected_pipeline_id != 'all':
+        mask &= details_df['pipeline_id'] == selected_pipeline_id
+    if selected_owner != 'All Owners':
+        mask &= details_df['pipeline_owner'] == selected_owner
+    # Details without an onboard date are kept, as before
+    onboard_dates = details_df['onboard_by']
+    mask &= onboard_dates.isna() | onboard_dates.between(pd.Timestamp(from_date), pd.Timestamp(to_date))
+    return details_df.loc[mask]
+
+def _unique_stages_by_name(stages_by_pipeline):
+    """First definition of each stage name across pipelines, sorted by name, for the All Pipelines views"""
+    stages_df = pd.DataFrame([stage for stages in stages_by_pipeline.values() for stage in stages])
+    if stages_df.empty:
+        return []
+    return stages_df.drop_duplicates('stage_name').sort_values('stage_name').to_dict('records')
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_planning_details_by_plan(_staffing_manager, plan_ids):
+    """Get the pipeline planning details of every listed staffing plan in one query"""
+    return _staffing_manager.get_pipeline_planning_details_by_plan(plan_ids)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _build_velocity_gauge_figure(gauge_stages, chart_title):
+    """Expected vs actual conversion gauges of the Pipeline Velocity Dashboard, rebuilt only when the inputs change
+
+    gauge_stages holds one (stage_name, expected_conversion, actual_conversion) tuple per gauge.
+    """
+    # Use 4 columns for better spacing and smaller gauges
+    num_stages = len(gauge_stages)
+    cols_per_row = 4
+    rows = (num_stages + cols_per_row - 1) // cols_per_row
+    
+    # Grid cells laid out like make_subplots would, without its per-trace validation
+    horizontal_spacing = 0.1  # Better horizontal spacing
+    vertical_spacing = min(0.25, 0.5 / (rows - 1)) if rows > 1 else 0  # More spacing between rows for subtitle
+    cell_width = (1 - horizontal_spacing * (cols_per_row - 1)) / cols_per_row
+    cell_height = (1 - vertical_spacing * (rows - 1)) / rows
+    
+    gauges = []
+    titles = []
+    for idx, (stage_name, expected_conversion, actual_conversion) in enumerate(gauge_stages):
+        x0 = (idx % cols_per_row) * (cell_width + horizontal_spacing)
+        y1 = 1 - (idx // cols_per_row) * (cell_height + vertical_spacing)
+        
+        # Determine color based on actual vs expected comparison
+        conversion_ratio = actual_conversion / expected_conversion if expected_conversion > 0 else 1
+        
+        if conversion_ratio >= 0.9:  # Actual >= 90% of expected
+            color = "green"
+        elif conversion_ratio >= 0.7:  # Actual >= 70% of expected
+            color = "yellow"
+        else:  # Actual < 70% of expected
+            color = "red"
+        
+        gauges.append(
+            go.Indicator(
+                mode="gauge+number+delta",
+                value=actual_conversion,
+                delta={'reference': expected_conversion, 'relative': False, 'suffix': '%'},
+                domain={'x': [x0, x0 + cell_width], 'y': [y1 - cell_height, y1]},
+                number={'font': {'size': 18, 'color': 'black', 'family': 'Arial Black'}, 'suffix': '%'},
+                gauge={
+                    'axis': {
+                        'range': [None, 100],
+                        'tickwidth': 2,
+                        'tickcolor': "black",
+                        'tickfont': {'size': 8, 'color': 'black', 'family': 'Arial'},
+                        'tick0': 0,
+                        'dtick': 25
+                    },
+                    'bar': {'color': color, 'thickness': 0.8},
+                    'bgcolor': "white",
+                    'borderwidth': 2,
+                    'bordercolor': "black",
+                    'steps': [
+                        {'range': [0, expected_conversion * 0.7], 'color': "#ffebee"},
+                        {'range': [expected_conversion * 0.7, expected_conversion * 0.9], 'color': "#fff3e0"},
+                        {'range': [expected_conversion * 0.9, 100], 'color': "#e8f5e8"}
+                    ],
+                    'threshold': {
+                        'line': {'color': "blue", 'width': 3},
+                        'thickness': 0.7,
+                        'value': expected_conversion
+                    }
+                }
+            )
+        )
+        # Subplot-style title above the gauge, with black text and better contrast
+        titles.append(dict(
+            text=f"<b style='color:black'>{stage_name}</b><br><span style='color:black'>Expected: {expected_conversion}%</span>",
+            x=x0 + cell_width / 2,
+            y=y1,
+            xref='paper',
+            yref='paper',
+            xanchor='center',
+            yanchor='bottom',
+            showarrow=False,
+            font=dict(size=10, color="black", family="Arial"),
+            bgcolor="rgba(255,255,255,0.9)",
+            bordercolor="black",
+            borderwidth=1
+        ))
+    
+    fig = go.Figure(data=gauges)
+    fig.update_layout(
+        annotations=titles,
+        height=max(300, 200 * rows),
+        title=dict(
+            text=chart_title,
+            x=0.5,
+            font=dict(size=16, color='black', family='Arial Black'),
+            pad=dict(t=10, b=10)
+        ),
+        font={'size': 10, 'color': 'black', 'family': 'Arial'},
+        margin=dict(l=20, r=20, t=50, b=30),
+        showlegend=False,
+        paper_bgcolor='white',
+        plot_bgcolor='white'
+    )
+    return fig
+
+def _timeline_segment_traces(segments, kind, colors, dash=None, showlegend=True):
+    """Timeline Performance Dashboard lines for one plan, one trace per stage colour
+
+    segments are (stage_name, start, end, duration_days) in stage order. Stages that
+    share a colour share a trace, with None gaps between their segments.
+    """
+    hover_suffix = "" if kind == "Planned" else f" - {kind}"
+    traces = []
+    for slot in range(min(len(segments), len(colors))):
+        slot_segments = segments[slot::len(colors)]
+        x, y, customdata = [], [], []
+        for stage_name, start, end, duration in slot_segments:
+            x.extend([start, end, None])
+            y.extend([f"{kind} - {stage_name}", f"{kind} - {stage_name}", None])
+            customdata.extend([(stage_name, duration), (stage_name, duration), (None, None)])
+        traces.append(go.Scatter(
+            x=x,
+            y=y,
+            customdata=customdata,
+            mode='lines',
+            line=dict(color=colors[slot], width=8, dash=dash),
+            name=" / ".join(segment[0] for segment in slot_segments) + f" ({kind})",
+            hovertemplate=f"<b>%{{customdata[0]}}{hover_suffix}</b><br>Start: %{{x}}<br>Duration: %{{customdata[1]}} days<extra></extra>",
+            showlegend=showlegend
+        ))
+    return traces
+
+def _analytics_filter_options(staffing_plans_df, planning_details_by_plan):
+    """Client and pipeline owner choices for the analytics dashboard filters"""
+    if staffing_plans_df is None or staffing_plans_df.empty:
+        return ['All Clients'], ['All Owners']
+    client_names = staffing_plans_df['client_name'].fillna('Unknown').unique().tolist()
+    owners = {
+        detail.get('pipeline_owner')
+        for plan_details in planning_details_by_plan.values() for detail in plan_details
+    } - {None, '', 'Unknown'}
+    return ['All Clients'] + sorted(client_names), ['All Owners'] + sorted(owners)
+
+@st.cache_data(ttl=60, show_spinner=False)
+def _load_velocity_stage_metrics(_staffing_manager, plan_roles, stage_names):
+    """Average actual conversion and data point count per stage over the given (plan_id, role) pairs"""
+    actuals_by_plan_role = _staffing_manager.get_pipeline_requirements_actual_by_plan_role(plan_roles)
+    actuals_df = pd.DataFrame(
+        [
+            (plan_id, role, stage_name, stage_actual['actual_at_stage'] or 0, stage_actual['profiles_in_pipeline'])
+            for (plan_id, role), stage_actuals in actuals_by_plan_role.items()
+            for stage_name, stage_actual in stage_actuals.items() if stage_name in stage_names
+        ],
+        columns=['plan_id', 'role', 'stage_name', 'actual_at_stage', 'profiles_in_pipeline']
+    )
+    # Every (plan_id, role) pair counts once per stage, as the dashboard filters list them
+    actuals_df = pd.DataFrame(plan_roles, columns=['plan_id', 'role']).merge(actuals_df, on=['plan_id', 'role'])
+    actuals_df = actuals_df.loc[actuals_df['profiles_in_pipeline'] > 0]
+    conversions = actuals_df['actual_at_stage'] / actuals_df['profiles_in_pipeline'] * 100
+    stage_stats = conversions.groupby(actuals_df['stage_name']).agg(['mean', 'count'])
+    stage_stats = stage_stats.reindex(list(stage_names)).fillna(0)
+    return {
+        stage_name: (float(mean), int(count))
+        for stage_name, mean, count in stage_stats.itertuples()
+    }
+
+# Widget keys of the New Pipeline Configuration form, cleared after Save or Cancel
+NEW_PIPELINE_FORM_KEYS = frozenset([
+    'pipeline_name_input', 'client_name_select', 'new_client_input', 'pipeline_desc_input',
+    'status_select', 'internal_pipeline_checkbox', 'greyamp_client_display'
+])
+
+# Workflow state fields shown in the builder's Summary table, with their column headers
+WORKFLOW_SUMMARY_COLUMNS = {
+    'name': 'State Name',
+    'conversion_rate': 'Conversion %',
+    'tat_days': 'TAT Days',
+    'maps_to_status': 'Maps to Status',
+    'status_flag': 'Status Flag',
+    'is_initial': 'Initial',
+    'is_final': 'Final',
+    'is_special': 'Special'
+}
+
+def _workflow_summary_frame(workflow_states):
+    """Summary table of the Workflow States Builder"""
+    summary_df = pd.DataFrame.from_records(workflow_states, columns=list(WORKFLOW_SUMMARY_COLUMNS))
+    return summary_df.rename(columns=WORKFLOW_SUMMARY_COLUMNS)
+
+def _workflow_status_choices(candidate_data_table):
+    """Candidate statuses for the workflow states' Maps to Status dropdown, with defaults if the lookup fails"""
+    try:
+        return _distinct_statuses(candidate_data_table)
+    except Exception:
+        return ['Screening', 'Interview', 'Assessment', 'Offer', 'Onboarding']
+
+def _execute_write(query, params):
+    """Run one write statement in its own transaction on a pooled connection; returns the RETURNING row, if any"""
+    with get_connection_manager().get_connection() as conn:
+        # `with conn` commits on success and rolls back if the statement fails
+        with conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            return cursor.fetchone() if cursor.description else None
+
+def _invalidate_pipeline_stage_caches():
+    """Drop cached pipeline stages after pipeline_stages writes"""
+    _load_pipeline_stages.clear()
+    _load_analytics_stages_by_pipeline.clear()
+
+def _invalidate_pipeline_analytics_caches():
+    """Drop Pipeline Analytics' cached pipelines, staffing plans and planning details after writes to them"""
+    _load_all_pipelines.clear()
+    _load_all_staffing_plans.clear()
+    _load_planning_details_by_plan.clear()
+    _load_analytics_stages_by_pipeline.clear()
+
+# Status cell colour and label of a pipeline row, indexed by is_active
+PIPELINE_STATUS_COLORS = ('#dc3545', '#28a745')
+PIPELINE_STATUS_LABELS = ('Inactive', 'Active')
+
+# Shared styles of the Workflow States Builder strip, sent once per render rather than inlined per state
+WORKFLOW_STATE_STYLE = """
+<style>
+.wf-state {
+    color: white;
+    padding: 10px;
+    border-radius: 5px;
+    text-align: center;
+    margin: 5px 0;
+    font-weight: bold;
+    min-height: 70px;
+    display: flex;
+    align-items: center;
+    justify-content: center;
+    flex-direction: column;
+}
+.wf-arrow {
+    text-align: center;
+    font-size: 24px;
+    margin-top: 20px;
+    color: #666;
+}
+</style>
+"""
+
+# One state box and the arrow column between boxes in the Workflow States Builder strip
+WORKFLOW_STATE_TEMPLATE = (
+    '<div class="wf-state" style="background-color: {color};">'
+    '<div>{indicators}{name}</div>'
+    '<small>{conversion_rate}% • {tat_days}d</small>'
+    '</div>'
+)
+WORKFLOW_ARROW_HTML = '<div class="wf-arrow">→</div>'
+
+# Compact card for one row of the Existing Pipeline Configurations list, with field names as headers
+PIPELINE_ROW_TEMPLATE = """
+<div style="border: 1px solid #e0e0e0; border-radius: 8px; padding: 10px; margin: 6px 0; background-color: #f9f9f9;">
+    <!-- Header row with pipeline name, field labels, and action buttons -->
+    <div style="display: flex; align-items: center; justify-content: space-between; margin-bottom: 5px;">
+        <div style="flex: 1;">
+            <h3 style="margin: 0; font-size: 16px; color: #333; font-weight: bold;">{name}</h3>
+        </div>
+        <div style="display: flex; gap: 20px; align-items: center;">
+            <div style="text-align: center; min-width: 60px;">
+                <div style="font-weight: bold; color: #333; font-size: 14px;">Stages</div>
+            </div>
+            <div style="text-align: center; min-width: 70px;">
+                <div style="font-weight: bold; color: #333; font-size: 14px;">Status</div>
+            </div>
+            <div style="text-align: center; min-width: 70px;">
+                <div style="font-weight: bold; color: #333; font-size: 14px;">Created</div>
+            </div>
+            <div style="text-align: center; min-width: 80px;">
+                <div style="font-weight: bold; color: #333; font-size: 14px;">Actions</div>
+            </div>
+        </div>
+    </div>
+    <!-- Data row with client name and values -->
+    <div style="display: flex; align-items: center; justify-content: space-between;">
+        <div style="flex: 1;">
+            <p style="margin: 0; font-size: 12px; color: #666;">Client: {client_label}</p>
+        </div>
+        <div style="display: flex; gap: 20px; align-items: center;">
+            <div style="text-align: center; min-width: 60px;">
+                <div style="font-size: 12px; color: #666;">{stage_count}</div>
+            </div>
+            <div style="text-align: center; min-width: 70px;">
+                <div style="font-size: 12px; color: {status_color};">{status_text}</div>
+            </div>
+            <div style="text-align: center; min-width: 70px;">
+                <div style="font-size: 12px; color: #666;">{created_date}</div>
+            </div>
+            <div style="text-align: center; min-width: 80px;">
+                <div style="font-size: 12px; color: #666;">Edit / Delete</div>
+            </div>
+        </div>
+    </div>
+</div>
+"""
+
+@st.fragment
+def _render_pipeline_row(pipeline, talent_pipelines_table):
+    """One row of the Existing Pipeline Configurations list"""
+    with st.container():
+        # Format the created date
+        created_date = pipeline['created_date']
+        created_date_str = created_date.strftime('%m/%d/%y') if hasattr(created_date, 'strftime') else str(created_date)[:10]
+        is_active = bool(pipeline['is_active'])
+    
+        # Use custom CSS for compact display with field names as headers
+        st.markdown(PIPELINE_ROW_TEMPLATE.format(
+            name=pipeline['name'],
+            client_label=pipeline.get('client_name', '') if not pipeline.get('is_internal', False) else 'Greyamp Pipeline',
+            stage_count=pipeline.get('stage_count', 0),
+            status_color=PIPELINE_STATUS_COLORS[is_active],
+            status_text=PIPELINE_STATUS_LABELS[is_active],
+            created_date=created_date_str
+        ), unsafe_allow_html=True)
+    
+        # Action buttons under the row's Actions label: one spacer column plus the two icons
+        spacer_col, edit_col, delete_col = st.columns([7, 0.8, 0.8])
+        with edit_col:
+            if st.button("✏️", key=f"edit_pipeline_{pipeline['id']}", help="Edit this pipeline configuration"):
+                st.session_state.edit_pipeline_id = pipeline['id']
+                st.session_state.show_edit_pipeline_form = True
+                # Store pipeline data for editing without conflicting with widget keys
+                st.session_state.pipeline_edit_data = {
+                    'name': pipeline['name'],
+                    'client_name': pipeline['client_name'],
+                    'status': pipeline['is_active'],
+                    'description': pipeline.get('description', '')
+                }
+                st.rerun(scope="app")
+
+        with delete_col:
+            if st.button("🗑️", key=f"delete_pipeline_{pipeline['id']}", help="Delete this pipeline configuration"):
+                try:
+                    _execute_write(f"DELETE FROM {talent_pipelines_table} WHERE id = %s", (pipeline['id'],))
+                    _invalidate_pipeline_analytics_caches()
+                    st.toast("Pipeline deleted successfully!")
+                    st.rerun(scope="app")
+                except Exception as e:
+                    st.error(f"Failed to delete pipeline: {str(e)}")
+
+@st.fragment
+def _render_stage_editor(stage, pipeline_stages_table):
+    """One expander of the Edit Pipeline stage list; edit toggles rerun only this stage"""
+    # Fragment reruns reuse the original arguments, so prefer the row returned by this stage's last update
+    stage = st.session_state.get('pipeline_stage_updates', {}).get(stage[0], stage)
+    stage_id, stage_name, conversion_rate, tat_days, stage_desc, stage_order, current_is_special = stage
+    
+    # Display stage order - show "Any Stage" for special stages with order -1
+    stage_order_display = "Any Stage" if stage_order == -1 else str(stage_order)
+    stage_icon = "⭐" if stage_order == -1 else "🔴"
+    with st.expander(f"{stage_icon} Stage {stage_order_display}: {stage_name} (Conv: {conversion_rate}% | TAT: {tat_days}d)", expanded=False):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            st.write(f"**Name:** {stage_name}")
+            st.write(f"**Description:** {stage_desc or 'No description'}")
+        with col2:
+            st.write(f"**Conversion Rate:** {conversion_rate}%")
+            st.write(f"**TAT Days:** {tat_days}")
+        with col3:
+            # Check if this stage is in edit mode first
+            if 'pipeline_stage_editing' not in st.session_state:
+                st.session_state.pipeline_stage_editing = set()
+            editing_stages = st.session_state.pipeline_stage_editing
+            is_editing = stage_id in editing_stages
+    
+            if not is_editing:
+                if st.button(f"✏️ Edit", key=f"edit_btn_{stage_id}"):
+                    editing_stages.add(stage_id)
+                    st.rerun(scope="fragment")
+                if st.button(f"🗑️ Delete", key=f"delete_btn_{stage_id}"):
+                    try:
+                        _execute_write(f"DELETE FROM {pipeline_stages_table} WHERE id = %s", (stage_id,))
+                        _invalidate_pipeline_stage_caches()
+                        st.toast("Stage deleted successfully!")
+                        st.rerun(scope="app")
+                    except Exception as e:
+                        st.error(f"Error deleting stage: {str(e)}")
+    
+        # Edit form for stages
+        if is_editing:
+            st.markdown("---")
+            # Add comprehensive form cache clearing
+            col_clear, col_refresh, col_title = st.columns([1, 1, 2])
+            with col_clear:
+                if st.button("🔄 Clear Cache", key=f"clear_cache_{stage_id}", help="Clear all form cache"):
+                    # Clear all editing states and form-related session state
+                    editing_stages.clear()
+                    keys_to_delete = [k for k in st.session_state.keys() if 
+                                    k.startswith('edit_') or 
+                                    k.startswith('form_')]
+                    for key in keys_to_delete:
+                        del st.session_state[key]
+                    _invalidate_pipeline_stage_caches()
+                    st.rerun(scope="app")
+            with col_refresh:
+                if st.button("↻ Force Reload", key=f"force_reload_{stage_id}", help="Force complete reload"):
+                    # Reset session state and reload this page's data; shared resources such as the
+                    # connection pool are left alone
+                    st.session_state.clear()
+                    _invalidate_pipeline_stage_caches()
+                    _load_master_client_names.clear()
+                    st.rerun(scope="app")
+            with col_title:
+                st.markdown("**Edit Stage:**")
+    
+            with st.form(f"edit_stage_form_{stage_id}", clear_on_submit=False):
+                new_name = st.text_input("Stage Name", value=stage_name)
+                new_conversion = st.number_input("Conversion Rate (%)", min_value=0.0, max_value=100.0, value=float(conversion_rate))
+    
+                # Special stage checkbox
+                is_special_stage = st.checkbox(
+                    "Special Stage", 
+                    value=current_is_special,
+                    help="Special stages like 'Rejected', 'On-Hold', 'Dropped', or 'RNR' are alternate final stages with 0 TAT",
+                    key=f"special_stage_{stage_id}"
+                )
+    
+                # Handle TAT days and stage order for special stages
+                tat_value = int(tat_days) if tat_days >= 0 else 0
+                current_order = int(stage_order) if stage_order else 1
+    
+                if is_special_stage:
+                    new_tat = st.number_input("TAT Days", min_value=0, value=0, 
+                                            help="Special stages automatically have 0 TAT days", 
+                                            disabled=True, key=f"tat_{stage_id}")
+    
+                    # Special stage order options
+                    st.info("💡 Special stages can be accessed from any point in the pipeline")
+                    any_stage_option = st.checkbox(
+                        "Any Stage Access", 
+                        value=(current_order == -1),
+                        help="Allow candidates to move to this stage from any pipeline stage",
+                        key=f"any_stage_{stage_id}"
+                    )
+    
+                    if any_stage_option:
+                        new_order = -1  # Use -1 to indicate "Any Stage"
+                        st.caption("Stage Order: Any Stage")
+                    else:
+                        new_order = st.number_input("Stage Order", min_value=1, value=max(1, current_order) if current_order > 0 else 1, key=f"order_special_{stage_id}")
                 else:
-                    st.error(f"❌ Error loading data: {result.stderr}")
+                    new_tat = st.number_input("TAT Days", min_value=0, value=max(1, tat_value), key=f"tat_normal_{stage_id}")
+                    new_order = st.number_input("Stage Order", min_value=1, value=max(1, current_order) if current_order > 0 else 1, key=f"order_normal_{stage_id}")
+    
+                new_desc = st.text_area("Description", value=stage_desc, key=f"desc_{stage_id}")
+    
+                # Form submission buttons
+                col1, col2 = st.columns(2)
+                with col1:
+                    update_clicked = st.form_submit_button("💾 Update Stage", type="primary")
+                with col2:
+                    cancel_clicked = st.form_submit_button("❌ Cancel")
+    
+                if update_clicked:
+                    try:
+                        updated_stage = _execute_write(f"""
+                            UPDATE {pipeline_stages_table}
+                            SET stage_name = %s, conversion_rate = %s, tat_days = %s, stage_description = %s, is_special = %s, stage_order = %s
+                            WHERE id = %s
+                            RETURNING id, stage_name, conversion_rate, tat_days, stage_description, stage_order, COALESCE(is_special, FALSE)
+                        """, (new_name, new_conversion, new_tat, new_desc, is_special_stage, new_order, stage_id))
+                        _invalidate_pipeline_stage_caches()
+                        st.toast("Stage updated successfully!")
+                        editing_stages.discard(stage_id)
+                        if updated_stage and updated_stage[5] == stage_order:
+                            # Still in the same list position: redraw only this stage from the returned row
+                            st.session_state.pipeline_stage_updates[stage_id] = updated_stage
+                            st.rerun(scope="fragment")
+                        st.rerun(scope="app")
+                    except Exception as e:
+                        st.error(f"Error updating stage: {str(e)}")
+    
+                if cancel_clicked:
+                    editing_stages.discard(stage_id)
+                    st.rerun(scope="fragment")
+
+@st.fragment
+def _render_new_pipeline_details(master_clients_table):
+    """Name/client/status/description inputs of the New Pipeline form; edits rerun only this fragment"""
+    col1, col2 = st.columns(2)
+    with col1:
+        pipeline_name = st.text_input("Pipeline Name", placeholder="e.g., Software Engineering Pipeline", 
+                                     value=st.session_state.temp_pipeline_name, key="pipeline_name_input")
+        
+        # Internal pipeline checkbox
+        is_internal = st.checkbox("Internal", value=st.session_state.temp_is_internal, key="internal_pipeline_checkbox", 
+                                help="Check this to tag as 'Greyamp Pipeline' - client selection will be disabled")
+        
+        # Client selection logic - disabled when Internal is checked
+        if is_internal:
+            # Internal pipeline - disable client selection and set to Greyamp
+            client_name = "Greyamp"
+            st.text_input("Client Name", value="Greyamp", disabled=True, key="greyamp_client_display", 
+                        help="Internal pipelines are automatically assigned to Greyamp")
+        else:
+            # External pipeline - allow client selection
+            try:
+                existing_clients = _load_master_client_names(master_clients_table)
+                
+                if existing_clients:
+                    client_name = st.selectbox("Client Name", ["Select existing client..."] + existing_clients + ["+ Add New Client"], key="client_name_select")
+                    if client_name == "+ Add New Client":
+                        client_name = st.text_input("New Client Name", placeholder="e.g., TechCorp Inc.", key="new_client_input")
+                    elif client_name == "Select existing client...":
+                        client_name = ""
+                else:
+                    client_name = st.text_input("Client Name", placeholder="e.g., TechCorp Inc.", key="client_name_input")
             except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
+                client_name = st.text_input("Client Name", placeholder="e.g., TechCorp Inc.", key="client_name_fallback")
+            
+    with col2:
+        status_options = ["Draft", "Active", "Inactive"]
+        status_idx = status_options.index(st.session_state.temp_status) if st.session_state.temp_status in status_options else 2
+        status = st.selectbox("Status", status_options, index=status_idx, key="status_select")
     
-    logger.info("Supply Planning page displayed")
+    pipeline_description = st.text_area("Pipeline Description", 
+                                      placeholder="Describe the purpose and scope of this pipeline...", 
+                                      value=st.session_state.temp_pipeline_desc,
+                                      key="pipeline_desc_input")
+    
+    return pipeline_name, client_name, is_internal, status, pipeline_description
 
 def pipeline_configuration_section():
     """Pipeline Configuration section with complete management and permission enforcement"""
@@ -9737,6 +10369,12 @@ def pipeline_configuration_section():
     # Get environment manager from session state
     env_manager = st.session_state.env_manager
     
+    # Resolve table names once instead of inside every handler and loop iteration
+    pipeline_stages_table = _tbl('pipeline_stages')
+    talent_pipelines_table = _tbl('talent_pipelines')
+    master_clients_table = _tbl('master_clients')
+    candidate_data_table = _tbl('candidate_data')
+    
     # Initialize Pipeline Manager
     from utils.pipeline_manager import PipelineManager
     from utils.staffing_plans_manager import StaffingPlansManager
@@ -9845,7 +10483,8 @@ def pipeline_configuration_section():
                     with col3:
                         if st.button("🗑️", key=f"delete_plan_tab1_{plan['id']}", help="Delete this staffing plan"):
                             if staffing_manager.delete_staffing_plan(plan['id']):
-                                st.success(f"Deleted staffing plan: {plan['plan_name']}")
+                                _invalidate_pipeline_analytics_caches()
+                                st.toast(f"Deleted staffing plan: {plan['plan_name']}")
                                 st.rerun()
                             else:
                                 st.error("Error deleting staffing plan")
@@ -9872,113 +10511,26 @@ def pipeline_configuration_section():
 
         
         st.markdown("---")
-    
-    # Pipeline Management Tab (Tab 2)
-    with pipeline_tab2:
-        st.subheader("⚙️ Pipeline Management")
-        
-        # Display success message if available
-        if 'last_save_message' in st.session_state:
-            st.success(st.session_state['last_save_message'])
-            del st.session_state['last_save_message']
-        
-        # Display existing pipeline configurations
-        pipelines_df = pipeline_manager.get_all_pipelines()
-        if not pipelines_df.empty:
-            st.markdown("**Existing Pipeline Configurations:**")
-            
-            # Display pipelines with edit actions in compact format
-            for idx, pipeline in pipelines_df.iterrows():
-                with st.container():
-                    # Format the created date
-                    created_date_str = pipeline['created_date'].strftime('%m/%d/%y') if hasattr(pipeline['created_date'], 'strftime') else str(pipeline['created_date'])[:10]
-                    
-                    # Use custom CSS for compact display with field names as headers
-                    st.markdown(f"""
-                    <div style="border: 1px solid #e0e0e0; border-radius: 8px; padding: 10px; margin: 6px 0; background-color: #f9f9f9;">
-                        <!-- Header row with pipeline name, field labels, and action buttons -->
-                        <div style="display: flex; align-items: center; justify-content: space-between; margin-bottom: 5px;">
-                            <div style="flex: 1;">
-                                <h3 style="margin: 0; font-size: 16px; color: #333; font-weight: bold;">{pipeline['name']}</h3>
-                            </div>
-                            <div style="display: flex; gap: 20px; align-items: center;">
-                                <div style="text-align: center; min-width: 60px;">
-                                    <div style="font-weight: bold; color: #333; font-size: 14px;">Stages</div>
-                                </div>
-                                <div style="text-align: center; min-width: 70px;">
-                                    <div style="font-weight: bold; color: #333; font-size: 14px;">Status</div>
-                                </div>
-                                <div style="text-align: center; min-width: 70px;">
-                                    <div style="font-weight: bold; color: #333; font-size: 14px;">Created</div>
-                                </div>
-                                <div style="text-align: center; min-width: 80px;">
-                                    <div style="font-weight: bold; color: #333; font-size: 14px;">Actions</div>
-                                </div>
-                            </div>
-                        </div>
-                        <!-- Data row with client name and values -->
-                        <div style="display: flex; align-items: center; justify-content: space-between;">
-                            <div style="flex: 1;">
-                                <p style="margin: 0; font-size: 12px; color: #666;">Client: {pipeline.get('client_name', '') if not pipeline.get('is_internal', False) else 'Greyamp Pipeline'}</p>
-                            </div>
-                            <div style="display: flex; gap: 20px; align-items: center;">
-                                <div style="text-align: center; min-width: 60px;">
-                                    <div style="font-size: 12px; color: #666;">{pipeline.get('stage_count', 0)}</div>
-                                </div>
-                                <div style="text-align: center; min-width: 70px;">
-                                    <div style="font-size: 12px; color: {'#28a745' if pipeline['is_active'] else '#dc3545'};">{'Active' if pipeline['is_active'] else 'Inactive'}</div>
-                                </div>
-                                <div style="text-align: center; min-width: 70px;">
-                                    <div style="font-size: 12px; color: #666;">{created_date_str}</div>
-                                </div>
-                                <div style="text-align: center; min-width: 80px;">
-                                    <div style="font-size: 12px; color: #666;">Edit / Delete</div>
-                                </div>
-                            </div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-                    
-                    # Hidden action buttons that align with the visual icons
-                    col1, col2, col3, col4, col5 = st.columns([3, 1.2, 1.4, 1.4, 1.6])
-                    with col1:
-                        st.write("")  # Spacer
-                    with col2:
-                        st.write("")  # Spacer
-                    with col3:
-                        st.write("")  # Spacer
-                    with col4:
-                        st.write("")  # Spacer
-                    with col5:
-                        subcol1, subcol2 = st.columns([1, 1])
-                        with subcol1:
-                            if st.button("✏️", key=f"edit_pipeline_{pipeline['id']}", help="Edit this pipeline configuration"):
-                                st.session_state.edit_pipeline_id = pipeline['id']
-                                st.session_state.show_edit_pipeline_form = True
-                                # Store pipeline data for editing without conflicting with widget keys
-                                st.session_state.pipeline_edit_data = {
-                                    'name': pipeline['name'],
-                                    'client_name': pipeline['client_name'],
-                                    'status': pipeline['is_active'],
-                                    'description': pipeline.get('description', '')
-                                }
-                                st.rerun()
-                        
-                        with subcol2:
-                            if st.button("🗑️", key=f"delete_pipeline_{pipeline['id']}", help="Delete this pipeline configuration"):
-                                try:
-                                    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                                    cursor = conn.cursor()
-                                    talent_pipelines_table = env_manager.get_table_name('talent_pipelines')
-                                    cursor.execute(f"DELETE FROM {talent_pipelines_table} WHERE id = %s", (pipeline['id'],))
-                                    conn.commit()
-                                    conn.close()
-                                    st.success("Pipeline deleted successfully!")
-                                    st.rerun()
-                                except Exception as e:
-                                    st.error(f"Failed to delete pipeline: {str(e)}")
-        
-        st.markdown("---")
+    
+    # Pipeline Management Tab (Tab 2)
+    with pipeline_tab2:
+        st.subheader("⚙️ Pipeline Management")
+        
+        # Display success message if available
+        if 'last_save_message' in st.session_state:
+            st.success(st.session_state['last_save_message'])
+            del st.session_state['last_save_message']
+        
+        # Display existing pipeline configurations
+        pipelines_df = pipeline_manager.get_all_pipelines()
+        if not pipelines_df.empty:
+            st.markdown("**Existing Pipeline Configurations:**")
+            
+            # Display pipelines with edit actions in compact format
+            for idx, pipeline in pipelines_df.iterrows():
+                _render_pipeline_row(pipeline, talent_pipelines_table)
+        
+        st.markdown("---")
         
         # Edit Pipeline Form - Show inline in the pipeline management section
         if st.session_state.get('show_edit_pipeline_form', False) and st.session_state.get('edit_pipeline_id'):
@@ -10020,179 +10572,14 @@ def pipeline_configuration_section():
             
             # Get existing pipeline stages
             try:
-                conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                cursor = conn.cursor()
-                
-                # Debug: Check what pipeline_id we're using
-                st.write(f"Debug: Looking for stages for pipeline_id: {pipeline_id}")
-                
-                # Use environment-appropriate table
-                table_name = "dev_pipeline_stages" if os.environ.get('ENVIRONMENT', 'development') == 'development' else "pipeline_stages"
-                
-                cursor.execute(f"""
-                    SELECT id, stage_name, conversion_rate, tat_days, stage_description, stage_order
-                    FROM {table_name}
-                    WHERE pipeline_id = %s
-                    ORDER BY CASE WHEN stage_order = -1 THEN 999999 ELSE stage_order END
-                """, (pipeline_id,))
-                
-                existing_stages = cursor.fetchall()
-                st.write(f"Debug: Found {len(existing_stages)} stages")  # Debug info
-                conn.close()
+                existing_stages = _load_pipeline_stages(pipeline_stages_table, pipeline_id)
+                logger.debug(f"Found {len(existing_stages)} stages for pipeline_id {pipeline_id}")
                 
                 if existing_stages:
+                    # Rows returned by in-place stage updates; a full run renders from the reloaded list instead
+                    st.session_state.pipeline_stage_updates = {}
                     for stage in existing_stages:
-                        stage_id, stage_name, conversion_rate, tat_days, stage_desc, stage_order = stage
-                        
-                        # Display stage order - show "Any Stage" for special stages with order -1
-                        stage_order_display = "Any Stage" if stage_order == -1 else str(stage_order)
-                        stage_icon = "⭐" if stage_order == -1 else "🔴"
-                        with st.expander(f"{stage_icon} Stage {stage_order_display}: {stage_name} (Conv: {conversion_rate}% | TAT: {tat_days}d)", expanded=False):
-                            col1, col2, col3 = st.columns([2, 1, 1])
-                            with col1:
-                                st.write(f"**Name:** {stage_name}")
-                                st.write(f"**Description:** {stage_desc or 'No description'}")
-                            with col2:
-                                st.write(f"**Conversion Rate:** {conversion_rate}%")
-                                st.write(f"**TAT Days:** {tat_days}")
-                            with col3:
-                                # Check if this stage is in edit mode first
-                                is_editing = st.session_state.get(f'editing_stage_{stage_id}', False)
-                                
-                                if not is_editing:
-                                    if st.button(f"✏️ Edit", key=f"edit_btn_{stage_id}"):
-                                        st.session_state[f'editing_stage_{stage_id}'] = True
-                                        st.rerun()
-                                    if st.button(f"🗑️ Delete", key=f"delete_btn_{stage_id}"):
-                                        try:
-                                            conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                                            cursor = conn.cursor()
-                                            pipeline_stages_table = env_manager.get_table_name('pipeline_stages')
-                                            cursor.execute(f"DELETE FROM {pipeline_stages_table} WHERE id = %s", (stage_id,))
-                                            conn.commit()
-                                            conn.close()
-                                            st.success("Stage deleted successfully!")
-                                            st.rerun()
-                                        except Exception as e:
-                                            st.error(f"Error deleting stage: {str(e)}")
-                                else:
-                                    if st.button(f"❌ Cancel", key=f"cancel_btn_{stage_id}"):
-                                        del st.session_state[f'editing_stage_{stage_id}']
-                                        st.rerun()
-                            
-                            # Edit form for stages
-                            if st.session_state.get(f'editing_stage_{stage_id}', False):
-                                st.markdown("---")
-                                # Add comprehensive form cache clearing
-                                col_clear, col_refresh, col_title = st.columns([1, 1, 2])
-                                with col_clear:
-                                    if st.button("🔄 Clear Cache", key=f"clear_cache_{stage_id}", help="Clear all form cache"):
-                                        # Clear all editing states and form-related session state
-                                        keys_to_delete = [k for k in st.session_state.keys() if 
-                                                        k.startswith('editing_stage_') or 
-                                                        k.startswith('edit_') or 
-                                                        k.startswith('form_')]
-                                        for key in keys_to_delete:
-                                            del st.session_state[key]
-                                        st.cache_data.clear()
-                                        st.rerun()
-                                with col_refresh:
-                                    if st.button("↻ Force Reload", key=f"force_reload_{stage_id}", help="Force complete reload"):
-                                        # Clear everything and force browser refresh
-                                        st.session_state.clear()
-                                        st.cache_data.clear()
-                                        st.cache_resource.clear()
-                                        st.write('<script>window.location.reload();</script>', unsafe_allow_html=True)
-                                        st.rerun()
-                                with col_title:
-                                    st.markdown("**Edit Stage:**")
-                                    
-                                with st.form(f"edit_stage_form_{stage_id}", clear_on_submit=False):
-                                    new_name = st.text_input("Stage Name", value=stage_name)
-                                    new_conversion = st.number_input("Conversion Rate (%)", min_value=0.0, max_value=100.0, value=float(conversion_rate))
-                                    
-                                    # Get current is_special value from database
-                                    try:
-                                        conn_temp = psycopg2.connect(os.environ['DATABASE_URL'])
-                                        cursor_temp = conn_temp.cursor()
-                                        pipeline_stages_table = env_manager.get_table_name('pipeline_stages')
-                                        cursor_temp.execute(f"SELECT is_special FROM {pipeline_stages_table} WHERE id = %s", (stage_id,))
-                                        current_is_special = cursor_temp.fetchone()
-                                        current_is_special = current_is_special[0] if current_is_special else False
-                                        conn_temp.close()
-                                    except:
-                                        current_is_special = False
-                                    
-                                    # Special stage checkbox
-                                    is_special_stage = st.checkbox(
-                                        "Special Stage", 
-                                        value=current_is_special,
-                                        help="Special stages like 'Rejected', 'On-Hold', 'Dropped', or 'RNR' are alternate final stages with 0 TAT",
-                                        key=f"special_stage_{stage_id}"
-                                    )
-                                    
-                                    # Handle TAT days and stage order for special stages
-                                    tat_value = int(tat_days) if tat_days >= 0 else 0
-                                    current_order = int(stage_order) if stage_order else 1
-                                    
-                                    if is_special_stage:
-                                        new_tat = st.number_input("TAT Days", min_value=0, value=0, 
-                                                                help="Special stages automatically have 0 TAT days", 
-                                                                disabled=True, key=f"tat_{stage_id}")
-                                        
-                                        # Special stage order options
-                                        st.info("💡 Special stages can be accessed from any point in the pipeline")
-                                        any_stage_option = st.checkbox(
-                                            "Any Stage Access", 
-                                            value=(current_order == -1),
-                                            help="Allow candidates to move to this stage from any pipeline stage",
-                                            key=f"any_stage_{stage_id}"
-                                        )
-                                        
-                                        if any_stage_option:
-                                            new_order = -1  # Use -1 to indicate "Any Stage"
-                                            st.caption("Stage Order: Any Stage")
-                                        else:
-                                            new_order = st.number_input("Stage Order", min_value=1, value=max(1, current_order) if current_order > 0 else 1, key=f"order_special_{stage_id}")
-                                    else:
-                                        new_tat = st.number_input("TAT Days", min_value=0, value=max(1, tat_value), key=f"tat_normal_{stage_id}")
-                                        new_order = st.number_input("Stage Order", min_value=1, value=max(1, current_order) if current_order > 0 else 1, key=f"order_normal_{stage_id}")
-                                    
-                                    new_desc = st.text_area("Description", value=stage_desc, key=f"desc_{stage_id}")
-                                    
-                                    # Form submission buttons
-                                    col1, col2 = st.columns(2)
-                                    with col1:
-                                        update_clicked = st.form_submit_button("💾 Update Stage", type="primary")
-                                    with col2:
-                                        cancel_clicked = st.form_submit_button("❌ Cancel")
-                                    
-                                    if update_clicked:
-                                        try:
-                                            conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                                            cursor = conn.cursor()
-                                            # Get env_manager from session state
-                                            env_manager = st.session_state.get('env_manager')
-                                            if env_manager:
-                                                pipeline_stages_table = env_manager.get_table_name('pipeline_stages')
-                                                cursor.execute(f"""
-                                                    UPDATE {pipeline_stages_table}
-                                                    SET stage_name = %s, conversion_rate = %s, tat_days = %s, stage_description = %s, is_special = %s, stage_order = %s
-                                                    WHERE id = %s
-                                                """, (new_name, new_conversion, new_tat, new_desc, is_special_stage, new_order, stage_id))
-                                            else:
-                                                st.error("Environment manager not found")
-                                            conn.commit()
-                                            conn.close()
-                                            st.success("Stage updated successfully!")
-                                            del st.session_state[f'editing_stage_{stage_id}']
-                                            st.rerun()
-                                        except Exception as e:
-                                            st.error(f"Error updating stage: {str(e)}")
-                                    
-                                    if cancel_clicked:
-                                        del st.session_state[f'editing_stage_{stage_id}']
-                                        st.rerun()
+                        _render_stage_editor(stage, pipeline_stages_table)
                 else:
                     st.warning("No pipeline stages configured yet.")
                     st.info("💡 Click 'Add New Stage' below to create workflow stages for this pipeline.")
@@ -10249,22 +10636,13 @@ def pipeline_configuration_section():
                     
                     if add_submitted and new_stage_name:
                         try:
-                            conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                            cursor = conn.cursor()
-                            # Get env_manager from session state
-                            env_manager = st.session_state.get('env_manager')
-                            if env_manager:
-                                pipeline_stages_table = env_manager.get_table_name('pipeline_stages')
-                                cursor.execute(f"""
-                                    INSERT INTO {pipeline_stages_table}
-                                    (pipeline_id, stage_name, stage_order, conversion_rate, tat_days, stage_description, is_active, is_special)
-                                    VALUES (%s, %s, %s, %s, %s, %s, true, %s)
-                                """, (pipeline_id, new_stage_name, new_stage_order, new_stage_conversion, new_stage_tat, new_stage_desc, is_special_stage))
-                            else:
-                                st.error("Environment manager not found")
-                            conn.commit()
-                            conn.close()
-                            st.success(f"Stage '{new_stage_name}' added successfully!")
+                            _execute_write(f"""
+                                INSERT INTO {pipeline_stages_table}
+                                (pipeline_id, stage_name, stage_order, conversion_rate, tat_days, stage_description, is_active, is_special)
+                                VALUES (%s, %s, %s, %s, %s, %s, true, %s)
+                            """, (pipeline_id, new_stage_name, new_stage_order, new_stage_conversion, new_stage_tat, new_stage_desc, is_special_stage))
+                            _invalidate_pipeline_stage_caches()
+                            st.toast(f"Stage '{new_stage_name}' added successfully!")
                             st.session_state.show_add_stage_form = False
                             st.rerun()
                         except Exception as e:
@@ -10284,23 +10662,14 @@ def pipeline_configuration_section():
             with col2:
                 if st.button("💾 Save Changes", type="primary", key="save_edit_pipeline"):
                     try:
-                        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                        cursor = conn.cursor()
-                        # Get env_manager from session state
-                        env_manager = st.session_state.get('env_manager')
-                        if env_manager:
-                            talent_pipelines_table = env_manager.get_table_name('talent_pipelines')
-                            cursor.execute(f"""
-                                UPDATE {talent_pipelines_table}
-                                SET name = %s, description = %s, is_active = %s
-                                WHERE id = %s
-                            """, (new_pipeline_name, new_description, new_status == "Active", pipeline_id))
-                        else:
-                            st.error("Environment manager not found")
-                        conn.commit()
-                        conn.close()
-                        
-                        st.success("Pipeline updated successfully!")
+                        _execute_write(f"""
+                            UPDATE {talent_pipelines_table}
+                            SET name = %s, description = %s, is_active = %s
+                            WHERE id = %s
+                        """, (new_pipeline_name, new_description, new_status == "Active", pipeline_id))
+                        _invalidate_pipeline_analytics_caches()
+                        
+                        st.toast("Pipeline updated successfully!")
                         # Clear edit form
                         st.session_state.show_edit_pipeline_form = False
                         if 'edit_pipeline_id' in st.session_state:
@@ -10347,52 +10716,8 @@ def pipeline_configuration_section():
             if 'temp_is_internal' not in st.session_state:
                 st.session_state.temp_is_internal = False
             
-            # Remove form wrapper - just use regular inputs
-            col1, col2 = st.columns(2)
-            with col1:
-                pipeline_name = st.text_input("Pipeline Name", placeholder="e.g., Software Engineering Pipeline", 
-                                             value=st.session_state.temp_pipeline_name, key="pipeline_name_input")
-                
-                # Internal pipeline checkbox
-                is_internal = st.checkbox("Internal", value=st.session_state.temp_is_internal, key="internal_pipeline_checkbox", 
-                                        help="Check this to tag as 'Greyamp Pipeline' - client selection will be disabled")
-                
-                # Client selection logic - disabled when Internal is checked
-                if is_internal:
-                    # Internal pipeline - disable client selection and set to Greyamp
-                    client_name = "Greyamp"
-                    st.text_input("Client Name", value="Greyamp", disabled=True, key="greyamp_client_display", 
-                                help="Internal pipelines are automatically assigned to Greyamp")
-                else:
-                    # External pipeline - allow client selection
-                    try:
-                        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                        cursor = conn.cursor()
-                        master_clients_table = env_manager.get_table_name('master_clients')
-                        cursor.execute(f"SELECT DISTINCT client_name FROM {master_clients_table} ORDER BY client_name")
-                        existing_clients = [row[0] for row in cursor.fetchall()]
-                        conn.close()
-                        
-                        if existing_clients:
-                            client_name = st.selectbox("Client Name", ["Select existing client..."] + existing_clients + ["+ Add New Client"], key="client_name_select")
-                            if client_name == "+ Add New Client":
-                                client_name = st.text_input("New Client Name", placeholder="e.g., TechCorp Inc.", key="new_client_input")
-                            elif client_name == "Select existing client...":
-                                client_name = ""
-                        else:
-                            client_name = st.text_input("Client Name", placeholder="e.g., TechCorp Inc.", key="client_name_input")
-                    except Exception as e:
-                        client_name = st.text_input("Client Name", placeholder="e.g., TechCorp Inc.", key="client_name_fallback")
-                    
-            with col2:
-                status_options = ["Draft", "Active", "Inactive"]
-                status_idx = status_options.index(st.session_state.temp_status) if st.session_state.temp_status in status_options else 2
-                status = st.selectbox("Status", status_options, index=status_idx, key="status_select")
-            
-            pipeline_description = st.text_area("Pipeline Description", 
-                                              placeholder="Describe the purpose and scope of this pipeline...", 
-                                              value=st.session_state.temp_pipeline_desc,
-                                              key="pipeline_desc_input")
+            # Fragment reruns don't return, but the full-app rerun on Save Configuration picks up the current values
+            pipeline_name, client_name, is_internal, status, pipeline_description = _render_new_pipeline_details(master_clients_table)
             
             # Workflow States Builder Section
             st.markdown("---")
@@ -10404,9 +10729,13 @@ def pipeline_configuration_section():
             
             # Session state variables already initialized above
             
+            # Candidate statuses for every Maps to Status dropdown in the builder, fetched once per run
+            candidate_statuses = _workflow_status_choices(candidate_data_table)
+            
             # Display current workflow states
             if st.session_state.workflow_states:
                 st.markdown("**Current Workflow States:**")
+                st.markdown(WORKFLOW_STATE_STYLE, unsafe_allow_html=True)
                 
                 # Create visual workflow with arrows
                 workflow_cols = st.columns(len(st.session_state.workflow_states) * 2 - 1) if len(st.session_state.workflow_states) > 1 else st.columns(1)
@@ -10426,122 +10755,97 @@ def pipeline_configuration_section():
                             if state.get('is_special'):
                                 state_indicators += "⚠️ "
                             
-                            st.markdown(f"""
-                                <div style="
-                                    background-color: {state_color}; 
-                                    color: white; 
-                                    padding: 10px; 
-                                    border-radius: 5px; 
-                                    text-align: center;
-                                    margin: 5px 0;
-                                    font-weight: bold;
-                                    min-height: 70px;
-                                    display: flex;
-                                    align-items: center;
-                                    justify-content: center;
-                                    flex-direction: column;
-                                ">
-                                    <div>{state_indicators}{state['name']}</div>
-                                    <small>{state['conversion_rate']}% • {state['tat_days']}d</small>
-                                </div>
-                            """, unsafe_allow_html=True)
+                            st.markdown(WORKFLOW_STATE_TEMPLATE.format(
+                                color=state_color, indicators=state_indicators, name=state['name'],
+                                conversion_rate=state['conversion_rate'], tat_days=state['tat_days']
+                            ), unsafe_allow_html=True)
                     
                     # Add arrow between states (except for the last one)
                     if i < len(st.session_state.workflow_states) - 1 and (i * 2 + 1) < len(workflow_cols):
                         with workflow_cols[i * 2 + 1]:
-                            st.markdown("""
-                                <div style="
-                                    text-align: center; 
-                                    font-size: 24px; 
-                                    margin-top: 20px;
-                                    color: #666;
-                                ">
-                                    →
-                                </div>
-                            """, unsafe_allow_html=True)
+                            st.markdown(WORKFLOW_ARROW_HTML, unsafe_allow_html=True)
                 
                 # Show workflow states table with edit functionality
                 st.markdown("**Workflow Configuration:**")
-                workflow_df = pd.DataFrame(st.session_state.workflow_states)
-                if not workflow_df.empty:
+                if st.session_state.workflow_states:
+                    # Only the current page of edit expanders is rendered, keeping the widget count per rerun bounded
+                    states_per_page = 5
+                    total_pages = max(1, -(-len(st.session_state.workflow_states) // states_per_page))
+                    if st.session_state.get('workflow_edit_page', 1) > total_pages:
+                        st.session_state.workflow_edit_page = total_pages
+                    if total_pages > 1:
+                        current_page = st.number_input("Page", min_value=1, max_value=total_pages, step=1, key="workflow_edit_page")
+                        st.caption(f"Page {current_page} of {total_pages}")
+                    else:
+                        current_page = 1
+                    page_start = (current_page - 1) * states_per_page
+                    page_states = st.session_state.workflow_states[page_start:page_start + states_per_page]
+                    
                     # Add edit functionality for each row
-                    for idx, state in enumerate(st.session_state.workflow_states):
+                    for idx, state in enumerate(page_states, start=page_start):
                         with st.expander(f"🔧 {state['name']} - {state.get('status_flag', 'Greyamp')}", expanded=False):
-                            col1, col2, col3 = st.columns([2, 2, 1])
+                            # A form holds the edits back until Update or Delete is pressed instead of rerunning per field
+                            with st.form(key=f"edit_form_{idx}", clear_on_submit=False):
+                                col1, col2, col3 = st.columns([2, 2, 1])
                             
-                            with col1:
-                                new_name = st.text_input("State Name", value=state['name'], key=f"edit_name_{idx}")
-                                
-                                # Show special state info and disable fields if special
-                                is_special = state.get('is_special', False)
-                                if is_special:
-                                    st.caption("🔸 Special State - Conversion and TAT are set to 0")
-                                    new_conversion = st.number_input("Conversion %", value=0, min_value=0, max_value=100, key=f"edit_conv_{idx}", disabled=True)
-                                else:
-                                    new_conversion = st.number_input("Conversion %", value=state['conversion_rate'], min_value=0, max_value=100, key=f"edit_conv_{idx}")
+                                with col1:
+                                    new_name = st.text_input("State Name", value=state['name'], key=f"edit_name_{idx}")
                                 
-                            with col2:
-                                # Check if this is a special state to set TAT to 0
-                                if is_special:
-                                    new_tat = st.number_input("TAT Days", value=0, min_value=0, max_value=30, key=f"edit_tat_{idx}", disabled=True)
-                                else:
-                                    new_tat = st.number_input("TAT Days", value=state['tat_days'], min_value=1, max_value=30, key=f"edit_tat_{idx}")
+                                    # Show special state info and disable fields if special
+                                    is_special = state.get('is_special', False)
+                                    if is_special:
+                                        st.caption("🔸 Special State - Conversion and TAT are set to 0")
+                                        new_conversion = st.number_input("Conversion %", value=0, min_value=0, max_value=100, key=f"edit_conv_{idx}", disabled=True)
+                                    else:
+                                        new_conversion = st.number_input("Conversion %", value=state['conversion_rate'], min_value=0, max_value=100, key=f"edit_conv_{idx}")
                                 
-                                # Get current candidate statuses for dropdown
-                                try:
-                                    conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                                    cursor = conn.cursor()
-                                    candidate_data_table = env_manager.get_table_name('candidate_data')
-                                    cursor.execute(f"SELECT DISTINCT status FROM {candidate_data_table} WHERE status IS NOT NULL ORDER BY status")
-                                    candidate_statuses = [row[0] for row in cursor.fetchall()]
-                                    cursor.close()
-                                    conn.close()
-                                except:
-                                    candidate_statuses = ['Screening', 'Interview', 'Assessment', 'Offer', 'Onboarding']
+                                with col2:
+                                    # Check if this is a special state to set TAT to 0
+                                    if is_special:
+                                        new_tat = st.number_input("TAT Days", value=0, min_value=0, max_value=30, key=f"edit_tat_{idx}", disabled=True)
+                                    else:
+                                        new_tat = st.number_input("TAT Days", value=state['tat_days'], min_value=1, max_value=30, key=f"edit_tat_{idx}")
                                 
-                                status_options = ["None"] + candidate_statuses
-                                current_status = state.get('maps_to_status') or "None"
-                                status_idx = status_options.index(current_status) if current_status in status_options else 0
-                                new_maps_to_status = st.selectbox("Maps to Status", status_options, index=status_idx, key=f"edit_maps_{idx}")
+                                    status_options = ["None"] + candidate_statuses
+                                    current_status = state.get('maps_to_status') or "None"
+                                    status_idx = status_options.index(current_status) if current_status in status_options else 0
+                                    new_maps_to_status = st.selectbox("Maps to Status", status_options, index=status_idx, key=f"edit_maps_{idx}")
                                 
-                                current_flag = state.get('status_flag', 'Greyamp')
-                                flag_idx = ['Greyamp', 'Client', 'Both'].index(current_flag) if current_flag in ['Greyamp', 'Client', 'Both'] else 0
-                                new_status_flag = st.selectbox("Status Flag", ['Greyamp', 'Client', 'Both'], index=flag_idx, key=f"edit_flag_{idx}")
+                                    current_flag = state.get('status_flag', 'Greyamp')
+                                    flag_idx = ['Greyamp', 'Client', 'Both'].index(current_flag) if current_flag in ['Greyamp', 'Client', 'Both'] else 0
+                                    new_status_flag = st.selectbox("Status Flag", ['Greyamp', 'Client', 'Both'], index=flag_idx, key=f"edit_flag_{idx}")
                             
-                            with col3:
-                                new_initial = st.checkbox("Initial", value=state.get('is_initial', False), key=f"edit_initial_{idx}")
-                                new_final = st.checkbox("Final", value=state.get('is_final', False), key=f"edit_final_{idx}")
-                                new_special = st.checkbox("Special", value=state.get('is_special', False), key=f"edit_special_{idx}")
+                                with col3:
+                                    new_initial = st.checkbox("Initial", value=state.get('is_initial', False), key=f"edit_initial_{idx}")
+                                    new_final = st.checkbox("Final", value=state.get('is_final', False), key=f"edit_final_{idx}")
+                                    new_special = st.checkbox("Special", value=state.get('is_special', False), key=f"edit_special_{idx}")
                                 
-                                if st.button(f"💾 Update", key=f"update_{idx}"):
-                                    # If special state is checked, force conversion and TAT to 0
-                                    final_conversion = 0 if new_special else new_conversion
-                                    final_tat = 0 if new_special else new_tat
+                                    if st.form_submit_button("💾 Update"):
+                                        # If special state is checked, force conversion and TAT to 0
+                                        final_conversion = 0 if new_special else new_conversion
+                                        final_tat = 0 if new_special else new_tat
                                     
-                                    st.session_state.workflow_states[idx].update({
-                                        'name': new_name,
-                                        'conversion_rate': final_conversion,
-                                        'tat_days': final_tat,
-                                        'maps_to_status': None if new_maps_to_status == "None" else new_maps_to_status,
-                                        'status_flag': new_status_flag,
-                                        'is_initial': new_initial,
-                                        'is_final': new_final,
-                                        'is_special': new_special
-                                    })
-                                    st.success(f"✅ {new_name} updated!")
-                                    st.rerun()
+                                        st.session_state.workflow_states[idx].update({
+                                            'name': new_name,
+                                            'conversion_rate': final_conversion,
+                                            'tat_days': final_tat,
+                                            'maps_to_status': None if new_maps_to_status == "None" else new_maps_to_status,
+                                            'status_flag': new_status_flag,
+                                            'is_initial': new_initial,
+                                            'is_final': new_final,
+                                            'is_special': new_special
+                                        })
+                                        st.toast(f"✅ {new_name} updated!")
+                                        st.rerun()
                                 
-                                if st.button(f"🗑️ Delete", key=f"delete_{idx}"):
-                                    del st.session_state.workflow_states[idx]
-                                    st.success(f"✅ {state['name']} deleted!")
-                                    st.rerun()
+                                    if st.form_submit_button("🗑️ Delete"):
+                                        del st.session_state.workflow_states[idx]
+                                        st.toast(f"✅ {state['name']} deleted!")
+                                        st.rerun()
                     
                     # Display summary table
                     st.markdown("**Summary:**")
-                    display_columns = ['name', 'conversion_rate', 'tat_days', 'maps_to_status', 'status_flag', 'is_initial', 'is_final', 'is_special']
-                    display_df = workflow_df[display_columns].copy()
-                    display_df.columns = ['State Name', 'Conversion %', 'TAT Days', 'Maps to Status', 'Status Flag', 'Initial', 'Final', 'Special']
-                    st.dataframe(display_df, use_container_width=True)
+                    st.table(_workflow_summary_frame(st.session_state.workflow_states))
                 
                 # Clear workflow button
                 if st.button("🗑️ Clear All States", key="clear_workflow_states"):
@@ -10604,18 +10908,6 @@ def pipeline_configuration_section():
                     
                     # Maps to Status dropdown
                     st.markdown("**Maps to Status**")
-                    # Get current candidate statuses for dropdown
-                    try:
-                        conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                        cursor = conn.cursor()
-                        candidate_data_table = env_manager.get_table_name('candidate_data')
-                        cursor.execute(f"SELECT DISTINCT status FROM {candidate_data_table} WHERE status IS NOT NULL ORDER BY status")
-                        candidate_statuses = [row[0] for row in cursor.fetchall()]
-                        cursor.close()
-                        conn.close()
-                    except:
-                        candidate_statuses = ['Screening', 'Interview', 'Assessment', 'Offer', 'Onboarding']
-                    
                     status_options = ["None"] + candidate_statuses
                     maps_to_status = st.selectbox("Select Status", status_options, 
                                                 help="Select which candidate status this pipeline stage maps to for accurate counting")
@@ -10639,14 +10931,8 @@ def pipeline_configuration_section():
                     final_maps_to_status = None if maps_to_status == "None" else maps_to_status
                     
                     # Check if state with same name and mapping already exists
-                    duplicate_found = False
-                    for existing_state in existing_states:
-                        if (existing_state['name'].lower() == state_name.lower() and 
-                            existing_state.get('maps_to_status') == final_maps_to_status):
-                            duplicate_found = True
-                            break
-                    
-                    if duplicate_found:
+                    existing_keys = {(existing_state['name'].lower(), existing_state.get('maps_to_status')) for existing_state in existing_states}
+                    if (state_name.lower(), final_maps_to_status) in existing_keys:
                         st.error(f"❌ A state with name '{state_name}' and the same status mapping already exists!")
                         return
                     
@@ -10685,61 +10971,69 @@ def pipeline_configuration_section():
             with col1:
                 if st.button("✅ Save Configuration", type="primary", key="save_new_pipeline"):
                     if pipeline_name and client_name:
-                        try:
-                            conn = psycopg2.connect(os.environ['DATABASE_URL'])
-                            cursor = conn.cursor()
-                            
-                            # Get or create client (handle both selectbox and text input)
-                            final_client_name = client_name if client_name not in ["Select existing client...", "+ Add New Client", ""] else None
-                            
-                            if final_client_name:
-                                master_clients_table = env_manager.get_table_name('master_clients')
-                                cursor.execute(f"SELECT master_client_id FROM {master_clients_table} WHERE client_name = %s", (final_client_name,))
-                                client_result = cursor.fetchone()
-                                if client_result:
-                                    client_id = client_result[0]
-                                else:
-                                    cursor.execute(f"INSERT INTO {master_clients_table} (client_name) VALUES (%s) RETURNING master_client_id", (final_client_name,))
-                                    client_id = cursor.fetchone()[0]
-                                
-                                # Create pipeline with internal flag
-                                talent_pipelines_table = env_manager.get_table_name('talent_pipelines')
-                                cursor.execute(f"""
-                                    INSERT INTO {talent_pipelines_table} (name, client_id, description, is_active, created_by, is_internal)
-                                    VALUES (%s, %s, %s, %s, %s, %s)
-                                    RETURNING id
-                                """, (pipeline_name, client_id, pipeline_description, status == 'Active', 'admin', is_internal))
-                                
-                                pipeline_id = cursor.fetchone()[0]
-                                
-                                # Save workflow states as pipeline stages
-                                if st.session_state.get('workflow_states'):
-                                    for order, state in enumerate(st.session_state.workflow_states, 1):
-                                        # Get table name with environment support
-                                        pipeline_stages_table = env_manager.get_table_name('pipeline_stages')
+                        # Get or create client (handle both selectbox and text input)
+                        final_client_name = client_name if client_name not in ["Select existing client...", "+ Add New Client", ""] else None
+                        
+                        if final_client_name:
+                            try:
+                                with get_connection_manager().get_connection() as conn:
+                                    # `with conn` commits the client, pipeline and stages together, or rolls all of them back
+                                    with conn, conn.cursor() as cursor:
+                                        # Reuse the existing client or create it in the same round-trip
                                         cursor.execute(f"""
-                                            INSERT INTO {pipeline_stages_table} (pipeline_id, stage_name, conversion_rate, tat_days, stage_description, stage_order, maps_to_status, status_flag)
-                                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                                        """, (pipeline_id, state['name'], state['conversion_rate'], state['tat_days'], 
-                                              state['description'], order, state.get('maps_to_status'), state.get('status_flag')))
+                                            WITH existing AS (
+                                                SELECT master_client_id FROM {master_clients_table} WHERE client_name = %s LIMIT 1
+                                            ), created AS (
+                                                INSERT INTO {master_clients_table} (client_name)
+                                                SELECT %s WHERE NOT EXISTS (SELECT 1 FROM existing)
+                                                RETURNING master_client_id
+                                            )
+                                            SELECT master_client_id, FALSE FROM existing
+                                            UNION ALL
+                                            SELECT master_client_id, TRUE FROM created
+                                        """, (final_client_name, final_client_name))
+                                        client_id, new_client_added = cursor.fetchone()
+                                        
+                                        # Create pipeline with internal flag
+                                        cursor.execute(f"""
+                                            INSERT INTO {talent_pipelines_table} (name, client_id, description, is_active, created_by, is_internal)
+                                            VALUES (%s, %s, %s, %s, %s, %s)
+                                            RETURNING id
+                                        """, (pipeline_name, client_id, pipeline_description, status == 'Active', 'admin', is_internal))
+                                        
+                                        pipeline_id = cursor.fetchone()[0]
+                                        
+                                        # Save workflow states as pipeline stages
+                                        if st.session_state.get('workflow_states'):
+                                            stage_rows = [
+                                                (pipeline_id, state['name'], state['conversion_rate'], state['tat_days'],
+                                                 state['description'], order, state.get('maps_to_status'), state.get('status_flag'))
+                                                for order, state in enumerate(st.session_state.workflow_states, 1)
+                                            ]
+                                            # One INSERT for all stages instead of a round-trip per stage
+                                            execute_values(cursor, f"""
+                                                INSERT INTO {pipeline_stages_table} (pipeline_id, stage_name, conversion_rate, tat_days, stage_description, stage_order, maps_to_status, status_flag)
+                                                VALUES %s
+                                            """, stage_rows)
                                 
-                                conn.commit()
-                                conn.close()
+                                _invalidate_pipeline_stage_caches()
+                                _invalidate_pipeline_analytics_caches()
+                                if new_client_added:
+                                    _load_master_client_names.clear()
                                 
-                                st.success(f"✅ Pipeline '{pipeline_name}' created successfully with {len(st.session_state.get('workflow_states', []))} workflow states!")
+                                st.toast(f"✅ Pipeline '{pipeline_name}' created successfully with {len(st.session_state.get('workflow_states', []))} workflow states!")
                                 
                                 # Clear the form
                                 st.session_state.show_new_pipeline_form = False
                                 st.session_state.workflow_states = []
                                 # Clear form fields including internal checkbox
-                                for key in ['pipeline_name_input', 'client_name_select', 'new_client_input', 'pipeline_desc_input', 'status_select', 'internal_pipeline_checkbox', 'greyamp_client_display']:
-                                    if key in st.session_state:
-                                        del st.session_state[key]
+                                for key in NEW_PIPELINE_FORM_KEYS:
+                                    st.session_state.pop(key, None)
                                 st.rerun()
-                            else:
-                                st.error("Please select or enter a client name")
-                        except Exception as e:
-                            st.error(f"Error creating pipeline: {str(e)}")
+                            except Exception as e:
+                                st.error(f"Error creating pipeline: {str(e)}")
+                        else:
+                            st.error("Please select or enter a client name")
                     # Only show error when user actually tries to save without filling fields
                     # else:
                     #     st.error("Please enter pipeline name and client name")
@@ -10749,9 +11043,8 @@ def pipeline_configuration_section():
                     st.session_state.show_new_pipeline_form = False
                     st.session_state.workflow_states = []
                     # Clear form fields including internal checkbox
-                    for key in ['pipeline_name_input', 'client_name_select', 'new_client_input', 'pipeline_desc_input', 'status_select', 'internal_pipeline_checkbox', 'greyamp_client_display']:
-                        if key in st.session_state:
-                            del st.session_state[key]
+                    for key in NEW_PIPELINE_FORM_KEYS:
+                        st.session_state.pop(key, None)
                     st.rerun()
     
     # Pipeline Generation Interface
@@ -10762,9 +11055,13 @@ def pipeline_configuration_section():
     with pipeline_tab3:
         st.subheader("📈 Pipeline Analytics")
         
+        if st.button("🔄 Refresh", key="refresh_pipeline_analytics", help="Reload pipelines and staffing plans"):
+            _invalidate_pipeline_analytics_caches()
+            _load_velocity_stage_metrics.clear()
+        
         # Load pipelines for analytics
         try:
-            pipelines_df = pipeline_manager.get_all_pipelines()
+            pipelines_df = _load_all_pipelines(pipeline_manager, talent_pipelines_table)
             if pipelines_df is not None and not pipelines_df.empty:
                 pipelines = pipelines_df.to_dict('records')
             else:
@@ -10775,11 +11072,24 @@ def pipeline_configuration_section():
         
         if pipelines is not None and len(pipelines) > 0:
             # Get staffing plans for timeline analysis
-            staffing_plans_df = staffing_manager.get_all_staffing_plans()
+            staffing_plans_df = _load_all_staffing_plans(staffing_manager, _tbl('staffing_plans'))
             staffing_plans = []
             if staffing_plans_df is not None and not staffing_plans_df.empty:
                 staffing_plans = staffing_plans_df.to_dict('records')
             
+            # Planning details for all plans at once, shared by the dashboards below
+            planning_details_by_plan = _load_planning_details_by_plan(
+                staffing_manager, tuple(int(plan['id']) for plan in staffing_plans)
+            )
+            # The same details as one frame with each plan's client, filtered by the Velocity and Performance dashboards
+            planning_details_df = _planning_details_frame(staffing_plans_df, planning_details_by_plan)
+            # Stages of every pipeline at once, shared by the dashboards and the export below
+            stages_by_pipeline = _load_analytics_stages_by_pipeline(
+                pipeline_manager, pipeline_stages_table, tuple(int(pipeline['id']) for pipeline in pipelines)
+            )
+            # Client and owner filter choices shared by the Velocity and Performance dashboards
+            client_options, owner_options = _analytics_filter_options(staffing_plans_df, planning_details_by_plan)
+            
             # Create two main sections
             timeline_tab, velocity_tab, performance_tab = st.tabs(["⏱️ Timeline Performance Dashboard", "🏃 Pipeline Velocity Metrics", "📊 Pipeline Performance"])
             
@@ -10806,13 +11116,13 @@ def pipeline_configuration_section():
                     
                     if selected_pipeline_id:
                         # Get pipeline stages and staffing plans using this pipeline
-                        stages = pipeline_manager.get_pipeline_stages(selected_pipeline_id)
+                        stages = stages_by_pipeline.get(selected_pipeline_id, [])
                         pipeline_name = next(p['name'] for p in pipelines if p['id'] == selected_pipeline_id)
                         
                         # Filter staffing plans that use this pipeline
                         relevant_plans = []
                         for plan in staffing_plans:
-                            plan_details = staffing_manager.get_pipeline_planning_details(plan['id'])
+                            plan_details = planning_details_by_plan.get(plan['id'], [])
                             if plan_details:
                                 for detail in plan_details:
                                     if detail.get('pipeline_id') == selected_pipeline_id:
@@ -10839,6 +11149,24 @@ def pipeline_configuration_section():
                             
                             colors = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd']
                             
+                            # Stage start/end offsets from sourcing start are the same for every plan
+                            stage_tats = np.array([stage['tat_days'] for stage in stages], dtype=np.int64)
+                            stage_end_offsets = np.cumsum(stage_tats)
+                            stage_start_offsets = stage_end_offsets - stage_tats
+                            total_tat = int(stage_end_offsets[-1])
+                            
+                            # Simulated actual stage durations, drawn once from a local seeded generator for consistent demo data
+                            timeline_rng = np.random.default_rng(42)
+                            actual_start_jitter = timeline_rng.integers(-2, 6)
+                            actual_durations = stage_tats + timeline_rng.integers(-3, 8, size=len(stages))
+                            actual_end_offsets = actual_start_jitter + np.cumsum(actual_durations)
+                            actual_start_offsets = actual_end_offsets - actual_durations
+                            # Simulated summary figures (would be calculated from real data)
+                            actual_tat_variance, on_time_percentage = (int(draw) for draw in timeline_rng.integers([-5, 65], [11, 86]))
+                            
+                            # Collected here and added to the figure in one add_traces call
+                            timeline_traces = []
+                            timeline_trace_rows = []
                             for idx, plan_data in enumerate(relevant_plans):
                                 plan = plan_data['plan']
                                 detail = plan_data['detail']
@@ -10849,41 +11177,32 @@ def pipeline_configuration_section():
                                     onboard_date = datetime.strptime(onboard_date, '%Y-%m-%d').date()
                                 
                                 # Calculate sourcing start date based on total TAT
-                                total_tat = sum(stage['tat_days'] for stage in stages)
                                 sourcing_start = onboard_date - timedelta(days=total_tat)
                                 
                                 # Create planned timeline bars
-                                current_date = sourcing_start
-                                stage_dates = []
-                                
-                                for stage in stages:
-                                    stage_start = current_date
-                                    stage_end = current_date + timedelta(days=stage['tat_days'])
-                                    stage_dates.append({
+                                sourcing_day = np.datetime64(sourcing_start, 'D')
+                                stage_starts = (sourcing_day + stage_start_offsets).astype(object)
+                                stage_ends = (sourcing_day + stage_end_offsets).astype(object)
+                                stage_dates = [
+                                    {
                                         'stage': stage['stage_name'],
                                         'start': stage_start,
                                         'end': stage_end,
                                         'tat_days': stage['tat_days']
-                                    })
-                                    current_date = stage_end
+                                    }
+                                    for stage, stage_start, stage_end in zip(stages, stage_starts, stage_ends)
+                                ]
                                 
                                 # Add planned timeline bars
-                                for i, stage_data in enumerate(stage_dates):
-                                    fig.add_trace(
-                                        go.Scatter(
-                                            x=[stage_data['start'], stage_data['end']],
-                                            y=[f"Planned - {stage_data['stage']}", f"Planned - {stage_data['stage']}"],
-                                            mode='lines',
-                                            line=dict(color=colors[i % len(colors)], width=8),
-                                            name=f"{stage_data['stage']} (Planned)",
-                                            hovertemplate=f"<b>{stage_data['stage']}</b><br>Start: %{{x}}<br>Duration: {stage_data['tat_days']} days<extra></extra>",
-                                            showlegend=idx == 0
-                                        ),
-                                        row=idx+1, col=1
-                                    )
+                                planned_traces = _timeline_segment_traces(
+                                    [(stage_data['stage'], stage_data['start'], stage_data['end'], stage_data['tat_days']) for stage_data in stage_dates],
+                                    "Planned", colors, showlegend=idx == 0
+                                )
+                                timeline_traces.extend(planned_traces)
+                                timeline_trace_rows.extend([idx+1] * len(planned_traces))
                                 
                                 # Add milestone markers
-                                fig.add_trace(
+                                timeline_traces.append(
                                     go.Scatter(
                                         x=[sourcing_start, onboard_date],
                                         y=[f"Milestones", f"Milestones"],
@@ -10897,33 +11216,24 @@ def pipeline_configuration_section():
                                         hovertemplate="<b>%{text}</b><br>Date: %{x}<extra></extra>",
                                         text=["Sourcing Start", "Target Onboard"],
                                         showlegend=idx == 0
-                                    ),
-                                    row=idx+1, col=1
+                                    )
                                 )
+                                timeline_trace_rows.append(idx+1)
                                 
                                 # Add simulated actual data (in a real system, this would come from tracking)
-                                import random
-                                random.seed(42)  # For consistent demo data
+                                actual_starts = (sourcing_day + actual_start_offsets).astype(object)
+                                actual_ends = (sourcing_day + actual_end_offsets).astype(object)
+                                actual_segments = [
+                                    (stage_data['stage'], actual_start, actual_end, int(actual_duration))
+                                    for stage_data, actual_start, actual_end, actual_duration
+                                    in zip(stage_dates, actual_starts, actual_ends, actual_durations)
+                                ]
                                 
-                                actual_current_date = sourcing_start + timedelta(days=random.randint(-2, 5))
-                                for i, stage_data in enumerate(stage_dates):
-                                    actual_duration = stage_data['tat_days'] + random.randint(-3, 7)
-                                    actual_start = actual_current_date
-                                    actual_end = actual_current_date + timedelta(days=actual_duration)
-                                    
-                                    fig.add_trace(
-                                        go.Scatter(
-                                            x=[actual_start, actual_end],
-                                            y=[f"Actual - {stage_data['stage']}", f"Actual - {stage_data['stage']}"],
-                                            mode='lines',
-                                            line=dict(color=colors[i % len(colors)], width=8, dash='dot'),
-                                            name=f"{stage_data['stage']} (Actual)",
-                                            hovertemplate=f"<b>{stage_data['stage']} - Actual</b><br>Start: %{{x}}<br>Duration: {actual_duration} days<extra></extra>",
-                                            showlegend=idx == 0
-                                        ),
-                                        row=idx+1, col=1
-                                    )
-                                    actual_current_date = actual_end
+                                actual_traces = _timeline_segment_traces(actual_segments, "Actual", colors, dash='dot', showlegend=idx == 0)
+                                timeline_traces.extend(actual_traces)
+                                timeline_trace_rows.extend([idx+1] * len(actual_traces))
+                            
+                            fig.add_traces(timeline_traces, rows=timeline_trace_rows, cols=[1] * len(timeline_trace_rows))
                             
                             fig.update_layout(
                                 height=max(500, 400 * len(relevant_plans)),
@@ -10976,21 +11286,17 @@ def pipeline_configuration_section():
                             col1, col2, col3, col4 = st.columns(4)
                             
                             with col1:
-                                total_planned_tat = sum(stage['tat_days'] for stage in stages)
-                                st.metric("Total Planned TAT", f"{total_planned_tat} days")
+                                st.metric("Total Planned TAT", f"{total_tat} days")
                             
                             with col2:
                                 # Simulated actual TAT (would be calculated from real data)
-                                actual_tat = total_planned_tat + random.randint(-5, 10)
-                                variance = actual_tat - total_planned_tat
                                 st.metric(
                                     "Avg Actual TAT", 
-                                    f"{actual_tat} days",
-                                    delta=f"{variance:+d} days"
+                                    f"{total_tat + actual_tat_variance} days",
+                                    delta=f"{actual_tat_variance:+d} days"
                                 )
                             
                             with col3:
-                                on_time_percentage = random.randint(65, 85)
                                 st.metric("On-Time Completion", f"{on_time_percentage}%")
                             
                             with col4:
@@ -11020,10 +11326,6 @@ def pipeline_configuration_section():
                     
                     with filter_col1:
                         # Client filter
-                        all_clients = set()
-                        for plan in staffing_plans:
-                            all_clients.add(plan.get('client_name', 'Unknown'))
-                        client_options = ['All Clients'] + sorted(list(all_clients))
                         selected_client = st.selectbox(
                             "Client",
                             options=client_options,
@@ -11032,15 +11334,6 @@ def pipeline_configuration_section():
                     
                     with filter_col2:
                         # Owner filter (from pipeline requirements table)
-                        all_owners = set()
-                        for plan in staffing_plans:
-                            plan_details = staffing_manager.get_pipeline_planning_details(plan['id'])
-                            if plan_details:
-                                for detail in plan_details:
-                                    pipeline_owner = detail.get('pipeline_owner', 'Unknown')
-                                    if pipeline_owner and pipeline_owner != 'Unknown':
-                                        all_owners.add(pipeline_owner)
-                        owner_options = ['All Owners'] + sorted(list(all_owners))
                         selected_owner = st.selectbox(
                             "Pipeline Owner",
                             options=owner_options,
@@ -11078,57 +11371,17 @@ def pipeline_configuration_section():
                         # Get stages based on selection
                         if selected_pipeline_id == 'all':
                             # For "All Pipelines", collect all unique stages from all pipelines
-                            all_stages = set()
-                            stage_details = {}
-                            
-                            for pipeline in pipelines:
-                                pipeline_stages = pipeline_manager.get_pipeline_stages(pipeline['id'])
-                                for stage in pipeline_stages:
-                                    stage_name = stage['stage_name']
-                                    all_stages.add(stage_name)
-                                    if stage_name not in stage_details:
-                                        stage_details[stage_name] = stage
-                            
-                            # Convert to list format
-                            stages = [stage_details[stage_name] for stage_name in sorted(all_stages)]
+                            stages = _unique_stages_by_name(stages_by_pipeline)
                             pipeline_name = "All Pipelines"
                         else:
-                            stages = pipeline_manager.get_pipeline_stages(selected_pipeline_id)
+                            stages = stages_by_pipeline.get(selected_pipeline_id, [])
                             pipeline_name = next(p['name'] for p in pipelines if p['id'] == selected_pipeline_id)
                         
                         if stages:
-                            # Filter and aggregate data from all staffing plans
-                            filtered_plans = []
-                            for plan in staffing_plans:
-                                # Apply filters
-                                if selected_client != 'All Clients' and plan.get('client_name') != selected_client:
-                                    continue
-                                
-                                plan_details = staffing_manager.get_pipeline_planning_details(plan['id'])
-                                if not plan_details:
-                                    continue
-                                
-                                for detail in plan_details:
-                                    # For "All Pipelines", include all pipeline data
-                                    if selected_pipeline_id != 'all' and detail.get('pipeline_id') != selected_pipeline_id:
-                                        continue
-                                    
-                                    # Apply owner filter
-                                    if selected_owner != 'All Owners' and detail.get('pipeline_owner') != selected_owner:
-                                        continue
-                                    
-                                    # Apply date filter
-                                    onboard_date = detail.get('onboard_by')
-                                    if isinstance(onboard_date, str):
-                                        onboard_date = datetime.strptime(onboard_date, '%Y-%m-%d').date()
-                                    
-                                    if onboard_date and (onboard_date < from_date or onboard_date > to_date):
-                                        continue
-                                    
-                                    filtered_plans.append({
-                                        'plan': plan,
-                                        'detail': detail
-                                    })
+                            # Planning details of all staffing plans that match the filters
+                            filtered_details = _filter_plan_details(
+                                planning_details_df, selected_client, selected_owner, selected_pipeline_id, from_date, to_date
+                            )
                             
                             # Display filter summary
                             st.markdown("---")
@@ -11138,117 +11391,27 @@ def pipeline_configuration_section():
                             if selected_owner != 'All Owners':
                                 filter_summary += f"Owner: {selected_owner} | "
                             filter_summary += f"Period: {from_date} to {to_date} | "
-                            filter_summary += f"Plans Found: {len(filtered_plans)}"
+                            filter_summary += f"Plans Found: {len(filtered_details)}"
                             
                             st.markdown(filter_summary)
                             st.markdown("---")
                             
-                            # Create gauge charts for each stage
-                            import plotly.graph_objects as go
-                            from plotly.subplots import make_subplots
-                            
-                            # Calculate metrics with better layout
-                            num_stages = len(stages)
-                            
-                            # Use 4 columns for better spacing and smaller gauges
-                            cols_per_row = 4
-                            rows = (num_stages + cols_per_row - 1) // cols_per_row
-                            
-                            fig = make_subplots(
-                                rows=rows,
-                                cols=cols_per_row,
-                                subplot_titles=[f"<b style='color:black'>{stage['stage_name']}</b><br><span style='color:black'>Expected: {stage['conversion_percentage']}%</span>" for stage in stages],
-                                specs=[[{"type": "indicator"} for _ in range(cols_per_row)] for _ in range(rows)],
-                                vertical_spacing=0.25,  # More spacing between rows for subtitle
-                                horizontal_spacing=0.1  # Better horizontal spacing
+                            # Actual conversion per stage, computed once for both the gauges and the breakdown table
+                            stage_metrics = _load_velocity_stage_metrics(
+                                staffing_manager,
+                                tuple(zip(filtered_details['plan_id'].tolist(), filtered_details['role'].tolist())),
+                                tuple(stage['stage_name'] for stage in stages)
                             )
                             
-                            for idx, stage in enumerate(stages):
-                                row = (idx // cols_per_row) + 1
-                                col = (idx % cols_per_row) + 1
-                                
-                                # Get actual conversion rate from pipeline requirements data
-                                stage_name = stage['stage_name']
-                                expected_conversion = stage['conversion_percentage']
-                                
-                                # Calculate actual conversion from pipeline_requirements_actual table
-                                actual_conversion = 0
-                                total_actual_records = 0
-                                
-                                for plan_data in filtered_plans:
-                                    try:
-                                        # Get actual data for this stage from pipeline_requirements_actual
-                                        conn = get_db_connection()
-                                        actual_query = """
-                                            SELECT actual_at_stage, required_at_stage
-                                            FROM pipeline_requirements_actual 
-                                            WHERE staffing_plan_id = %s 
-                                            AND stage_name = %s
-                                        """
-                                        cursor = conn.cursor()
-                                        cursor.execute(actual_query, (plan_data['plan']['id'], stage_name))
-                                        actual_data = cursor.fetchone()
-                                        
-                                        if actual_data and actual_data[1] > 0:  # required_at_stage > 0
-                                            stage_actual_conversion = (actual_data[0] / actual_data[1]) * 100
-                                            actual_conversion += stage_actual_conversion
-                                            total_actual_records += 1
-                                        
-                                        cursor.close()
-                                        conn.close()
-                                    except Exception as e:
-                                        pass
-                                
-                                # Calculate average actual conversion
-                                if total_actual_records > 0:
-                                    actual_conversion = actual_conversion / total_actual_records
-                                else:
-                                    actual_conversion = expected_conversion  # Fallback to expected if no actual data
-                                
-                                # Determine color based on actual vs expected comparison
-                                conversion_ratio = actual_conversion / expected_conversion if expected_conversion > 0 else 1
-                                
-                                if conversion_ratio >= 0.9:  # Actual >= 90% of expected
-                                    color = "green"
-                                elif conversion_ratio >= 0.7:  # Actual >= 70% of expected
-                                    color = "yellow"
-                                else:  # Actual < 70% of expected
-                                    color = "red"
-                                
-                                fig.add_trace(
-                                    go.Indicator(
-                                        mode="gauge+number+delta",
-                                        value=actual_conversion,
-                                        delta={'reference': expected_conversion, 'relative': False, 'suffix': '%'},
-                                        domain={'x': [0.05, 0.95], 'y': [0.05, 0.95]},
-                                        number={'font': {'size': 18, 'color': 'black', 'family': 'Arial Black'}, 'suffix': '%'},
-                                        gauge={
-                                            'axis': {
-                                                'range': [None, 100],
-                                                'tickwidth': 2,
-                                                'tickcolor': "black",
-                                                'tickfont': {'size': 8, 'color': 'black', 'family': 'Arial'},
-                                                'tick0': 0,
-                                                'dtick': 25
-                                            },
-                                            'bar': {'color': color, 'thickness': 0.8},
-                                            'bgcolor': "white",
-                                            'borderwidth': 2,
-                                            'bordercolor': "black",
-                                            'steps': [
-                                                {'range': [0, expected_conversion * 0.7], 'color': "#ffebee"},
-                                                {'range': [expected_conversion * 0.7, expected_conversion * 0.9], 'color': "#fff3e0"},
-                                                {'range': [expected_conversion * 0.9, 100], 'color': "#e8f5e8"}
-                                            ],
-                                            'threshold': {
-                                                'line': {'color': "blue", 'width': 3},
-                                                'thickness': 0.7,
-                                                'value': expected_conversion
-                                            }
-                                        }
-                                    ),
-                                    row=row, col=col
-                                )
+                            # (stage name, expected %, actual %) per gauge, falling back to expected when there is no actual data
+                            gauge_stages = []
+                            for stage in stages:
+                                actual_conversion, total_actual_records = stage_metrics[stage['stage_name']]
+                                gauge_stages.append((
+                                    stage['stage_name'],
+                                    stage['conversion_percentage'],
+                                    actual_conversion if total_actual_records else stage['conversion_percentage']
+                                ))
                             
                             # Create dynamic title based on filters
                             title_parts = ["Expected vs Actual Conversion Dashboard"]
@@ -11263,31 +11426,8 @@ def pipeline_configuration_section():
                             
                             chart_title = " | ".join(title_parts)
                             
-                            fig.update_layout(
-                                height=max(300, 200 * rows),
-                                title=dict(
-                                    text=chart_title,
-                                    x=0.5,
-                                    font=dict(size=16, color='black', family='Arial Black'),
-                                    pad=dict(t=10, b=10)
-                                ),
-                                font={'size': 10, 'color': 'black', 'family': 'Arial'},
-                                margin=dict(l=20, r=20, t=50, b=30),
-                                showlegend=False,
-                                paper_bgcolor='white',
-                                plot_bgcolor='white'
-                            )
-                            
-                            # Update annotations with black text and better contrast
-                            fig.update_annotations(
-                                font_size=10,
-                                font_color="black",
-                                font_family="Arial",
-                                bgcolor="rgba(255,255,255,0.9)",
-                                bordercolor="black",
-                                borderwidth=1
-                            )
-                            
+                            # Create gauge charts for each stage
+                            fig = _build_velocity_gauge_figure(tuple(gauge_stages), chart_title)
                             st.plotly_chart(fig, use_container_width=True)
                             
                             # Add more space before next section
@@ -11298,71 +11438,36 @@ def pipeline_configuration_section():
                             st.markdown("### 📋 Expected vs Actual Conversion Breakdown")
                             st.markdown("Detailed comparison of expected vs actual conversion rates by stage")
                             st.markdown("")
-                            conversion_data = []
-                            
-                            for idx, stage in enumerate(stages):
-                                stage_name = stage['stage_name']
-                                expected_conversion = stage['conversion_percentage']
-                                
-                                # Recalculate actual conversion for table (same logic as above)
-                                actual_conversion = 0
-                                total_actual_records = 0
-                                
-                                for plan_data in filtered_plans:
-                                    try:
-                                        conn = get_db_connection()
-                                        actual_query = """
-                                            SELECT actual_at_stage, required_at_stage
-                                            FROM pipeline_requirements_actual 
-                                            WHERE staffing_plan_id = %s 
-                                            AND stage_name = %s
-                                        """
-                                        cursor = conn.cursor()
-                                        cursor.execute(actual_query, (plan_data['plan']['id'], stage_name))
-                                        actual_data = cursor.fetchone()
-                                        
-                                        if actual_data and actual_data[1] > 0:
-                                            stage_actual_conversion = (actual_data[0] / actual_data[1]) * 100
-                                            actual_conversion += stage_actual_conversion
-                                            total_actual_records += 1
-                                        
-                                        cursor.close()
-                                        conn.close()
-                                    except Exception as e:
-                                        pass
-                                
-                                if total_actual_records > 0:
-                                    actual_conversion = actual_conversion / total_actual_records
-                                else:
-                                    actual_conversion = expected_conversion
-                                
-                                # Calculate variance
-                                variance = actual_conversion - expected_conversion
-                                variance_pct = (variance / expected_conversion * 100) if expected_conversion > 0 else 0
-                                
-                                # Determine performance status
-                                if variance >= 0:
-                                    if variance_pct >= 10:
-                                        status = "🟢 Exceeding"
-                                    else:
-                                        status = "🟢 Meeting"
-                                elif variance_pct >= -10:
-                                    status = "🟡 Near Target"
-                                else:
-                                    status = "🔴 Below Target"
-                                
-                                conversion_data.append({
-                                    'Stage': stage_name,
-                                    'Expected %': f"{expected_conversion:.1f}%",
-                                    'Actual %': f"{actual_conversion:.1f}%",
-                                    'Variance': f"{variance:+.1f}%",
-                                    'Variance %': f"{variance_pct:+.1f}%",
-                                    'Status': status,
-                                    'Data Points': total_actual_records
-                                })
+                            # Expected vs actual per stage, with variance and status derived column-wise
+                            conversion_df = pd.DataFrame(gauge_stages, columns=['Stage', 'Expected %', 'Actual %']).astype({'Expected %': float, 'Actual %': float})
+                            conversion_df['Variance'] = conversion_df['Actual %'] - conversion_df['Expected %']
+                            conversion_df['Variance %'] = np.where(
+                                conversion_df['Expected %'] > 0,
+                                conversion_df['Variance'] / conversion_df['Expected %'].where(conversion_df['Expected %'] > 0) * 100,
+                                0
+                            )
                             
-                            conversion_df = pd.DataFrame(conversion_data)
-                            st.dataframe(conversion_df, use_container_width=True)
+                            # Determine performance status
+                            conversion_df['Status'] = np.select(
+                                [
+                                    (conversion_df['Variance'] >= 0) & (conversion_df['Variance %'] >= 10),
+                                    conversion_df['Variance'] >= 0,
+                                    conversion_df['Variance %'] >= -10
+                                ],
+                                ["🟢 Exceeding", "🟢 Meeting", "🟡 Near Target"],
+                                default="🔴 Below Target"
+                            )
+                            conversion_df['Data Points'] = [stage_metrics[stage_name][1] for stage_name in conversion_df['Stage']]
+                            
+                            st.dataframe(
+                                conversion_df.style.format({
+                                    'Expected %': '{:.1f}%',
+                                    'Actual %': '{:.1f}%',
+                                    'Variance': '{:+.1f}%',
+                                    'Variance %': '{:+.1f}%'
+                                }),
+                                use_container_width=True
+                            )
                             
                             # Overall conversion metrics with better spacing
                             st.markdown("<br>", unsafe_allow_html=True)
@@ -11372,24 +11477,17 @@ def pipeline_configuration_section():
                             st.markdown("")
                             col1, col2, col3, col4 = st.columns(4)
                             
-                            # Calculate overall metrics from conversion_data
-                            total_stages = len(conversion_data)
-                            avg_expected = sum(stage['conversion_percentage'] for stage in stages) / total_stages
-                            
-                            # Calculate average actual conversion from the data we processed
-                            total_actual = 0
-                            stages_with_data = 0
-                            for data in conversion_data:
-                                if data['Data Points'] > 0:
-                                    total_actual += float(data['Actual %'].replace('%', ''))
-                                    stages_with_data += 1
+                            # Calculate overall metrics from conversion_df
+                            avg_expected = conversion_df['Expected %'].mean()
                             
-                            avg_actual = total_actual / stages_with_data if stages_with_data > 0 else avg_expected
+                            # Calculate average actual conversion over the stages with actual data
+                            stages_with_data = conversion_df['Data Points'] > 0
+                            avg_actual = conversion_df.loc[stages_with_data, 'Actual %'].mean() if stages_with_data.any() else avg_expected
                             overall_variance = avg_actual - avg_expected
                             
                             # Find best and worst performing stages
-                            best_stage = max(conversion_data, key=lambda x: float(x['Variance %'].replace('%', '').replace('+', '')))
-                            worst_stage = min(conversion_data, key=lambda x: float(x['Variance %'].replace('%', '').replace('+', '')))
+                            best_stage = conversion_df.loc[conversion_df['Variance %'].idxmax(), 'Stage']
+                            worst_stage = conversion_df.loc[conversion_df['Variance %'].idxmin(), 'Stage']
                             
                             with col1:
                                 st.metric("Expected Avg", f"{avg_expected:.1f}%")
@@ -11398,10 +11496,10 @@ def pipeline_configuration_section():
                                 st.metric("Actual Avg", f"{avg_actual:.1f}%", f"{overall_variance:+.1f}%")
                             
                             with col3:
-                                st.metric("Best Stage", best_stage['Stage'])
+                                st.metric("Best Stage", best_stage)
                             
                             with col4:
-                                st.metric("Needs Attention", worst_stage['Stage'])
+                                st.metric("Needs Attention", worst_stage)
                             
                             # Explanation and recommendations
                             st.markdown("<br>", unsafe_allow_html=True)
@@ -11432,20 +11530,20 @@ def pipeline_configuration_section():
                                 st.info("ℹ️ **Good**: Conversion rates are meeting expectations.")
                             
                             # Specific recommendations based on conversion data
-                            underperforming_stages = [d for d in conversion_data if float(d['Variance %'].replace('%', '').replace('+', '')) < -10]
-                            if underperforming_stages:
-                                stage_names = [s['Stage'] for s in underperforming_stages]
+                            underperforming_stages = conversion_df.loc[conversion_df['Variance %'] < -10, 'Stage']
+                            if not underperforming_stages.empty:
+                                stage_names = underperforming_stages.tolist()
                                 st.info(f"💡 **Suggestion**: These stages need attention: {', '.join(stage_names)}")
                             
-                            high_performing_stages = [d for d in conversion_data if float(d['Variance %'].replace('%', '').replace('+', '')) > 10]
-                            if high_performing_stages:
-                                stage_names = [s['Stage'] for s in high_performing_stages]
+                            high_performing_stages = conversion_df.loc[conversion_df['Variance %'] > 10, 'Stage']
+                            if not high_performing_stages.empty:
+                                stage_names = high_performing_stages.tolist()
                                 st.info(f"🌟 **Great Work**: These stages are exceeding expectations: {', '.join(stage_names)}")
                             
                             # Data quality recommendations
-                            stages_no_data = [d for d in conversion_data if d['Data Points'] == 0]
-                            if stages_no_data:
-                                stage_names = [s['Stage'] for s in stages_no_data]
+                            stages_no_data = conversion_df.loc[conversion_df['Data Points'] == 0, 'Stage']
+                            if not stages_no_data.empty:
+                                stage_names = stages_no_data.tolist()
                                 st.info(f"📊 **Data Needed**: Enter actual data for these stages: {', '.join(stage_names)}")
                         
                         else:
@@ -11471,10 +11569,6 @@ def pipeline_configuration_section():
                     
                     with filter_col1:
                         # Client filter
-                        all_clients = set()
-                        for plan in staffing_plans:
-                            all_clients.add(plan.get('client_name', 'Unknown'))
-                        client_options = ['All Clients'] + sorted(list(all_clients))
                         selected_client = st.selectbox(
                             "Client",
                             options=client_options,
@@ -11483,15 +11577,6 @@ def pipeline_configuration_section():
                     
                     with filter_col2:
                         # Owner filter (from pipeline requirements table)
-                        all_owners = set()
-                        for plan in staffing_plans:
-                            plan_details = staffing_manager.get_pipeline_planning_details(plan['id'])
-                            if plan_details:
-                                for detail in plan_details:
-                                    pipeline_owner = detail.get('pipeline_owner', 'Unknown')
-                                    if pipeline_owner and pipeline_owner != 'Unknown':
-                                        all_owners.add(pipeline_owner)
-                        owner_options = ['All Owners'] + sorted(list(all_owners))
                         selected_owner = st.selectbox(
                             "Pipeline Owner",
                             options=owner_options,
@@ -11526,22 +11611,10 @@ def pipeline_configuration_section():
                     if selected_pipeline_id:
                         if selected_pipeline_id == 'all':
                             # For "All Pipelines", collect all unique stages from all pipelines
-                            all_stages = set()
-                            stage_details = {}
-                            
-                            for pipeline in pipelines:
-                                pipeline_stages = pipeline_manager.get_pipeline_stages(pipeline['id'])
-                                for stage in pipeline_stages:
-                                    stage_name = stage['stage_name']
-                                    all_stages.add(stage_name)
-                                    if stage_name not in stage_details:
-                                        stage_details[stage_name] = stage
-                            
-                            # Convert to list format
-                            stages = [stage_details[stage_name] for stage_name in sorted(all_stages)]
+                            stages = _unique_stages_by_name(stages_by_pipeline)
                             pipeline_name = "All Pipelines"
                         else:
-                            stages = pipeline_manager.get_pipeline_stages(selected_pipeline_id)
+                            stages = stages_by_pipeline.get(selected_pipeline_id, [])
                             pipeline_name = next(p['name'] for p in pipelines if p['id'] == selected_pipeline_id)
                         
                         if stages:
@@ -11559,60 +11632,35 @@ def pipeline_configuration_section():
                             actual_conversion = [0] * len(stages)
                             
                             # Filter and aggregate data from all staffing plans
-                            filtered_plans = []
                             total_actual_counts = [0] * len(stages)
                             plan_counts = [0] * len(stages)
                             
-                            for plan in staffing_plans:
-                                # Apply filters
-                                if selected_client != 'All Clients' and plan.get('client_name') != selected_client:
-                                    continue
-                                
-                                plan_details = staffing_manager.get_pipeline_planning_details(plan['id'])
-                                if not plan_details:
-                                    continue
-                                
-                                for detail in plan_details:
-                                    # For "All Pipelines", include all pipeline data
-                                    if selected_pipeline_id != 'all' and detail.get('pipeline_id') != selected_pipeline_id:
-                                        continue
-                                    
-                                    # Apply owner filter
-                                    if selected_owner != 'All Owners' and detail.get('pipeline_owner') != selected_owner:
-                                        continue
-                                    
-                                    # Apply date filter
-                                    onboard_date = detail.get('onboard_by')
-                                    if isinstance(onboard_date, str):
-                                        onboard_date = datetime.strptime(onboard_date, '%Y-%m-%d').date()
-                                    
-                                    if onboard_date and (onboard_date < from_date or onboard_date > to_date):
-                                        continue
-                                    
-                                    # Get pipeline requirements data
-                                    requirements = staffing_manager.get_pipeline_requirements_actual(plan['id'], detail['role'])
-                                    if requirements:
-                                        for stage_name, req_data in requirements.items():
-                                            if stage_name in stage_names:
-                                                stage_idx = stage_names.index(stage_name)
+                            filtered_details = _filter_plan_details(
+                                planning_details_df, selected_client, selected_owner, selected_pipeline_id, from_date, to_date
+                            )
+                            filtered_plan_roles = list(zip(filtered_details['plan_id'].tolist(), filtered_details['role'].tolist()))
+                            # Pipeline requirements data of every filtered plan and role in one query
+                            requirements_by_plan_role = staffing_manager.get_pipeline_requirements_actual_by_plan_role(filtered_plan_roles)
+                            for plan_role in filtered_plan_roles:
+                                # Get pipeline requirements data
+                                requirements = requirements_by_plan_role.get(plan_role)
+                                if requirements:
+                                    for stage_name, req_data in requirements.items():
+                                        if stage_name in stage_names:
+                                            stage_idx = stage_names.index(stage_name)
                                                 
-                                                # Aggregate planned and actual pipeline data
-                                                profiles_in_pipeline = req_data.get('profiles_in_pipeline', 0)
-                                                actual_at_stage = req_data.get('actual_at_stage', 0)
+                                            # Aggregate planned and actual pipeline data
+                                            profiles_in_pipeline = req_data.get('profiles_in_pipeline', 0)
+                                            actual_at_stage = req_data.get('actual_at_stage', 0)
                                                 
-                                                planned_candidates[stage_idx] += profiles_in_pipeline
-                                                actual_candidates[stage_idx] += actual_at_stage
+                                            planned_candidates[stage_idx] += profiles_in_pipeline
+                                            actual_candidates[stage_idx] += actual_at_stage
                                                 
-                                                # Calculate actual conversion rates
-                                                if profiles_in_pipeline > 0:
-                                                    actual_conv_rate = (actual_at_stage / profiles_in_pipeline) * 100
-                                                    total_actual_counts[stage_idx] += actual_conv_rate
-                                                    plan_counts[stage_idx] += 1
-                                    
-                                    filtered_plans.append({
-                                        'plan': plan,
-                                        'detail': detail
-                                    })
+                                            # Calculate actual conversion rates
+                                            if profiles_in_pipeline > 0:
+                                                actual_conv_rate = (actual_at_stage / profiles_in_pipeline) * 100
+                                                total_actual_counts[stage_idx] += actual_conv_rate
+                                                plan_counts[stage_idx] += 1
                             
                             # Calculate average actual conversion rates
                             for i in range(len(stages)):
@@ -11629,7 +11677,7 @@ def pipeline_configuration_section():
                             if selected_owner != 'All Owners':
                                 filter_summary += f"Owner: {selected_owner} | "
                             filter_summary += f"Period: {from_date} to {to_date} | "
-                            filter_summary += f"Plans Found: {len(filtered_plans)}"
+                            filter_summary += f"Plans Found: {len(filtered_details)}"
                             st.markdown(filter_summary)
                             
                             # Check if we have any data to display
@@ -11863,7 +11911,7 @@ def pipeline_configuration_section():
             if st.button("📥 Export Performance Analytics", type="secondary"):
                 analytics_data = []
                 for pipeline in pipelines:
-                    stages = pipeline_manager.get_pipeline_stages(pipeline['id'])
+                    stages = stages_by_pipeline.get(pipeline['id'], [])
                     if stages:
                         total_tat = sum(stage['tat_days'] for stage in stages)
                         avg_conversion = sum(stage['conversion_percentage'] for stage in stages) / len(stages)
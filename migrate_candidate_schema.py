@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+One-off candidate and pipeline schema migration: the status_category column,
+the candidate list / filter indexes and the pipeline stage order index.
+
+Indexes are built with CREATE INDEX CONCURRENTLY so writes to the table keep
+working while they build. Adding status_category rewrites the table, so run
+this off-peak. The app falls back to the equivalent CASE expression until the
+column exists.
+
+Usage: ENVIRONMENT=production python migrate_candidate_schema.py
+       (ENVIRONMENT=development targets the dev_ tables)
+"""
+
+import logging
+import psycopg2
+
+from utils.candidate_status_config import CANDIDATE_STATUS_CATEGORY_SQL
+from utils.environment_manager import EnvironmentManager
+from utils.pipeline_manager import PIPELINE_STAGE_SORT_SQL
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def candidate_index_definitions(candidate_data_table):
+    """(index name, table and column definition) pairs for the candidate module"""
+    return [
+        # Backs the candidate list's keyset pagination (ORDER BY created_date DESC, id DESC)
+        (f"idx_{candidate_data_table}_created_id", f"{candidate_data_table} (created_date DESC, id DESC)"),
+        # Back the EXISTS probes behind the client / supply plan filter dropdowns
+        (f"idx_{candidate_data_table}_hire_for_client", f"{candidate_data_table} (hire_for_client_id)"),
+        (f"idx_{candidate_data_table}_staffing_plan", f"{candidate_data_table} (staffing_plan_id)"),
+        # Lets ORDER BY partner_name in the vendor dropdown use an index scan
+        ("idx_vendor_partners_name", "vendor_partners (partner_name)"),
+        (f"idx_{candidate_data_table}_status_category", f"{candidate_data_table} (status_category)"),
+        # Equality filters and the pipeline join in the candidate list query
+        (f"idx_{candidate_data_table}_status", f"{candidate_data_table} (status)"),
+        (f"idx_{candidate_data_table}_role", f"{candidate_data_table} (role)"),
+        (f"idx_{candidate_data_table}_drop_reason", f"{candidate_data_table} (drop_reason)"),
+        (f"idx_{candidate_data_table}_linked_pipeline", f"{candidate_data_table} (linked_pipeline_id)"),
+        # Trigram index for the name search's ILIKE '%term%'
+        (f"idx_{candidate_data_table}_name_trgm", f"{candidate_data_table} USING gin (candidate_name gin_trgm_ops)"),
+    ]
+
+def pipeline_index_definitions(pipeline_stages_table):
+    """(index name, table and column definition) pairs for the pipeline stage list"""
+    return [
+        # Matches the Edit Pipeline stage list's ORDER BY, so it can follow the index without a sort
+        (f"idx_{pipeline_stages_table}_pipeline_stage_order", f"{pipeline_stages_table} (pipeline_id, ({PIPELINE_STAGE_SORT_SQL}))"),
+    ]
+
+def migrate_candidate_schema():
+    """Add status_category and build the candidate and pipeline indexes, skipping any step that fails"""
+    env_manager = EnvironmentManager()
+    candidate_data_table = env_manager.get_table_name('candidate_data')
+    pipeline_stages_table = env_manager.get_table_name('pipeline_stages')
+
+    conn = psycopg2.connect(env_manager.get_database_url())
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block
+    conn.autocommit = True
+    cursor = conn.cursor()
+
+    try:
+        # Active/Inactive classification precomputed once per row instead of evaluated per query
+        cursor.execute(f"""
+            ALTER TABLE {candidate_data_table} ADD COLUMN IF NOT EXISTS status_category TEXT
+            GENERATED ALWAYS AS ({CANDIDATE_STATUS_CATEGORY_SQL.format(status='status')}) STORED
+        """)
+        logger.info(f"status_category column present on {candidate_data_table}")
+
+        try:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except Exception as e:
+            logger.warning(f"pg_trgm not available, the trigram index will fail: {e}")
+
+        index_definitions = candidate_index_definitions(candidate_data_table) + pipeline_index_definitions(pipeline_stages_table)
+        for index_name, definition in index_definitions:
+            try:
+                cursor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {definition}")
+                logger.info(f"Index {index_name} ready")
+            except Exception as e:
+                logger.warning(f"Index {index_name} skipped: {e}")
+                # A failed concurrent build leaves an INVALID index that IF NOT EXISTS would keep on a re-run
+                cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+
+    except Exception as e:
+        logger.error(f"Error during candidate schema migration: {str(e)}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+if __name__ == "__main__":
+    logger.info("Starting candidate schema migration...")
+    migrate_candidate_schema()
+    logger.info("Candidate schema migration complete!")
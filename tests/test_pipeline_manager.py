@@ -0,0 +1,49 @@
+"""
+Tests for PipelineManager bulk stage lookups
+Ensures stages of several pipelines come back grouped per pipeline from one query
+"""
+import pytest
+import os
+import sys
+import pandas as pd
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.pipeline_manager import PipelineManager
+
+class TestPipelineStagesByPipeline:
+    """Bulk pipeline stage lookup tests"""
+
+    @pytest.fixture
+    def manager(self):
+        """PipelineManager with a mocked connection"""
+        manager = PipelineManager()
+        manager.get_connection = MagicMock()
+        return manager
+
+    def test_stages_are_grouped_by_pipeline(self, manager):
+        """Stages keep their order within each pipeline and pipelines without stages map to an empty list"""
+        stages_df = pd.DataFrame([
+            {'pipeline_id': 1, 'stage_id': 10, 'stage_name': 'Screening', 'conversion_percentage': 80, 'tat_days': 3, 'stage_description': None},
+            {'pipeline_id': 1, 'stage_id': 11, 'stage_name': 'Interview', 'conversion_percentage': 50, 'tat_days': 5, 'stage_description': None},
+            {'pipeline_id': 2, 'stage_id': 20, 'stage_name': 'Screening', 'conversion_percentage': 70, 'tat_days': 2, 'stage_description': 'Phone'},
+        ])
+        with patch('utils.pipeline_manager.pd.read_sql_query', return_value=stages_df) as read_sql:
+            stages_by_pipeline = manager.get_pipeline_stages_by_pipeline([1, 2, 3])
+
+        read_sql.assert_called_once()
+        assert [stage['stage_name'] for stage in stages_by_pipeline[1]] == ['Screening', 'Interview']
+        assert stages_by_pipeline[2][0]['stage_description'] == 'Phone'
+        assert 'pipeline_id' not in stages_by_pipeline[2][0]
+        assert stages_by_pipeline[3] == []
+
+    def test_query_failure_returns_empty_lists(self, manager):
+        """A database error leaves every requested pipeline without stages"""
+        manager.get_connection.side_effect = Exception("connection refused")
+
+        assert manager.get_pipeline_stages_by_pipeline([4]) == {4: []}
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,98 @@
+"""
+Tests for StaffingPlansManager pipeline planning detail lookups
+Ensures the bulk lookup groups rows per plan like the single-plan lookup
+"""
+import pytest
+import os
+import sys
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.staffing_plans_manager import StaffingPlansManager
+
+class TestPipelinePlanningDetailsByPlan:
+    """Bulk pipeline planning detail lookup tests"""
+
+    @pytest.fixture
+    def manager(self):
+        """StaffingPlansManager without the table bootstrap"""
+        with patch.object(StaffingPlansManager, '_ensure_staffing_tables'):
+            manager = StaffingPlansManager()
+        manager.get_connection = MagicMock()
+        return manager
+
+    def test_rows_are_grouped_by_plan(self, manager):
+        """One query returns each plan's details in order, with a blank row for plans without details"""
+        cursor = manager.get_connection.return_value.cursor.return_value
+        cursor.fetchall.return_value = [
+            (1, 'Engineer', 'Python', 2, None, 10, 'Asha'),
+            (1, 'Tester', None, None, None, 11, None),
+            (2, 'Designer', 'Figma', 1, None, 10, 'Ravi'),
+        ]
+
+        details = manager.get_pipeline_planning_details_by_plan([1, 2, 3])
+
+        cursor.execute.assert_called_once()
+        assert [d['role'] for d in details[1]] == ['Engineer', 'Tester']
+        assert details[1][1] == {
+            'role': 'Tester', 'skills': '', 'positions': 1,
+            'onboard_by': None, 'pipeline_id': 11, 'pipeline_owner': ''
+        }
+        assert details[2][0]['pipeline_owner'] == 'Ravi'
+        assert details[3] == [{
+            'role': '', 'skills': '', 'positions': 1,
+            'onboard_by': None, 'pipeline_id': None, 'pipeline_owner': ''
+        }]
+
+    def test_query_failure_returns_blank_rows(self, manager):
+        """A database error still yields the blank row for every requested plan"""
+        manager.get_connection.side_effect = Exception("connection refused")
+
+        details = manager.get_pipeline_planning_details_by_plan([5])
+
+        assert details[5][0]['pipeline_id'] is None
+
+class TestPipelineRequirementsActualByPlanRole:
+    """Bulk actual pipeline requirements lookup tests"""
+
+    @pytest.fixture
+    def manager(self):
+        """StaffingPlansManager without the table bootstrap"""
+        with patch.object(StaffingPlansManager, '_ensure_staffing_tables'):
+            manager = StaffingPlansManager()
+        manager.get_connection = MagicMock()
+        return manager
+
+    def test_rows_are_grouped_by_plan_and_role(self, manager):
+        """Repeated pairs are sent once and each pair gets the same shape as get_pipeline_requirements_actual"""
+        rows = [
+            (1, 'Engineer', 'Screening', 4, 1, 8, None),
+            (1, 'Engineer', 'Interview', 2, 0, 4, None),
+        ]
+        with patch('psycopg2.extras.execute_values', return_value=rows) as execute_values:
+            actuals = manager.get_pipeline_requirements_actual_by_plan_role([(1, 'Engineer'), (1, 'Engineer'), (2, 'Tester')])
+
+        execute_values.assert_called_once()
+        assert execute_values.call_args.args[2] == [(1, 'Engineer'), (2, 'Tester')]
+        assert actuals[(1, 'Engineer')]['Screening'] == {
+            'actual_at_stage': 4, 'actual_converted': 1,
+            'profiles_in_pipeline': 8, 'needed_by_date': None
+        }
+        assert set(actuals[(1, 'Engineer')]) == {'Screening', 'Interview'}
+        assert actuals[(2, 'Tester')] == {}
+
+    def test_query_failure_leaves_every_pair_empty(self, manager):
+        """A database error leaves every requested pair without actual data"""
+        manager.get_connection.side_effect = Exception("connection refused")
+
+        assert manager.get_pipeline_requirements_actual_by_plan_role([(1, 'Engineer')]) == {(1, 'Engineer'): {}}
+
+    def test_no_pairs_skips_the_query(self, manager):
+        """Nothing is queried when no plan matches the filters"""
+        assert manager.get_pipeline_requirements_actual_by_plan_role([]) == {}
+        manager.get_connection.assert_not_called()
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
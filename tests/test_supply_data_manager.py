@@ -0,0 +1,74 @@
+"""
+Tests for SupplyDataManager NFTE validation
+Ensures the vectorized check flags null, blank and absent mandatory fields
+"""
+import pytest
+import os
+import sys
+import pandas as pd
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from utils.supply_data_manager import SupplyDataManager
+
+class TestNfteValidation:
+    """NFTE mandatory field validation tests"""
+
+    @pytest.fixture
+    def manager(self):
+        """SupplyDataManager without the database setup done in __init__"""
+        return SupplyDataManager.__new__(SupplyDataManager)
+
+    @pytest.fixture
+    def talent_df(self):
+        """Mix of FTE and Non-FTE rows with missing and blank fields"""
+        return pd.DataFrame([
+            {'name': 'Asha', 'type': 'Non-FTE', 'partner': 'Acme', 'client': 'Globex', 'assigned_to': 'Team A'},
+            {'name': 'Ravi', 'type': 'Non-FTE', 'partner': None, 'client': '  ', 'assigned_to': 'Team B'},
+            {'name': 'Meera', 'type': 'FTE', 'partner': None, 'client': None, 'assigned_to': None},
+            {'name': 'Kiran', 'type': 'Non-FTE', 'partner': 'Initech', 'client': 'Globex', 'assigned_to': ''},
+        ])
+
+    def test_reports_only_nfte_rows_with_missing_fields(self, manager, talent_df):
+        """FTE rows and complete NFTE rows are not reported"""
+        assert manager.find_nfte_missing_fields(talent_df) == [
+            ('Ravi', ['partner', 'client']),
+            ('Kiran', ['assigned_to']),
+        ]
+
+    def test_absent_column_counts_as_missing(self, manager):
+        """A mandatory column missing from the frame is reported for every NFTE row"""
+        talent_df = pd.DataFrame([{'name': 'Asha', 'type': 'Non-FTE', 'partner': 'Acme', 'client': 'Globex'}])
+        assert manager.find_nfte_missing_fields(talent_df) == [('Asha', ['assigned_to'])]
+
+class TestTalentDataByIds:
+    """Fetching only the saved talent rows"""
+
+    @pytest.fixture
+    def manager(self):
+        """SupplyDataManager with a mocked connection and no environment manager"""
+        manager = SupplyDataManager.__new__(SupplyDataManager)
+        manager.env_manager = None
+        manager.get_connection = MagicMock()
+        return manager
+
+    def test_queries_ids_in_one_statement(self, manager):
+        """All ids are bound as one array parameter"""
+        rows = pd.DataFrame([{'id': 3, 'name': 'Asha'}, {'id': 7, 'name': 'Ravi'}])
+        with patch('utils.supply_data_manager.pd.read_sql_query', return_value=rows) as read_sql:
+            result = manager.get_talent_data_by_ids((3, 7))
+        assert result.equals(rows)
+        query, conn = read_sql.call_args.args
+        assert 'id = ANY(%s)' in query
+        assert read_sql.call_args.kwargs['params'] == ([3, 7],)
+
+    def test_returns_empty_frame_on_error(self, manager):
+        """Database errors give an empty frame like get_all_talent_data"""
+        manager.get_connection.side_effect = Exception("connection refused")
+        assert manager.get_talent_data_by_ids((3,)).empty
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -3,6 +3,16 @@ Candidate Status Configuration
 Centralized management of standardized candidate statuses for consistent application behavior.
 """
 
+# Activity bucket of a candidate status, as SQL over the status column named by {status}.
+# Inactive = Rejected, On Hold, On-Hold, RNR, Dropped, Internal Dropped, Duplicate Profile;
+# everything else with a status is Active (NULL status belongs to neither bucket).
+# Backs the status_category column added by migrate_candidate_schema.py.
+CANDIDATE_STATUS_CATEGORY_SQL = """CASE
+    WHEN {status} IS NULL THEN NULL
+    WHEN {status} = 'Dropped' OR {status} ~* '(rejected|on hold|on-hold|rnr|internal dropped|duplicate profile)' THEN 'inactive'
+    ELSE 'active'
+END"""
+
 class CandidateStatusConfig:
     """
     Centralized configuration for candidate statuses to ensure consistency
@@ -8,6 +8,10 @@ import os
 from datetime import datetime, timedelta
 import logging
 
+# Stage list sort key with "Any Stage" (-1) stages last; matches the
+# expression index built by migrate_candidate_schema.py
+PIPELINE_STAGE_SORT_SQL = "CASE WHEN stage_order = -1 THEN 2147483647 ELSE stage_order END"
+
 class PipelineManager:
     """Manage talent pipeline configurations, templates, and forecasting"""
 
@@ -181,6 +185,32 @@ class PipelineManager:
             print(f"Error getting pipeline stages: {str(e)}")
             return []
 
+    def get_pipeline_stages_by_pipeline(self, pipeline_ids):
+        """Get the stages of several pipelines in one query, as {pipeline_id: stages}"""
+        pipeline_ids = [int(pipeline_id) for pipeline_id in pipeline_ids]
+        stages_by_pipeline = {pipeline_id: [] for pipeline_id in pipeline_ids}
+        try:
+            conn = self.get_connection()
+
+            # Use environment-specific table name
+            pipeline_stages_table = self.get_table_name('pipeline_stages')
+
+            query = f"""
+                SELECT pipeline_id, id as stage_id, stage_name, conversion_rate as conversion_percentage, tat_days, stage_description
+                FROM {pipeline_stages_table}
+                WHERE pipeline_id = ANY(%s)
+                ORDER BY pipeline_id, stage_order
+            """
+            stages_df = pd.read_sql_query(query, conn, params=[pipeline_ids])
+            if conn:
+                conn.close()
+
+            for stage in stages_df.to_dict('records'):
+                stages_by_pipeline[stage.pop('pipeline_id')].append(stage)
+        except Exception as e:
+            print(f"Error getting pipeline stages: {str(e)}")
+        return stages_by_pipeline
+
     def create_pipeline(self, name, client_id, description, created_by):
         """Create new pipeline configuration - defaults to Inactive status"""
         try:
@@ -59,15 +59,30 @@ class ConnectionManager:
                 yield conn
         except Exception as e:
             logger.error(f"Database connection error: {e}")
-            if conn:
-                conn.rollback()
+            if conn and not conn.closed:
+                try:
+                    conn.rollback()
+                except Exception:
+                    pass
             raise
         finally:
             if conn:
                 if self.connection_pool:
-                    self.connection_pool.putconn(conn)
+                    self._release(conn)
                 else:
                     conn.close()
+    
+    def _release(self, conn):
+        """Return a connection to the pool without leaking an open transaction"""
+        broken = bool(conn.closed)
+        if not broken:
+            try:
+                # No-op when the caller already committed; discards uncommitted work
+                # exactly like conn.close() would have done for a direct connection
+                conn.rollback()
+            except Exception:
+                broken = True
+        self.connection_pool.putconn(conn, close=broken)
 
 class SessionStateOptimizer:
     """Optimize session state management"""
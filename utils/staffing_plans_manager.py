@@ -258,6 +258,39 @@ class StaffingPlansManager:
             logger.error(f"Error getting pipeline requirements actual data: {str(e)}")
             return {}
 
+    def get_pipeline_requirements_actual_by_plan_role(self, plan_roles):
+        """Get actual pipeline requirements data for several (plan_id, role) pairs in one query, as {(plan_id, role): actual_data}"""
+        plan_roles = list(dict.fromkeys((int(plan_id), role) for plan_id, role in plan_roles))
+        actual_by_plan_role = {plan_role: {} for plan_role in plan_roles}
+        if not plan_roles:
+            return actual_by_plan_role
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            # Join against the requested pairs instead of querying each plan and role separately
+            results = psycopg2.extras.execute_values(cursor, """
+                SELECT r.plan_id, r.role, r.stage_name, r.actual_at_stage, COALESCE(r.actual_converted, 0) as actual_converted,
+                       r.profiles_in_pipeline, r.needed_by_date
+                FROM pipeline_requirements_actual r
+                JOIN (VALUES %s) AS wanted (plan_id, role)
+                  ON r.plan_id = wanted.plan_id AND r.role = wanted.role
+                ORDER BY r.needed_by_date
+            """, plan_roles, fetch=True)
+            conn.close()
+
+            for plan_id, role, stage_name, actual_at_stage, actual_converted, profiles_in_pipeline, needed_by_date in results:
+                actual_by_plan_role[(plan_id, role)][stage_name] = {
+                    'actual_at_stage': actual_at_stage,
+                    'actual_converted': actual_converted,
+                    'profiles_in_pipeline': profiles_in_pipeline,
+                    'needed_by_date': needed_by_date
+                }
+        except Exception as e:
+            logger.error(f"Error getting pipeline requirements actual data: {str(e)}")
+
+        return actual_by_plan_role
+
     def calculate_pipeline_health(self, actual_at_stage, profiles_in_pipeline, needed_by_date):
         """Calculate pipeline health based on actual vs required and dates"""
         from datetime import date
@@ -1767,6 +1800,51 @@ class StaffingPlansManager:
                 'pipeline_owner': ''
             }]
 
+    def get_pipeline_planning_details_by_plan(self, plan_ids):
+        """Get pipeline planning details for several staffing plans in one query, as {plan_id: details}"""
+        # Plans without details get the same blank row get_pipeline_planning_details returns
+        placeholder = {
+            'role': '',
+            'skills': '',
+            'positions': 1,
+            'onboard_by': None,
+            'pipeline_id': None,
+            'pipeline_owner': ''
+        }
+        plan_ids = [int(plan_id) for plan_id in plan_ids]
+        details_by_plan = {plan_id: [] for plan_id in plan_ids}
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+
+            cursor.execute("""
+                SELECT plan_id, role, skills, positions, onboard_by, pipeline_id, pipeline_owner
+                FROM pipeline_planning_details
+                WHERE plan_id = ANY(%s)
+                ORDER BY plan_id, id
+            """, (plan_ids,))
+
+            results = cursor.fetchall()
+            conn.close()
+
+            for row in results:
+                details_by_plan[row[0]].append({
+                    'role': row[1] or '',
+                    'skills': row[2] or '',
+                    'positions': row[3] or 1,
+                    'onboard_by': row[4],
+                    'pipeline_id': row[5],
+                    'pipeline_owner': row[6] or ''
+                })
+
+        except Exception as e:
+            logger.error(f"Error getting pipeline planning details: {str(e)}")
+
+        return {
+            plan_id: details if details else [dict(placeholder)]
+            for plan_id, details in details_by_plan.items()
+        }
+
     def get_staffing_plan_by_id(self, plan_id):
         """Get staffing plan details by ID"""
         try:
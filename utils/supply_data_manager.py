@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 class SupplyDataManager:
     """Manage unified supply data for both FTE and NFTE talent"""
 
+    # Fields every Non-FTE record must have filled in
+    NFTE_MANDATORY_FIELDS = ['partner', 'client', 'assigned_to']
+
     def __init__(self, env_manager=None):
         self.database_url = os.environ.get('DATABASE_URL')
 
@@ -266,11 +269,8 @@ class SupplyDataManager:
                 SELECT * FROM {env_table_talent_supply} 
                 ORDER BY type, name
             """
-            print(f"DEBUG: Executing query: {query}")  # Debug log
             df = pd.read_sql_query(query, conn)
-            print(f"DEBUG: Retrieved {len(df)} records, columns: {list(df.columns)}")  # Debug log
-            if not df.empty:
-                print(f"DEBUG: First few talent_ids: {df['talent_id'].head().tolist()}")  # Debug log
+            logger.debug(f"Retrieved {len(df)} talent records from {env_table_talent_supply}")
             conn.close()
             return df
 
@@ -278,6 +278,23 @@ class SupplyDataManager:
             print(f"Error retrieving talent data: {str(e)}")
             return pd.DataFrame()
 
+    def get_talent_data_by_ids(self, talent_ids):
+        """Get the talent rows with the given ids from unified table"""
+        try:
+            conn = self.get_connection()
+            env_table_talent_supply = self.env_manager.get_table_name('talent_supply') if self.env_manager else 'talent_supply'
+            query = f"""
+                SELECT * FROM {env_table_talent_supply}
+                WHERE id = ANY(%s)
+            """
+            df = pd.read_sql_query(query, conn, params=([int(talent_id) for talent_id in talent_ids],))
+            conn.close()
+            return df
+
+        except Exception as e:
+            logger.error(f"Error retrieving talent data by id: {str(e)}")
+            return pd.DataFrame()
+
     def get_talent_by_type(self, talent_type):
         """Get talent data filtered by type (FTE or Non-FTE)"""
         try:
@@ -382,16 +399,40 @@ class SupplyDataManager:
 
     def validate_nfte_mandatory_fields(self, record):
         """Validate mandatory fields for NFTE records"""
-        mandatory_fields = ['partner', 'client', 'assigned_to']
         missing_fields = []
 
         if record.get('type') == 'Non-FTE':
-            for field in mandatory_fields:
+            for field in self.NFTE_MANDATORY_FIELDS:
                 if not record.get(field) or str(record.get(field)).strip() == '':
                     missing_fields.append(field)
 
         return missing_fields
 
+    def find_nfte_missing_fields(self, talent_df):
+        """Vectorized validate_nfte_mandatory_fields over a talent DataFrame
+
+        Returns (name, missing_fields) for each Non-FTE row with a mandatory
+        field that is null or blank.
+        """
+        nfte_data = talent_df[talent_df['type'] == 'Non-FTE']
+        if nfte_data.empty:
+            return []
+
+        # reindex turns a field absent from the frame into an all-null (missing) column
+        values = nfte_data.reindex(columns=self.NFTE_MANDATORY_FIELDS)
+        missing_mask = values.isna() | values.astype(str).apply(lambda column: column.str.strip()).eq('')
+
+        rows_with_missing = missing_mask.any(axis=1).to_numpy()
+        if not rows_with_missing.any():
+            return []
+
+        field_names = self.NFTE_MANDATORY_FIELDS
+        names = nfte_data['name'].to_numpy()[rows_with_missing]
+        return [
+            (name, [field_names[i] for i in row.nonzero()[0]])
+            for name, row in zip(names, missing_mask.to_numpy()[rows_with_missing])
+        ]
+
     def get_all_talent(self):
         """Get all talent data - required by performance manager"""
         return self.get_all_talent_data()